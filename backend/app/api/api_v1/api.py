@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.api_v1.endpoints import prices, history, health, channels, messages, cryptopanic_news, sentiment
+from app.api.api_v1.endpoints import prices, history, health, channels, messages, cryptopanic_news, sentiment, search
 
 api_router = APIRouter()
 api_router.include_router(prices.router, prefix="/prices", tags=["prices"])
@@ -9,3 +9,4 @@ api_router.include_router(channels.router, prefix="/channels", tags=["telegram"]
 api_router.include_router(messages.router, prefix="/messages", tags=["telegram"])
 api_router.include_router(cryptopanic_news.router, prefix="/news", tags=["news"])
 api_router.include_router(sentiment.router, prefix="/sentiment", tags=["sentiment"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
@@ -5,6 +5,7 @@ from typing import Optional, List
 
 from app.db.session import get_db
 from app.models.channel import Channel, ChannelPriority
+from app.services.channel_cache import bump_channel_cache_version
 
 router = APIRouter()
 
@@ -49,6 +50,7 @@ def add_channel(channel_data: ChannelCreate, db: Session = Depends(get_db)):
     db.add(channel)
     db.commit()
     db.refresh(channel)
+    bump_channel_cache_version()
 
     return channel
 
@@ -61,5 +63,6 @@ def delete_channel(channel_id: int, db: Session = Depends(get_db)):
 
     channel.is_active = False
     db.commit()
+    bump_channel_cache_version()
 
     return {"message": f"Channel {channel.username} removed"}
@@ -20,6 +20,18 @@ class NewsResponse(BaseModel):
     url: Optional[str] = None
 
 
+def news_to_response(n: CryptoPanicNews) -> NewsResponse:
+    return NewsResponse(
+        id=n.id,
+        title=n.title,
+        description=n.description,
+        published_at=n.published_at.isoformat() + "Z" if n.published_at else "",
+        kind=n.kind or "news",
+        source_title=n.source_title,
+        url=n.url,
+    )
+
+
 @router.get("", response_model=List[NewsResponse])
 def get_news(
     limit: int = Query(default=20, le=100),
@@ -34,15 +46,4 @@ def get_news(
         .all()
     )
 
-    return [
-        NewsResponse(
-            id=n.id,
-            title=n.title,
-            description=n.description,
-            published_at=n.published_at.isoformat() + "Z" if n.published_at else "",
-            kind=n.kind or "news",
-            source_title=n.source_title,
-            url=n.url,
-        )
-        for n in db_news
-    ]
+    return [news_to_response(n) for n in db_news]
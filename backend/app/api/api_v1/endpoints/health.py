@@ -1,5 +1,6 @@
 import json
 import logging
+import time
 
 from fastapi import APIRouter
 
@@ -15,19 +16,27 @@ router = APIRouter()
 @router.get("/")
 async def health_check():
     connected = False
+    seconds_since_update = None
     try:
         r = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
-        raw = await r.get("crypto:prices")
+        last_update = await r.get(settings.REDIS_LAST_UPDATE_KEY)
+        try:
+            seconds_since_update = max(0.0, time.time() - float(last_update) / 1000)
+            connected = seconds_since_update <= settings.PRICE_STALE_SECONDS
+        except (TypeError, ValueError):
+            # Older crypto_service without the liveness key: inspect the price blob
+            raw = await r.get(settings.REDIS_PRICES_KEY)
+            if raw:
+                data = json.loads(raw)
+                prices = data.get("prices", data)
+                connected = len(prices) > 0
         await r.aclose()
-        if raw:
-            data = json.loads(raw)
-            prices = data.get("prices", data)
-            connected = len(prices) > 0
     except Exception as e:
         logger.error(f"Health check Redis error: {e}")
 
     return {
         "status": "healthy" if connected else "connecting",
         "crypto_service_connected": connected,
+        "seconds_since_price_update": seconds_since_update,
         "active_websocket_clients": len(manager.active_connections),
     }
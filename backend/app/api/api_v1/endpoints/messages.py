@@ -1,5 +1,8 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+import base64
+import binascii
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, joinedload, selectinload
 from pydantic import BaseModel
 from typing import Optional, List
 from datetime import datetime
@@ -9,6 +12,8 @@ from app.models.message import Message
 
 router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 class MediaItem(BaseModel):
     type: str
@@ -30,42 +35,74 @@ class MessageResponse(BaseModel):
     media: List[MediaItem] = []
 
 
+def message_to_response(msg: Message) -> MessageResponse:
+    media_items = []
+    for m in (msg.media or []):
+        media_items.append(MediaItem(
+            type=m.media_type,
+            url=f"/media/{m.media_path}"
+        ))
+
+    return MessageResponse(
+        id=msg.telegram_message_id,
+        channel_username=msg.channel.username if msg.channel else '',
+        channel_title=msg.channel.title if msg.channel else '',
+        text=msg.text or '',
+        views=msg.views or 0,
+        forwards=msg.forwards or 0,
+        date=(msg.telegram_date.isoformat() if msg.telegram_date else msg.created_at.isoformat()) + "Z",
+        is_demo=False,
+        has_media=bool(msg.has_media or media_items),
+        media_type=msg.media_type,
+        media_url=f"/media/{msg.media_path}" if msg.media_path else (media_items[0].url if media_items else None),
+        media=media_items
+    )
+
+
+def encode_cursor(msg: Message) -> str:
+    raw = f"{msg.telegram_date.isoformat()}|{msg.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date_str, msg_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(date_str), int(msg_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("", response_model=List[MessageResponse])
 def get_messages(
+    response: Response,
     limit: int = Query(default=20, le=100),
     skip: int = Query(default=0, ge=0),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    db_messages = (
+    """Newest messages first.
+
+    Pass the X-Next-Cursor response header back as `cursor` to page by
+    (telegram_date, id) instead of `skip`; the header is absent on the last page.
+    """
+    query = (
         db.query(Message)
+        .options(joinedload(Message.channel), selectinload(Message.media))
         .order_by(Message.telegram_date.desc(), Message.id.desc())
-        .offset(skip)
-        .limit(limit)
-        .all()
     )
-    
-    responses = []
-    for msg in db_messages:
-        media_items = []
-        for m in (msg.media or []):
-            media_items.append(MediaItem(
-                type=m.media_type,
-                url=f"/media/{m.media_path}"
-            ))
-            
-        responses.append(MessageResponse(
-            id=msg.telegram_message_id,
-            channel_username=msg.channel.username if msg.channel else '',
-            channel_title=msg.channel.title if msg.channel else '',
-            text=msg.text or '',
-            views=msg.views or 0,
-            forwards=msg.forwards or 0,
-            date=(msg.telegram_date.isoformat() if msg.telegram_date else msg.created_at.isoformat()) + "Z",
-            is_demo=False,
-            has_media=bool(msg.has_media or media_items),
-            media_type=msg.media_type,
-            media_url=f"/media/{msg.media_path}" if msg.media_path else (media_items[0].url if media_items else None),
-            media=media_items
-        ))
-    
-    return responses
+
+    if cursor:
+        cursor_date, cursor_id = decode_cursor(cursor)
+        query = query.filter(tuple_(Message.telegram_date, Message.id) < (cursor_date, cursor_id))
+    else:
+        query = query.offset(skip)
+
+    db_messages = query.limit(limit).all()
+
+    # Rows without telegram_date cannot be addressed by a cursor; the Celery
+    # tasks always set it, so this only affects legacy rows.
+    if len(db_messages) == limit and db_messages[-1].telegram_date:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(db_messages[-1])
+
+    return [message_to_response(msg) for msg in db_messages]
@@ -1,7 +1,7 @@
 import json
 import logging
 
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
 
 import redis.asyncio as aioredis
 from app.core.config import settings
@@ -15,7 +15,7 @@ router = APIRouter()
 async def get_prices():
     try:
         r = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
-        raw = await r.get("crypto:prices")
+        raw = await r.get(settings.REDIS_PRICES_KEY)
         await r.aclose()
         if raw:
             data = json.loads(raw)
@@ -25,3 +25,20 @@ async def get_prices():
         logger.error(f"Error reading prices from Redis: {e}")
 
     return {"data": {}, "count": 0}
+
+
+@router.get("/{symbol}")
+async def get_symbol_price(symbol: str):
+    symbol = symbol.upper()
+    try:
+        r = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        fields = await r.hgetall(f"{settings.REDIS_PRICE_HASH_PREFIX}{symbol}")
+        await r.aclose()
+    except Exception as e:
+        logger.error(f"Error reading {symbol} price from Redis: {e}")
+        raise HTTPException(status_code=503, detail="Price store unavailable")
+
+    if not fields:
+        raise HTTPException(status_code=404, detail=f"No price for {symbol}")
+
+    return {"data": {field: json.loads(value) for field, value in fields.items()}}
@@ -0,0 +1,84 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import Optional, List
+from datetime import datetime
+
+from app.db.session import get_db
+from app.db.indexes import message_tsvector, news_tsvector, ts_query
+from app.models.channel import Channel
+from app.models.cryptopanic_news import CryptoPanicNews
+from app.models.message import Message
+from app.models.symbol_tag import MessageSymbol, NewsSymbol
+from app.services.symbols import normalize_symbol
+from app.api.api_v1.endpoints.messages import MessageResponse, message_to_response
+from app.api.api_v1.endpoints.cryptopanic_news import NewsResponse, news_to_response
+
+router = APIRouter()
+
+
+@router.get("/messages", response_model=List[MessageResponse])
+def search_messages(
+    q: Optional[str] = Query(default=None, min_length=1),
+    symbol: Optional[str] = None,
+    channel: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(default=20, le=100),
+    db: Session = Depends(get_db)
+):
+    query = db.query(Message).options(joinedload(Message.channel), selectinload(Message.media))
+
+    if symbol:
+        # Filter and order on the tag table so (symbol, telegram_date) drives the scan
+        query = query.join(MessageSymbol, MessageSymbol.message_id == Message.id).filter(
+            MessageSymbol.symbol == normalize_symbol(symbol)
+        )
+        date_column = MessageSymbol.telegram_date
+        channel_column = MessageSymbol.channel_id
+    else:
+        date_column = Message.telegram_date
+        channel_column = Message.channel_id
+
+    if channel:
+        channel_id = select(Channel.id).where(Channel.username == channel.lstrip('@')).scalar_subquery()
+        query = query.filter(channel_column == channel_id)
+    if since:
+        query = query.filter(date_column >= since)
+    if until:
+        query = query.filter(date_column < until)
+    if q:
+        query = query.filter(message_tsvector().op("@@")(ts_query(q)))
+
+    db_messages = query.order_by(date_column.desc(), Message.id.desc()).limit(limit).all()
+    return [message_to_response(msg) for msg in db_messages]
+
+
+@router.get("/news", response_model=List[NewsResponse])
+def search_news(
+    q: Optional[str] = Query(default=None, min_length=1),
+    symbol: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = Query(default=20, le=100),
+    db: Session = Depends(get_db)
+):
+    query = db.query(CryptoPanicNews)
+
+    if symbol:
+        query = query.join(NewsSymbol, NewsSymbol.news_id == CryptoPanicNews.id).filter(
+            NewsSymbol.symbol == normalize_symbol(symbol)
+        )
+        date_column = NewsSymbol.published_at
+    else:
+        date_column = CryptoPanicNews.published_at
+
+    if since:
+        query = query.filter(date_column >= since)
+    if until:
+        query = query.filter(date_column < until)
+    if q:
+        query = query.filter(news_tsvector().op("@@")(ts_query(q)))
+
+    db_news = query.order_by(date_column.desc(), CryptoPanicNews.id.desc()).limit(limit).all()
+    return [news_to_response(n) for n in db_news]
@@ -55,6 +55,48 @@ class Settings(BaseSettings):
         "CoinTelegraph",
     ]
 
+    REDIS_PRICES_KEY: str = "crypto:prices"
+    REDIS_PRICE_HASH_PREFIX: str = "crypto:price:"
+    REDIS_LAST_UPDATE_KEY: str = "crypto:last_update"
+    # Health reports crypto_service as disconnected after this long without an update
+    PRICE_STALE_SECONDS: float = 30.0
+
+    # Must match the producers: "pubsub" or "streams" (XREAD with resume)
+    REDIS_TRANSPORT: str = "pubsub"
+    REDIS_STREAM_BATCH: int = 100
+    REDIS_STREAM_BLOCK_MS: int = 5000
+
+    # Opt-in event loop lag probe; stalls over the threshold log the loop thread's stack
+    LOOP_MONITOR: bool = False
+    LOOP_MONITOR_INTERVAL: float = 0.1
+    LOOP_BLOCK_THRESHOLD: float = 0.25
+
+    # Adds backend_received_at to price frames sent to /ws clients
+    LATENCY_TRACE: bool = False
+
+    # Deep size of long-lived buffers into memory_structure_* gauges every N seconds; 0 disables it
+    MEMORY_ACCOUNTING_INTERVAL: float = 60
+    # MiB per structure, "name=MiB,..."; a structure over budget is trimmed in place
+    MEMORY_BUDGETS_MB: str = "sent_event_ts=1"
+    # Frames kept per allocation for the /debug/memory tracemalloc report; 0 leaves tracemalloc off
+    MEMORY_TRACEMALLOC: int = 0
+
+    # Telegram/CryptoPanic broadcasts kept per topic for /ws?resume_from=epoch:seq
+    WS_REPLAY_SIZE: int = 500
+    # Newest messages/news pushed to every new /ws client in the bootstrap frame
+    WS_BOOTSTRAP_SIZE: int = 50
+    REDIS_FEAR_GREED_KEY: str = "crypto:fear_greed"
+    FEAR_GREED_REFRESH_INTERVAL: float = 60.0
+
+    # One heartbeat task pings every client once per interval, spread over the
+    # wheel slots; clients that answer pongs are dropped after the idle timeout
+    WS_HEARTBEAT_INTERVAL: float = 30.0
+    WS_HEARTBEAT_SLOTS: int = 10
+    WS_IDLE_TIMEOUT: float = 90.0
+
+    CHANNEL_CACHE_VERSION_KEY: str = "telegram:channels:version"
+    CHANNEL_CACHE_CHECK_INTERVAL: float = 30.0
+
     model_config = ConfigDict(case_sensitive=True, env_file=".env")
 
 
@@ -0,0 +1,5 @@
+from pulse_common.memory import MemoryAccountant, parse_budgets
+
+from app.core.config import settings
+
+accountant = MemoryAccountant(parse_budgets(settings.MEMORY_BUDGETS_MB))
@@ -0,0 +1,33 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+IO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+WEBSOCKET_CLIENTS = Gauge(
+    "websocket_clients", "Connected /ws clients"
+)
+WEBSOCKET_SEND_QUEUE = Gauge(
+    "websocket_send_queue_depth", "Frames still waiting to be sent by in-progress broadcasts"
+)
+WEBSOCKET_BROADCAST_SECONDS = Histogram(
+    "websocket_broadcast_seconds", "Time to fan one frame out to every client",
+    buckets=IO_BUCKETS,
+)
+WEBSOCKET_SEND_FAILURES = Counter(
+    "websocket_send_failures_total", "Sends that failed and dropped the client"
+)
+REDIS_MESSAGES = Counter(
+    "redis_messages_total", "Updates received from the other services", ["channel"]
+)
+PRICE_LATENCY_SECONDS = Histogram(
+    "price_latency_seconds", "Per-hop latency of a price update from Redis to the clients", ["hop"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# publish_to_backend: crypto_service publish -> received by the Redis subscriber
+# backend_to_send:    received -> broadcast sent to every client
+# exchange_to_send:   Binance event time (E) -> sent, once per new tick; what users see
+HOP_LATENCY = {
+    hop: PRICE_LATENCY_SECONDS.labels(hop)
+    for hop in ("publish_to_backend", "backend_to_send", "exchange_to_send")
+}
@@ -1,32 +1,219 @@
+import asyncio
+import json
 import logging
+import time
+import uuid
+from collections import deque
+from typing import Callable, Optional
+
 from fastapi import WebSocket
 
+from app.core.config import settings
+from app.core.metrics import (
+    WEBSOCKET_BROADCAST_SECONDS,
+    WEBSOCKET_CLIENTS,
+    WEBSOCKET_SEND_FAILURES,
+    WEBSOCKET_SEND_QUEUE,
+)
+
 logger = logging.getLogger(__name__)
 
+PING_FRAME = json.dumps({"type": "ping"})
+
+# Topics replayed to resuming clients. Price updates are full snapshots, so
+# only the newest one is kept and older ones are never reported as missed.
+REPLAY_TOPICS = {
+    "prices": {"size": 1, "conflate": True},
+    "telegram": {"size": None, "conflate": False},
+    "cryptopanic": {"size": None, "conflate": False},
+}
+
+
+class ReplayRing:
+    def __init__(self, size: int, conflate: bool):
+        self.frames: deque[tuple[int, str]] = deque(maxlen=size)
+        self.conflate = conflate
+        # Highest seq that fell out of the ring
+        self.evicted_seq = 0
+
+    def append(self, seq: int, text: str):
+        if len(self.frames) == self.frames.maxlen:
+            self.evicted_seq = self.frames[0][0]
+        self.frames.append((seq, text))
+
+
 class ConnectionManager:
 
-    def __init__(self):
+    def __init__(self, replay_size: Optional[int] = None, heartbeat_slots: Optional[int] = None):
         self.active_connections: list[WebSocket] = []
+        # Heartbeat timer wheel: each connection lives in one slot, and one slot is
+        # pinged per tick, so a full turn of the wheel is one heartbeat interval
+        self._slots: list[set] = [set() for _ in range(heartbeat_slots or settings.WS_HEARTBEAT_SLOTS)]
+        self._slot_of: dict[WebSocket, int] = {}
+        self._next_slot = 0
+        self._last_seen: dict[WebSocket, float] = {}
+        # Clients that answered a ping at least once; only these can be reaped as idle
+        self._responsive: set[WebSocket] = set()
+        # A new epoch per process: seq numbers from before a restart are meaningless
+        self.epoch = uuid.uuid4().hex[:12]
+        self.seq = 0
+        # (epoch, seq) -> pre-serialized bootstrap frame for clients that start fresh
+        self.bootstrap: Optional[Callable[[str, int], str]] = None
+        size = replay_size or settings.WS_REPLAY_SIZE
+        self._replay = {
+            topic: ReplayRing(options["size"] or size, options["conflate"])
+            for topic, options in REPLAY_TOPICS.items()
+        }
 
-    async def connect(self, websocket: WebSocket):
+    @property
+    def resume_token(self) -> str:
+        return f"{self.epoch}:{self.seq}"
+
+    async def connect(self, websocket: WebSocket, resume_from: Optional[str] = None):
         await websocket.accept()
-        self.active_connections.append(websocket)
+
+        resume_seq = self._parse_resume(resume_from) if resume_from else None
+        if resume_seq is not None:
+            await websocket.send_json({"type": "session", "epoch": self.epoch, "seq": self.seq})
+            after_seq = resume_seq
+        else:
+            if resume_from:
+                await websocket.send_json({"type": "resync_required", "epoch": self.epoch, "seq": self.seq})
+            # The frame reflects every broadcast up to this seq
+            after_seq = self.seq
+            if self.bootstrap is not None:
+                await websocket.send_text(self.bootstrap(self.epoch, after_seq))
+            else:
+                await websocket.send_json({"type": "session", "epoch": self.epoch, "seq": after_seq})
+
+        await self._catch_up(websocket, after_seq)
         logger.info(f"Client connected. Total: {len(self.active_connections)}")
 
-    def disconnect(self, websocket: WebSocket):
+    def _parse_resume(self, resume_from: str) -> Optional[int]:
+        """Seq to resume after, or None if the gap cannot be replayed exactly."""
+        epoch, _, seq = resume_from.partition(":")
+        try:
+            seq = int(seq)
+        except ValueError:
+            return None
+        if epoch != self.epoch or seq > self.seq:
+            return None
+        if any(not ring.conflate and ring.evicted_seq > seq for ring in self._replay.values()):
+            return None
+        return seq
+
+    def _frames_after(self, seq: int) -> list[tuple[int, str]]:
+        frames = [frame for ring in self._replay.values() for frame in ring.frames if frame[0] > seq]
+        frames.sort(key=lambda frame: frame[0])
+        return frames
+
+    async def _catch_up(self, websocket: WebSocket, after_seq: int):
+        # Broadcasts may land while replay frames are being sent; keep draining
+        # until nothing is newer, then register without yielding in between so
+        # the client sees every seq exactly once and in order.
+        while True:
+            frames = self._frames_after(after_seq)
+            if not frames:
+                self.active_connections.append(websocket)
+                self._register(websocket)
+                return
+            for seq, text in frames:
+                await websocket.send_text(text)
+            after_seq = frames[-1][0]
+
+    def _register(self, websocket: WebSocket):
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % len(self._slots)
+        self._slots[slot].add(websocket)
+        self._slot_of[websocket] = slot
+        self._last_seen[websocket] = time.monotonic()
+
+    def _remove(self, websocket: WebSocket):
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
+        slot = self._slot_of.pop(websocket, None)
+        if slot is not None:
+            self._slots[slot].discard(websocket)
+        self._last_seen.pop(websocket, None)
+        self._responsive.discard(websocket)
+
+    def disconnect(self, websocket: WebSocket):
+        self._remove(websocket)
         logger.info(f"Client disconnected. Total: {len(self.active_connections)}")
 
-    async def broadcast(self, message: dict):
-        disconnected = []
-        for connection in self.active_connections:
+    def touch(self, websocket: WebSocket, message: Optional[str] = None):
+        """Record client activity; a pong marks the client as heartbeat-aware."""
+        if websocket not in self._slot_of:
+            return
+        self._last_seen[websocket] = time.monotonic()
+        if message and "pong" in message:
+            try:
+                if json.loads(message).get("type") == "pong":
+                    self._responsive.add(websocket)
+            except (ValueError, AttributeError):
+                pass
+
+    async def run_heartbeat(self):
+        tick = settings.WS_HEARTBEAT_INTERVAL / len(self._slots)
+        slot = 0
+        while True:
+            await asyncio.sleep(tick)
+            try:
+                await self.heartbeat_slot(slot)
+            except Exception as e:
+                logger.error(f"Heartbeat error: {e}")
+            slot = (slot + 1) % len(self._slots)
+
+    async def heartbeat_slot(self, slot: int, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        idle, failed = [], []
+        for websocket in list(self._slots[slot]):
+            if websocket in self._responsive and now - self._last_seen.get(websocket, now) > settings.WS_IDLE_TIMEOUT:
+                idle.append(websocket)
+                continue
+            try:
+                await websocket.send_text(PING_FRAME)
+            except Exception:
+                failed.append(websocket)
+
+        for websocket in idle:
             try:
-                await connection.send_json(message)
+                await websocket.close(code=1001)
             except Exception:
-                disconnected.append(connection)
+                pass
+        for websocket in idle + failed:
+            self._remove(websocket)
+        if idle or failed:
+            logger.info(
+                f"Heartbeat reaped {len(idle)} idle and {len(failed)} dead clients. "
+                f"Total: {len(self.active_connections)}"
+            )
+
+    async def broadcast(self, message: dict, topic: Optional[str] = None):
+        if topic is not None:
+            self.seq += 1
+            message = {**message, "seq": self.seq}
+        text = json.dumps(message, default=str)
+        if topic is not None:
+            self._replay[topic].append(self.seq, text)
+
+        recipients = list(self.active_connections)
+        disconnected = []
+        WEBSOCKET_SEND_QUEUE.inc(len(recipients))
+        started = time.perf_counter()
+        try:
+            for connection in recipients:
+                try:
+                    await connection.send_text(text)
+                except Exception:
+                    disconnected.append(connection)
+                WEBSOCKET_SEND_QUEUE.dec()
+        finally:
+            WEBSOCKET_BROADCAST_SECONDS.observe(time.perf_counter() - started)
 
+        WEBSOCKET_SEND_FAILURES.inc(len(disconnected))
         for conn in disconnected:
             self.disconnect(conn)
 
 manager = ConnectionManager()
+WEBSOCKET_CLIENTS.set_function(lambda: len(manager.active_connections))
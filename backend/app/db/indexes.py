@@ -0,0 +1,37 @@
+from sqlalchemy import func, literal_column, text
+
+# create_all() only builds indexes together with new tables, so indexes on
+# existing tables are created here. The search expressions below must stay
+# identical to the indexed ones, otherwise Postgres will not use the index.
+TS_CONFIG = literal_column("'simple'")
+
+POSTGRES_INDEXES = [
+    # Keyset pagination on /messages orders by (telegram_date, id)
+    "CREATE INDEX IF NOT EXISTS ix_messages_date_id ON messages (telegram_date DESC, id DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_messages_text_tsv "
+    "ON messages USING gin (to_tsvector('simple', coalesce(text, '')))",
+    "CREATE INDEX IF NOT EXISTS ix_cryptopanic_news_title_tsv "
+    "ON cryptopanic_news USING gin (to_tsvector('simple', title))",
+]
+
+
+def message_tsvector():
+    from app.models.message import Message
+    return func.to_tsvector(TS_CONFIG, func.coalesce(Message.text, literal_column("''")))
+
+
+def news_tsvector():
+    from app.models.cryptopanic_news import CryptoPanicNews
+    return func.to_tsvector(TS_CONFIG, CryptoPanicNews.title)
+
+
+def ts_query(query: str):
+    return func.websearch_to_tsquery(TS_CONFIG, query)
+
+
+def ensure_indexes(engine):
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        for ddl in POSTGRES_INDEXES:
+            conn.execute(text(ddl))
@@ -1,19 +1,29 @@
 import asyncio
 import json
 import logging
+import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from typing import Optional
+from fastapi import FastAPI, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.api_v1.api import api_router
+from app.api.api_v1.endpoints.messages import NEXT_CURSOR_HEADER
 from app.core.config import settings
+from app.core.memory import accountant
+from app.core.metrics import HOP_LATENCY, REDIS_MESSAGES
 from app.core.ws_manager import manager
-from app.db.session import engine
+from app.db.session import SessionLocal, engine
 from app.db.base import Base
+from app.db.indexes import ensure_indexes
+from app.services.bootstrap import bootstrap_cache
 from fastapi.staticfiles import StaticFiles
 import os
 
 import redis.asyncio as aioredis
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from pulse_common.loop_monitor import LoopMonitor
+from pulse_common.memory import start_tracemalloc
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,38 +35,120 @@ def get_latest_prices() -> dict:
     return _latest_prices
 
 
-async def _redis_subscriber():
+REDIS_CHANNELS = ["crypto:updates", "news:telegram", "news:cryptopanic"]
+
+# symbol -> exchange event time already counted in the end-to-end histogram
+_sent_event_ts = {}
+
+
+def _observe_price_latency(prices: dict, received_at: float, sent_at: float):
+    HOP_LATENCY["backend_to_send"].observe(max(0.0, sent_at - received_at) / 1000)
+    for symbol, price in prices.items():
+        timestamp = price.get("timestamp")
+        if timestamp and _sent_event_ts.get(symbol) != timestamp:
+            _sent_event_ts[symbol] = timestamp
+            HOP_LATENCY["exchange_to_send"].observe(max(0.0, sent_at - timestamp) / 1000)
+
+
+def _trim_sent_event_ts(size: int, budget: int):
+    # Symbols no longer in the feed never get another tick to compare against
+    for symbol in [symbol for symbol in _sent_event_ts if symbol not in _latest_prices]:
+        del _sent_event_ts[symbol]
+
+
+def _track_memory():
+    accountant.register("latest_prices", get_latest_prices)
+    accountant.register("sent_event_ts", lambda: _sent_event_ts, _trim_sent_event_ts)
+    accountant.register("bootstrap_cache", lambda: bootstrap_cache)
+
+
+async def _handle_redis_message(channel: str, raw: str):
     global _latest_prices
-    redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    REDIS_MESSAGES.labels(channel).inc()
+    try:
+        data = json.loads(raw)
+
+        # The bootstrap cache must see an update before its broadcast seq is assigned
+        if channel == "crypto:updates":
+            received_at = time.time() * 1000
+            published_at = data.get("published_at")
+            if published_at:
+                HOP_LATENCY["publish_to_backend"].observe(max(0.0, received_at - published_at) / 1000)
+            if settings.LATENCY_TRACE:
+                data["backend_received_at"] = received_at
 
-    channels = ["crypto:updates", "news:telegram", "news:cryptopanic"]
+            _latest_prices = data.get("prices", {})
+            bootstrap_cache.set_prices(_latest_prices)
+            await manager.broadcast({"type": "update", "data": data}, topic="prices")
+            _observe_price_latency(_latest_prices, received_at, time.time() * 1000)
+        elif channel == "news:telegram":
+            if data.get("data"):
+                bootstrap_cache.add_message(data["data"])
+            await manager.broadcast(data, topic="telegram")
+        elif channel == "news:cryptopanic":
+            bootstrap_cache.add_news(data.get("data") or [])
+            await manager.broadcast(data, topic="cryptopanic")
+
+    except (json.JSONDecodeError, Exception) as e:
+        logger.error(f"Error processing Redis message: {e}")
+
+
+async def _listen_pubsub(redis_client):
+    pubsub = redis_client.pubsub()
+    try:
+        await pubsub.subscribe(*REDIS_CHANNELS)
+        logger.info(f"Subscribed to Redis channels: {REDIS_CHANNELS}")
+
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                await _handle_redis_message(message["channel"], message["data"])
+    finally:
+        await pubsub.aclose()
+
+
+async def _stream_offsets(redis_client) -> dict:
+    """Start after the newest entry of each stream; "0-0" for streams not created yet."""
+    offsets = {}
+    for stream in REDIS_CHANNELS:
+        newest = await redis_client.xrevrange(stream, count=1)
+        offsets[stream] = newest[0][0] if newest else "0-0"
+    return offsets
+
+
+async def _read_streams(redis_client, offsets: dict):
+    logger.info(f"Reading Redis streams: {REDIS_CHANNELS}")
+    while True:
+        response = await redis_client.xread(
+            offsets,
+            count=settings.REDIS_STREAM_BATCH,
+            block=settings.REDIS_STREAM_BLOCK_MS,
+        )
+        for stream, entries in response or []:
+            offsets[stream] = entries[-1][0]
+            # Each price update is a full snapshot, so a backlog collapses to its newest entry
+            if stream == "crypto:updates":
+                entries = entries[-1:]
+            for _, fields in entries:
+                await _handle_redis_message(stream, fields["data"])
+
+
+async def _redis_subscriber():
+    redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    use_streams = settings.REDIS_TRANSPORT == "streams"
+    # Kept across reconnects so the stream reader resumes where it stopped
+    offsets = None
 
     while True:
         try:
-            pubsub = redis_client.pubsub()
-            await pubsub.subscribe(*channels)
-            logger.info(f"Subscribed to Redis channels: {channels}")
-
-            async for message in pubsub.listen():
-                if message["type"] == "message":
-                    try:
-                        data = json.loads(message["data"])
-                        channel = message["channel"]
-
-                        if channel == "crypto:updates":
-                            _latest_prices = data.get("prices", {})
-                            await manager.broadcast({"type": "update", "data": data})
-                        elif channel == "news:telegram":
-                            await manager.broadcast(data)
-                        elif channel == "news:cryptopanic":
-                            await manager.broadcast(data)
-
-                    except (json.JSONDecodeError, Exception) as e:
-                        logger.error(f"Error processing Redis message: {e}")
+            if use_streams:
+                if offsets is None:
+                    offsets = await _stream_offsets(redis_client)
+                await _read_streams(redis_client, offsets)
+            else:
+                await _listen_pubsub(redis_client)
 
         except asyncio.CancelledError:
             logger.info("Redis subscriber cancelled")
-            await pubsub.unsubscribe(*channels)
             await redis_client.aclose()
             return
         except Exception as e:
@@ -64,22 +156,65 @@ async def _redis_subscriber():
             await asyncio.sleep(3)
 
 
+def _warm_bootstrap_cache():
+    db = SessionLocal()
+    try:
+        bootstrap_cache.warm(db)
+    finally:
+        db.close()
+
+
+async def _fear_greed_refresh_loop():
+    redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    try:
+        while True:
+            try:
+                raw = await redis_client.get(settings.REDIS_FEAR_GREED_KEY)
+                if raw:
+                    bootstrap_cache.set_fear_greed(json.loads(raw))
+            except Exception as e:
+                logger.error(f"Error refreshing Fear & Greed for bootstrap: {e}")
+            await asyncio.sleep(settings.FEAR_GREED_REFRESH_INTERVAL)
+    finally:
+        await redis_client.aclose()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 
     from app.models.cryptopanic_news import CryptoPanicNews
+    from app.models.symbol_tag import MessageSymbol, NewsSymbol
     Base.metadata.create_all(bind=engine)
+    ensure_indexes(engine)
+
+    try:
+        await asyncio.to_thread(_warm_bootstrap_cache)
+    except Exception as e:
+        logger.error(f"Failed to warm bootstrap cache: {e}")
+    manager.bootstrap = bootstrap_cache.frame
+    fear_greed_task = asyncio.create_task(_fear_greed_refresh_loop())
 
+    heartbeat_task = asyncio.create_task(manager.run_heartbeat())
     redis_task = asyncio.create_task(_redis_subscriber())
-    logger.info("Redis subscriber started — listening for crypto:updates, news:telegram, news:cryptopanic")
+    logger.info(f"Redis subscriber started ({settings.REDIS_TRANSPORT}) — listening for {', '.join(REDIS_CHANNELS)}")
+
+    tasks = [redis_task, fear_greed_task, heartbeat_task]
+    start_tracemalloc(settings.MEMORY_TRACEMALLOC)
+    _track_memory()
+    if settings.MEMORY_ACCOUNTING_INTERVAL:
+        tasks.append(asyncio.create_task(accountant.run(settings.MEMORY_ACCOUNTING_INTERVAL)))
+    if settings.LOOP_MONITOR:
+        monitor = LoopMonitor(settings.LOOP_MONITOR_INTERVAL, settings.LOOP_BLOCK_THRESHOLD)
+        tasks.append(asyncio.create_task(monitor.run()))
 
     yield
 
-    redis_task.cancel()
-    try:
-        await redis_task
-    except asyncio.CancelledError:
-        pass
+    for task in tasks:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
 
     logger.info("Backend shutdown complete")
 
@@ -95,6 +230,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 media_path = settings.MEDIA_PATH
@@ -116,17 +252,29 @@ def root():
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
-@app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/debug/memory", include_in_schema=False)
+async def memory():
+    """Structure sizes plus, when MEMORY_TRACEMALLOC is set, top allocation sites and growth since the last call."""
+    # Async so the measurement runs on the loop that mutates these structures; budgets are
+    # enforced by the periodic accountant.run(), never by a read
+    return accountant.report()
+
+
+@app.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket, resume_from: Optional[str] = None):
     try:
+        await manager.connect(websocket, resume_from)
+
+        # Pings come from the manager's heartbeat task; here we only track replies
         while True:
-            await asyncio.sleep(30)
-            try:
-                await websocket.send_json({"type": "ping"})
-            except Exception:
-                break
+            message = await websocket.receive_text()
+            manager.touch(websocket, message)
 
     except WebSocketDisconnect:
         manager.disconnect(websocket)
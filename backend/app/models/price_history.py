@@ -1,12 +1,16 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, Integer, String
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
 
 from app.db.base import Base
 
 
 class PriceHistory(Base):
     __tablename__ = "price_history"
+    # Written by crypto_service, which also builds this index on existing tables
+    __table_args__ = (
+        Index("ux_price_history_symbol_ts", "symbol", "timestamp", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     symbol = Column(String, index=True)
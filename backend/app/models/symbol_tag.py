@@ -0,0 +1,30 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+
+from app.db.base import Base
+
+
+class MessageSymbol(Base):
+    """Ticker mentioned in a Telegram message, denormalized for (symbol, time) scans."""
+    __tablename__ = "message_symbols"
+
+    message_id = Column(Integer, ForeignKey("messages.id", ondelete="CASCADE"), primary_key=True)
+    symbol = Column(String, primary_key=True)
+    channel_id = Column(Integer, nullable=False)
+    telegram_date = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_message_symbols_symbol_date", "symbol", "telegram_date"),
+    )
+
+
+class NewsSymbol(Base):
+    """Ticker mentioned in a CryptoPanic headline."""
+    __tablename__ = "news_symbols"
+
+    news_id = Column(Integer, ForeignKey("cryptopanic_news.id", ondelete="CASCADE"), primary_key=True)
+    symbol = Column(String, primary_key=True)
+    published_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_news_symbols_symbol_date", "symbol", "published_at"),
+    )
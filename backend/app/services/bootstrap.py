@@ -0,0 +1,147 @@
+import json
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _news_item(item: dict) -> dict:
+    """Shape a raw CryptoPanic item like the /news response."""
+    source = item.get("source")
+    return {
+        "id": item.get("id"),
+        "title": item.get("title"),
+        "description": item.get("description"),
+        "published_at": item.get("published_at"),
+        "kind": item.get("kind", "news"),
+        "source_title": source.get("title") if isinstance(source, dict) else item.get("source_title"),
+        "url": item.get("url"),
+    }
+
+
+class BootstrapCache:
+    """
+    Latest state a new /ws client needs: prices, fear/greed and the newest
+    messages and news. Fed by the Redis subscriber, serialized at most once
+    per broadcast seq and only when a client actually connects.
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = size or settings.WS_BOOTSTRAP_SIZE
+        self.prices: dict = {}
+        self.fear_greed: Optional[dict] = None
+        # (channel_username, id) -> message, newest last
+        self._messages: OrderedDict = OrderedDict()
+        # (title, published_at) -> news item, newest last
+        self._news: OrderedDict = OrderedDict()
+        self._frame: Optional[tuple[str, int, str]] = None
+        self._version = 0
+        self._frame_version = -1
+
+    def _changed(self):
+        self._version += 1
+
+    def set_prices(self, prices: dict):
+        self.prices = prices
+        self._changed()
+
+    def set_fear_greed(self, fear_greed: Optional[dict]):
+        if fear_greed != self.fear_greed:
+            self.fear_greed = fear_greed
+            self._changed()
+
+    def add_message(self, message: dict):
+        key = (message.get("channel_username"), message.get("id"))
+        # Edits and album parts replace the earlier version in place
+        self._messages[key] = message
+        if not self._is_newest(self._messages, key, "date"):
+            self._sort(self._messages, "date")
+        while len(self._messages) > self.size:
+            self._messages.popitem(last=False)
+        self._changed()
+
+    def add_news(self, items: list[dict]):
+        for item in items:
+            news = _news_item(item)
+            self._news[(news["title"], news["published_at"])] = news
+        self._sort(self._news, "published_at")
+        while len(self._news) > self.size:
+            self._news.popitem(last=False)
+        self._changed()
+
+    @staticmethod
+    def _is_newest(entries: OrderedDict, key, field: str) -> bool:
+        value = entries[key].get(field) or ""
+        return all((other.get(field) or "") <= value for other in entries.values())
+
+    @staticmethod
+    def _sort(entries: OrderedDict, field: str):
+        ordered = sorted(entries.items(), key=lambda kv: str(kv[1].get(field) or ""))
+        entries.clear()
+        entries.update(ordered)
+
+    @property
+    def messages(self) -> list[dict]:
+        return list(reversed(self._messages.values()))
+
+    @property
+    def news(self) -> list[dict]:
+        return list(reversed(self._news.values()))
+
+    def frame(self, epoch: str, seq: int) -> str:
+        if self._frame is not None and self._frame_version == self._version and self._frame[:2] == (epoch, seq):
+            return self._frame[2]
+
+        text = json.dumps({
+            "type": "bootstrap",
+            "epoch": epoch,
+            "seq": seq,
+            "data": {
+                "prices": self.prices,
+                "fear_greed": self.fear_greed,
+                "messages": self.messages,
+                "news": self.news,
+            },
+        }, default=str)
+        self._frame = (epoch, seq, text)
+        self._frame_version = self._version
+        return text
+
+    def warm(self, db: Session):
+        """Seed messages and news from the DB so the first clients are not empty."""
+        from app.api.api_v1.endpoints.cryptopanic_news import news_to_response
+        from app.api.api_v1.endpoints.messages import message_to_response
+        from app.models.cryptopanic_news import CryptoPanicNews
+        from app.models.message import Message
+
+        messages = (
+            db.query(Message)
+            .options(joinedload(Message.channel), selectinload(Message.media))
+            .order_by(Message.telegram_date.desc(), Message.id.desc())
+            .limit(self.size)
+            .all()
+        )
+        for msg in reversed(messages):
+            data = message_to_response(msg).model_dump()
+            self._messages[(data["channel_username"], data["id"])] = data
+
+        news = (
+            db.query(CryptoPanicNews)
+            .order_by(CryptoPanicNews.published_at.desc())
+            .limit(self.size)
+            .all()
+        )
+        for n in reversed(news):
+            data = news_to_response(n).model_dump()
+            self._news[(data["title"], data["published_at"])] = data
+
+        self._changed()
+        logger.info(f"Bootstrap cache warmed with {len(self._messages)} messages and {len(self._news)} news")
+
+
+bootstrap_cache = BootstrapCache()
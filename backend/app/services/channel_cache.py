@@ -0,0 +1,103 @@
+import logging
+import time
+from typing import Optional
+
+import redis
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.models.channel import Channel
+
+logger = logging.getLogger(__name__)
+
+
+def _redis_client():
+    return redis.Redis.from_url(
+        settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=1
+    )
+
+
+def bump_channel_cache_version():
+    """Tell Celery workers that the channel set changed."""
+    try:
+        _redis_client().incr(settings.CHANNEL_CACHE_VERSION_KEY)
+    except Exception as e:
+        logger.warning(f"Could not bump channel cache version: {e}")
+
+
+class ChannelIdCache:
+    """Worker-local username -> channels.id map.
+
+    Channel rows are never deleted (removal only clears is_active), so a cached
+    id stays valid; the Redis version key just lets workers drop the map when
+    the API changes the channel set. The key is polled at most once per
+    CHANNEL_CACHE_CHECK_INTERVAL seconds.
+    """
+
+    def __init__(self, check_interval: Optional[float] = None):
+        self._ids = {}
+        self._version = None
+        self._checked_at = 0.0
+        self._check_interval = (
+            settings.CHANNEL_CACHE_CHECK_INTERVAL if check_interval is None else check_interval
+        )
+        self._redis = None
+
+    def _read_version(self):
+        try:
+            if self._redis is None:
+                self._redis = _redis_client()
+            return self._redis.get(settings.CHANNEL_CACHE_VERSION_KEY)
+        except Exception as e:
+            logger.debug(f"Channel cache version check failed: {e}")
+            return self._version
+
+    def _check_version(self):
+        now = time.monotonic()
+        if now - self._checked_at < self._check_interval:
+            return
+        self._checked_at = now
+
+        version = self._read_version()
+        if version != self._version:
+            if self._ids:
+                logger.info("Channel set changed, dropping channel id cache")
+            self._ids.clear()
+            self._version = version
+
+    def warm(self, db):
+        self._version = self._read_version()
+        self._checked_at = time.monotonic()
+        self._ids = dict(db.query(Channel.username, Channel.id).all())
+        logger.info(f"Channel id cache warmed with {len(self._ids)} channels")
+
+    def resolve(self, db, channels: dict) -> dict:
+        """Map usernames to ids, creating missing channels. `channels` is username -> title."""
+        self._check_version()
+
+        missing = [username for username in channels if username not in self._ids]
+        if missing:
+            db.execute(
+                insert(Channel)
+                .values([
+                    {'username': username, 'title': channels[username] or username, 'is_active': True}
+                    for username in missing
+                ])
+                .on_conflict_do_nothing(index_elements=["username"])
+            )
+            self._ids.update(
+                db.query(Channel.username, Channel.id)
+                .filter(Channel.username.in_(missing))
+                .all()
+            )
+
+        return {username: self._ids[username] for username in channels if username in self._ids}
+
+    def get_id(self, db, username: str, title: Optional[str] = None) -> Optional[int]:
+        return self.resolve(db, {username: title}).get(username)
+
+    def invalidate(self):
+        self._ids.clear()
+
+
+channel_cache = ChannelIdCache()
@@ -0,0 +1,57 @@
+import re
+
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.models.symbol_tag import MessageSymbol, NewsSymbol
+
+_QUOTE_ASSETS = ("USDT", "USDC", "USD")
+
+
+def normalize_symbol(symbol: str) -> str:
+    """'SOLUSDT', 'sol' and '$SOL' all map to the base asset 'SOL'."""
+    symbol = symbol.strip().lstrip('$').upper()
+    for quote in _QUOTE_ASSETS:
+        if symbol.endswith(quote) and len(symbol) > len(quote):
+            return symbol[:-len(quote)]
+    return symbol
+
+
+_BASE_ASSETS = sorted({normalize_symbol(s) for s in settings.TRACKED_SYMBOLS}, key=len, reverse=True)
+_ALTERNATION = "|".join(_BASE_ASSETS)
+# Upper-case tickers (optionally glued to a quote asset, e.g. BTCUSDT) and
+# case-insensitive cashtags like $sol; lower-case words such as "near" are ignored.
+_TICKER_RE = re.compile(rf"\b({_ALTERNATION})(?:{'|'.join(_QUOTE_ASSETS)})?\b")
+_CASHTAG_RE = re.compile(rf"\$({_ALTERNATION})\b", re.IGNORECASE)
+
+
+def extract_symbols(text: str) -> set[str]:
+    if not text:
+        return set()
+    found = set(_TICKER_RE.findall(text))
+    found.update(m.upper() for m in _CASHTAG_RE.findall(text))
+    return found
+
+
+def tag_messages(db, rows):
+    """rows: iterable of (message_id, channel_id, telegram_date, text)."""
+    values = [
+        {'message_id': message_id, 'symbol': symbol, 'channel_id': channel_id, 'telegram_date': telegram_date}
+        for message_id, channel_id, telegram_date, text in rows
+        for symbol in extract_symbols(text)
+    ]
+    if values:
+        db.execute(insert(MessageSymbol).values(values).on_conflict_do_nothing())
+    return len(values)
+
+
+def tag_news(db, rows):
+    """rows: iterable of (news_id, published_at, title)."""
+    values = [
+        {'news_id': news_id, 'symbol': symbol, 'published_at': published_at}
+        for news_id, published_at, title in rows
+        for symbol in extract_symbols(title)
+    ]
+    if values:
+        db.execute(insert(NewsSymbol).values(values).on_conflict_do_nothing())
+    return len(values)
@@ -1,64 +1,78 @@
 from datetime import datetime
 import logging
+from sqlalchemy.dialects.postgresql import insert
 from app.core.celery_app import celery_app
 from app.db.session import SessionLocal
 from app.models.cryptopanic_news import CryptoPanicNews
+from app.services.symbols import tag_news
 
 logger = logging.getLogger(__name__)
 
 
-@celery_app.task(name="app.tasks.cryptopanic_tasks.fetch_and_persist_news")
-def fetch_and_persist_news(news_list: list):
-    if not news_list:
-        logger.info("No news received from news_service")
-        return
+def _normalize_news(news_list: list) -> list:
+    """Turn raw CryptoPanic items into insert rows, deduplicated on (title, published_at)."""
+    rows = {}
+    for item in news_list:
+        title = (item.get("title") or "").strip()
+        if not title:
+            continue
 
-    db = SessionLocal()
-    new_count = 0
-    try:
-        for item in news_list:
-            title = item.get("title", "").strip()
-            if not title:
-                continue
+        published_str = item.get("published_at")
+        if not published_str:
+            continue
+
+        try:
+            published_at = datetime.fromisoformat(published_str.replace("Z", "+00:00"))
+        except (ValueError, TypeError):
+            published_at = datetime.utcnow()
 
-            published_str = item.get("published_at")
-            if not published_str:
-                continue
+        key = (title, published_at)
+        if key in rows:
+            continue
 
-            try:
-                published_at = datetime.fromisoformat(published_str.replace("Z", "+00:00"))
-            except (ValueError, TypeError):
-                published_at = datetime.utcnow()
+        source = item.get("source")
+        rows[key] = {
+            "title": title,
+            "description": item.get("description"),
+            "published_at": published_at,
+            "kind": item.get("kind", "news"),
+            "source_title": source.get("title") if isinstance(source, dict) else None,
+            "url": item.get("url"),
+            "created_at": datetime.utcnow(),
+        }
+    return list(rows.values())
 
-            existing = db.query(CryptoPanicNews).filter(
-                CryptoPanicNews.title == title,
-                CryptoPanicNews.published_at == published_at
-            ).first()
 
-            if existing:
-                continue
+@celery_app.task(name="app.tasks.cryptopanic_tasks.fetch_and_persist_news")
+def fetch_and_persist_news(news_list: list):
+    if not news_list:
+        logger.info("No news received from news_service")
+        return {"inserted": 0, "skipped": 0}
 
-            try:
-                with db.begin_nested():
-                    news = CryptoPanicNews(
-                        title=title,
-                        description=item.get("description"),
-                        published_at=published_at,
-                        kind=item.get("kind", "news"),
-                        source_title=item.get("source", {}).get("title") if isinstance(item.get("source"), dict) else None,
-                        url=item.get("url"),
-                    )
-                    db.add(news)
-                db.flush()
-                new_count += 1
-            except Exception:
-                db.rollback()
-                logger.debug(f"Skipping duplicate news: {title}")
+    rows = _normalize_news(news_list)
+    if not rows:
+        logger.info(f"Skipped {len(news_list)} CryptoPanic news items without title or date")
+        return {"inserted": 0, "skipped": len(news_list)}
 
+    db = SessionLocal()
+    try:
+        stmt = (
+            insert(CryptoPanicNews)
+            .values(rows)
+            .on_conflict_do_nothing(constraint="_title_published_uc")
+            .returning(CryptoPanicNews.id, CryptoPanicNews.published_at, CryptoPanicNews.title)
+        )
+        inserted_rows = db.execute(stmt).all()
+        tag_news(db, inserted_rows)
         db.commit()
-        logger.info(f"Persisted {new_count} new CryptoPanic news items")
+
+        inserted = len(inserted_rows)
+        skipped = len(news_list) - inserted
+        logger.info(f"Persisted {inserted} new CryptoPanic news items ({skipped} skipped)")
+        return {"inserted": inserted, "skipped": skipped}
     except Exception as e:
         logger.error(f"Error persisting CryptoPanic news: {e}")
         db.rollback()
+        return {"inserted": 0, "skipped": len(news_list)}
     finally:
         db.close()
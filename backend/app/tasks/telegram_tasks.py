@@ -1,13 +1,28 @@
 from datetime import datetime
 import logging
+from celery.signals import worker_process_init
 from app.core.celery_app import celery_app
 from app.db.session import SessionLocal
+from sqlalchemy import case, func
 from sqlalchemy.dialects.postgresql import insert
 from app.models.message import Message
-from app.models.channel import Channel
+from app.services.channel_cache import channel_cache
+from app.services.symbols import tag_messages
 
 logger = logging.getLogger(__name__)
 
+
+@worker_process_init.connect
+def warm_channel_cache(**kwargs):
+    db = SessionLocal()
+    try:
+        channel_cache.warm(db)
+    except Exception as e:
+        logger.warning(f"Channel id cache warm-up failed: {e}")
+    finally:
+        db.close()
+
+
 @celery_app.task(name="app.tasks.telegram_tasks.persist_telegram_message")
 def persist_telegram_message(message_data: dict):
 
@@ -15,15 +30,8 @@ def persist_telegram_message(message_data: dict):
     db = SessionLocal()
     try:
         username = message_data.get('channel_username', '').strip('@')
-        stmt = insert(Channel).values(
-            username=username,
-            title=message_data.get('channel_title', username),
-            is_active=True
-        ).on_conflict_do_nothing(index_elements=["username"])
-        db.execute(stmt)
-        db.flush()
-        channel = db.query(Channel).filter(Channel.username == username).first()
-        if not channel:
+        channel_id = channel_cache.get_id(db, username, message_data.get('channel_title', username))
+        if not channel_id:
             raise Exception(f"Failed to get or create channel @{username}")
             
         tg_msg_id = message_data.get('id')
@@ -32,20 +40,20 @@ def persist_telegram_message(message_data: dict):
         existing = None
         if grouped_id:
             existing = db.query(Message).filter(
-                Message.channel_id == channel.id,
+                Message.channel_id == channel_id,
                 Message.grouped_id == grouped_id
             ).first()
 
         if not existing:
             existing = db.query(Message).filter(
-                Message.channel_id == channel.id,
+                Message.channel_id == channel_id,
                 Message.telegram_message_id == tg_msg_id
             ).first()
 
         if not existing:
 
             new_msg = Message(
-                channel_id=channel.id,
+                channel_id=channel_id,
                 telegram_message_id=tg_msg_id,
                 grouped_id=grouped_id,
                 text=message_data.get('text'),
@@ -84,10 +92,185 @@ def persist_telegram_message(message_data: dict):
                     existing.has_media = 1
                     existing.media_type = new_media.media_type
                     existing.media_path = new_media.media_path
-        
+
+        tag_messages(db, [(existing.id, channel_id, existing.telegram_date, existing.text)])
         db.commit()
     except Exception as e:
         logger.error(f"Error persisting telegram message: {e}")
         db.rollback()
+        # A rolled-back channel insert may have been cached
+        channel_cache.invalidate()
+    finally:
+        db.close()
+
+
+def _parse_telegram_date(value):
+    if not value:
+        return datetime.utcnow()
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            # History adds a trailing "Z" even when an offset is already present
+            return datetime.fromisoformat(value.rstrip('Z'))
+        except ValueError:
+            return datetime.utcnow()
+
+
+def _merge_message_batch(messages: list, channel_ids: dict, existing_groups: dict) -> dict:
+    """Collapse a batch into one row per (channel_id, telegram_message_id).
+
+    Album parts are folded into the row that already owns their grouped_id,
+    either in the database (existing_groups) or earlier in the batch.
+    """
+    merged = {}
+    batch_groups = {}
+
+    for data in messages:
+        username = (data.get('channel_username') or '').strip('@')
+        channel_id = channel_ids.get(username)
+        if channel_id is None:
+            continue
+
+        tg_msg_id = data.get('id')
+        grouped_id = data.get('grouped_id')
+        if grouped_id:
+            group_key = (channel_id, grouped_id)
+            tg_msg_id = existing_groups.get(group_key) or batch_groups.setdefault(group_key, tg_msg_id)
+
+        media = []
+        for item in (data.get('media_list') or []):
+            if item.get('path'):
+                media.append((item.get('type'), item['path']))
+        if data.get('has_media') and data.get('media_path'):
+            media.append((data.get('media_type'), data['media_path']))
+
+        key = (channel_id, tg_msg_id)
+        row = merged.get(key)
+        if row is None:
+            merged[key] = {
+                'channel_id': channel_id,
+                'telegram_message_id': tg_msg_id,
+                'grouped_id': grouped_id,
+                'text': data.get('text'),
+                'views': data.get('views', 0),
+                'forwards': data.get('forwards', 0),
+                'telegram_date': _parse_telegram_date(data.get('date')),
+                'media': list(dict.fromkeys(media)),
+            }
+            continue
+
+        row['views'] = data.get('views', row['views'])
+        row['forwards'] = data.get('forwards', row['forwards'])
+        if not row['text'] and data.get('text'):
+            row['text'] = data.get('text')
+        row['media'] = list(dict.fromkeys(row['media'] + media))
+
+    return merged
+
+
+@celery_app.task(name="app.tasks.telegram_tasks.persist_telegram_messages_batch")
+def persist_telegram_messages_batch(messages: list):
+    if not messages:
+        return
+
+    from app.models.message import MessageMedia
+    db = SessionLocal()
+    try:
+        channel_titles = {}
+        for data in messages:
+            username = (data.get('channel_username') or '').strip('@')
+            if username:
+                channel_titles.setdefault(username, data.get('channel_title', username))
+        if not channel_titles:
+            return
+
+        channel_ids = channel_cache.resolve(db, channel_titles)
+
+        grouped_ids = {data['grouped_id'] for data in messages if data.get('grouped_id')}
+        existing_groups = {}
+        if grouped_ids:
+            for channel_id, grouped_id, tg_msg_id in (
+                db.query(Message.channel_id, Message.grouped_id, Message.telegram_message_id)
+                .filter(Message.grouped_id.in_(grouped_ids))
+                .order_by(Message.id)
+                .all()
+            ):
+                existing_groups.setdefault((channel_id, grouped_id), tg_msg_id)
+
+        merged = _merge_message_batch(messages, channel_ids, existing_groups)
+        if not merged:
+            return
+
+        rows = []
+        for row in merged.values():
+            first_media = row['media'][0] if row['media'] else (None, None)
+            rows.append({
+                'channel_id': row['channel_id'],
+                'telegram_message_id': row['telegram_message_id'],
+                'grouped_id': row['grouped_id'],
+                'text': row['text'],
+                'views': row['views'],
+                'forwards': row['forwards'],
+                'has_media': 1 if row['media'] else 0,
+                'media_type': first_media[0],
+                'media_path': first_media[1],
+                'telegram_date': row['telegram_date'],
+            })
+
+        stmt = insert(Message).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            constraint="_channel_msg_uc",
+            set_={
+                'views': stmt.excluded.views,
+                'forwards': stmt.excluded.forwards,
+                'text': func.coalesce(func.nullif(Message.text, ''), stmt.excluded.text),
+                'has_media': func.greatest(Message.has_media, stmt.excluded.has_media),
+                'media_type': case(
+                    (Message.media_path.is_(None), stmt.excluded.media_type),
+                    else_=Message.media_type,
+                ),
+                'media_path': func.coalesce(Message.media_path, stmt.excluded.media_path),
+            },
+        ).returning(Message.id, Message.channel_id, Message.telegram_message_id)
+        message_ids = {
+            (channel_id, tg_msg_id): msg_id
+            for msg_id, channel_id, tg_msg_id in db.execute(stmt).all()
+        }
+
+        tag_messages(db, [
+            (message_ids[key], row['channel_id'], row['telegram_date'], row['text'])
+            for key, row in merged.items()
+            if key in message_ids
+        ])
+
+        wanted_media = {}
+        for key, row in merged.items():
+            msg_id = message_ids.get(key)
+            if msg_id is None:
+                continue
+            for media_type, media_path in row['media']:
+                wanted_media.setdefault((msg_id, media_path), media_type)
+
+        if wanted_media:
+            existing_media = set(
+                db.query(MessageMedia.message_id, MessageMedia.media_path)
+                .filter(MessageMedia.message_id.in_({msg_id for msg_id, _ in wanted_media}))
+                .all()
+            )
+            new_media = [
+                {'message_id': msg_id, 'media_type': media_type, 'media_path': media_path}
+                for (msg_id, media_path), media_type in wanted_media.items()
+                if (msg_id, media_path) not in existing_media
+            ]
+            if new_media:
+                db.execute(insert(MessageMedia).values(new_media))
+
+        db.commit()
+        logger.info(f"Persisted batch of {len(merged)} messages from {len(channel_ids)} channels")
+    except Exception as e:
+        logger.error(f"Error persisting telegram message batch: {e}")
+        db.rollback()
+        channel_cache.invalidate()
     finally:
         db.close()
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import random
+import time
+from typing import Optional
+
+import websockets
+
+from loadtest.server import raise_fd_limit
+
+PONG_FRAME = json.dumps({"type": "pong"})
+
+
+class ClientStats:
+    """Delivery latency and seq gaps seen by one or more clients in the measurement window."""
+
+    def __init__(self, window_start: float, window_end: float):
+        self.window_start = window_start
+        self.window_end = window_end
+        self.latencies_ms: list[float] = []
+        self.dropped = 0
+        self.connected = 0
+        self.connect_failures = 0
+        self.disconnects = 0
+
+    def on_frame(self, message: dict, last_seq: Optional[int], now_ms: float) -> Optional[int]:
+        """Account one frame; returns the client's new last seq."""
+        kind = message.get("type")
+        seq = message.get("seq")
+        if kind in ("bootstrap", "session", "resync_required"):
+            return seq
+        if seq is None:
+            return last_seq
+
+        in_window = self.window_start <= now_ms / 1000 <= self.window_end
+        if in_window:
+            if last_seq is not None and seq > last_seq + 1:
+                self.dropped += seq - last_seq - 1
+            published_at = (message.get("data") or {}).get("published_at")
+            if kind == "update" and published_at:
+                self.latencies_ms.append(now_ms - published_at)
+        return seq
+
+    def to_dict(self) -> dict:
+        return {
+            "latencies_ms": self.latencies_ms,
+            "dropped": self.dropped,
+            "connected": self.connected,
+            "connect_failures": self.connect_failures,
+            "disconnects": self.disconnects,
+        }
+
+
+async def _client(url: str, delay: float, stats: ClientStats):
+    await asyncio.sleep(delay)
+    try:
+        ws = await websockets.connect(url, ping_interval=None, max_size=None, open_timeout=60, close_timeout=1)
+    except Exception:
+        stats.connect_failures += 1
+        return
+
+    stats.connected += 1
+    last_seq = None
+    try:
+        async for raw in ws:
+            now_ms = time.time() * 1000
+            message = json.loads(raw)
+            if message.get("type") == "ping":
+                await ws.send(PONG_FRAME)
+                continue
+            last_seq = stats.on_frame(message, last_seq, now_ms)
+    except websockets.ConnectionClosed:
+        pass
+    finally:
+        if time.time() < stats.window_end:
+            stats.disconnects += 1
+        await ws.close()
+
+
+async def run_clients(url: str, count: int, connect_rate: float, window_start: float,
+                      window_end: float, seed: int = 0) -> dict:
+    """Open `count` clients spread over count / connect_rate seconds and read until the window ends."""
+    stats = ClientStats(window_start, window_end)
+    rng = random.Random(seed)
+    tasks = [
+        asyncio.create_task(_client(url, i / connect_rate + rng.uniform(0, 1 / connect_rate), stats))
+        for i in range(count)
+    ]
+    await asyncio.sleep(max(0.0, window_end - time.time()))
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return stats.to_dict()
+
+
+def worker(url: str, count: int, connect_rate: float, window_start: float, window_end: float, seed: int) -> dict:
+    """multiprocessing entrypoint: one event loop per process."""
+    raise_fd_limit()
+    return asyncio.run(run_clients(url, count, connect_rate, window_start, window_end, seed))
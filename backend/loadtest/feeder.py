@@ -0,0 +1,62 @@
+import asyncio
+import json
+import logging
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "crypto:updates"
+
+
+def price_payload(symbols: int, tick: int, rng: random.Random) -> dict:
+    """A crypto:updates payload shaped like the one crypto_service publishes."""
+    now = int(time.time() * 1000)
+    prices = {}
+    for i in range(symbols):
+        price = (100.0 + i) * (1 + rng.uniform(-0.01, 0.01))
+        prices[f"S{i:04d}USDT"] = {
+            "symbol": f"S{i:04d}USDT",
+            "price": round(price, 4),
+            "change_24h": round(rng.uniform(-5, 5), 2),
+            "volume_24h": 123456.7,
+            "high_24h": round(price * 1.02, 4),
+            "low_24h": round(price * 0.98, 4),
+            "timestamp": now - rng.randint(0, 900),
+            "rsi": round(rng.uniform(20, 80), 2),
+            "is_trending": i % 7 == 0,
+            "tvl": None,
+            "tvl_change_1d": None,
+            "money_flow_24h": None,
+            "global_stats": {},
+            "history_ready": True,
+            "indicators_ready": True,
+        }
+    return {"prices": prices, "tick": tick}
+
+
+async def feed(publish: Callable[[str], Awaitable], rate: float, symbols: int,
+               duration: Optional[float] = None, seed: int = 42):
+    """Publish `rate` updates per second on a fixed schedule; late ticks are not made up."""
+    rng = random.Random(seed)
+    loop = asyncio.get_running_loop()
+    interval = 1 / rate
+    started = next_at = loop.time()
+    tick = 0
+    logger.info(f"Feeding {CHANNEL} at {rate}/s with {symbols} symbols")
+
+    while duration is None or loop.time() - started < duration:
+        payload = price_payload(symbols, tick, rng)
+        payload["published_at"] = time.time() * 1000
+        await publish(json.dumps(payload))
+        tick += 1
+        next_at = max(next_at + interval, loop.time())
+        await asyncio.sleep(next_at - loop.time())
+
+
+def redis_publisher(redis_client, transport: str) -> Callable[[str], Awaitable]:
+    """Publish the way crypto_service does for the given REDIS_TRANSPORT."""
+    if transport == "streams":
+        return lambda raw: redis_client.xadd(CHANNEL, {"data": raw}, maxlen=10000, approximate=True)
+    return lambda raw: redis_client.publish(CHANNEL, raw)
@@ -0,0 +1,267 @@
+"""
+/ws fan-out load test.
+
+    python -m loadtest.run --clients 2000 --rate 1 --symbols 20 --duration 60 --workers 4
+
+Starts loadtest.server (unless --url points at a running backend), opens the
+clients from worker processes, measures delivery latency and seq gaps during
+a fixed window after every client has connected, samples the server's CPU
+and RSS from /proc, and writes a JSON and Markdown report to loadtest/results/.
+"""
+import argparse
+import json
+import math
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime, timezone
+from typing import Optional
+
+from loadtest.clients import worker
+
+LOADTEST_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(LOADTEST_DIR, "results")
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+class ProcessSampler(threading.Thread):
+    """Samples CPU % and RSS of a local process once per interval (Linux /proc)."""
+
+    def __init__(self, pid: int, interval: float = 1.0):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.cpu_percent: list[float] = []
+        self.rss_mib: list[float] = []
+        self._done = threading.Event()
+
+    def _read(self) -> tuple[float, float]:
+        with open(f"/proc/{self.pid}/stat") as f:
+            # Fields after the parenthesised command name; utime and stime are 14 and 15
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{self.pid}/statm") as f:
+            rss_pages = int(f.read().split()[1])
+        return (int(fields[11]) + int(fields[12])) / CLOCK_TICKS, rss_pages * PAGE_SIZE / 2**20
+
+    def run(self):
+        try:
+            cpu, _ = self._read()
+            last = time.monotonic()
+            while not self._done.wait(self.interval):
+                now_cpu, rss = self._read()
+                now = time.monotonic()
+                self.cpu_percent.append(100 * (now_cpu - cpu) / (now - last))
+                self.rss_mib.append(rss)
+                cpu, last = now_cpu, now
+        except (FileNotFoundError, ProcessLookupError):
+            pass
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def percentile(sorted_values: list, q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(params: dict, worker_results: list[dict], cpu: list[float], rss: list[float],
+              server_metrics: dict) -> dict:
+    latencies = sorted(l for r in worker_results for l in r["latencies_ms"])
+    connected = sum(r["connected"] for r in worker_results)
+    expected = connected * params["rate"] * params["duration"]
+    return {
+        "params": params,
+        "clients": {
+            "connected": connected,
+            "connect_failures": sum(r["connect_failures"] for r in worker_results),
+            "disconnects": sum(r["disconnects"] for r in worker_results),
+        },
+        "delivery": {
+            "received": len(latencies),
+            "expected": round(expected),
+            "dropped": sum(r["dropped"] for r in worker_results),
+        },
+        "latency_ms": {
+            name: round(value, 2) if value is not None else None
+            for name, value in (
+                ("p50", percentile(latencies, 0.50)),
+                ("p90", percentile(latencies, 0.90)),
+                ("p99", percentile(latencies, 0.99)),
+                ("max", latencies[-1] if latencies else None),
+            )
+        },
+        "server": {
+            "cpu_percent_avg": round(sum(cpu) / len(cpu), 1) if cpu else None,
+            "cpu_percent_max": round(max(cpu), 1) if cpu else None,
+            "rss_mib_max": round(max(rss), 1) if rss else None,
+            **server_metrics,
+        },
+    }
+
+
+def scrape_server_metrics(http_base: str) -> dict:
+    """Broadcast timing and send failures from the backend's /metrics."""
+    from prometheus_client.parser import text_string_to_metric_families
+
+    try:
+        with urllib.request.urlopen(f"{http_base}/metrics", timeout=10) as response:
+            text = response.read().decode()
+    except OSError:
+        return {}
+
+    samples = {
+        sample.name: sample.value
+        for family in text_string_to_metric_families(text)
+        for sample in family.samples
+        if not sample.labels
+    }
+    count = samples.get("websocket_broadcast_seconds_count") or 0
+    return {
+        "broadcasts": int(count),
+        "broadcast_ms_avg": round(1000 * samples["websocket_broadcast_seconds_sum"] / count, 2) if count else None,
+        "send_failures": int(samples.get("websocket_send_failures_total", 0)),
+    }
+
+
+def to_markdown(report: dict) -> str:
+    p, c, d, l, s = (report[k] for k in ("params", "clients", "delivery", "latency_ms", "server"))
+    lines = [
+        f"# /ws fan-out load test ({report['meta']['created']})",
+        "",
+        f"Commit `{report['meta']['commit']}`, Python {report['meta']['python']}, {report['meta']['platform']}",
+        "",
+        f"- Clients: {p['clients']} over {p['workers']} worker processes, connected {c['connected']}, "
+        f"connect failures {c['connect_failures']}, early disconnects {c['disconnects']}",
+        f"- Feed: {p['rate']} updates/s with {p['symbols']} symbols ({p['feed']}), "
+        f"measured for {p['duration']}s after a {p['warmup']:.0f}s warm-up",
+        f"- Delivered {d['received']} of {d['expected']} expected frames, {d['dropped']} dropped (seq gaps)",
+        "",
+        "| latency | p50 | p90 | p99 | max |",
+        "|---|---|---|---|---|",
+        f"| ms | {l['p50']} | {l['p90']} | {l['p99']} | {l['max']} |",
+        "",
+        "| server | value |",
+        "|---|---|",
+    ]
+    lines += [f"| {name} | {value} |" for name, value in s.items()]
+    return "\n".join(lines) + "\n"
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=LOADTEST_DIR,
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def _wait_ready(http_base: str, timeout: float = 30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"{http_base}/", timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Backend at {http_base} did not come up within {timeout}s")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Websocket fan-out load test for the backend")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--connect-rate", type=float, default=500, help="new connections per second")
+    parser.add_argument("--rate", type=float, default=1.0, help="price updates per second")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30, help="measurement window in seconds")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--redis-url", help="feed through a real Redis instead of the in-process stand-in")
+    parser.add_argument("--url", help="ws:// URL of an already running backend; skips starting one")
+    parser.add_argument("--server-pid", type=int, help="pid to sample CPU/RSS of when --url is used")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        ws_url = args.url
+        pid = args.server_pid
+    else:
+        command = [sys.executable, "-m", "loadtest.server", "--port", str(args.port),
+                   "--rate", str(args.rate), "--symbols", str(args.symbols)]
+        if args.redis_url:
+            command += ["--redis-url", args.redis_url]
+        server = subprocess.Popen(command, cwd=os.path.dirname(LOADTEST_DIR))
+        ws_url = f"ws://127.0.0.1:{args.port}/ws"
+        pid = server.pid
+    http_base = ws_url.replace("ws://", "http://", 1).rsplit("/ws", 1)[0]
+
+    try:
+        _wait_ready(http_base)
+        warmup = args.clients / args.connect_rate + 3
+        window_start = time.time() + warmup
+        window_end = window_start + args.duration
+
+        sampler = ProcessSampler(pid) if pid else None
+        # Only the measurement window is sampled, not the connect storm
+        if sampler:
+            threading.Timer(warmup, sampler.start).start()
+
+        shares = [args.clients // args.workers + (i < args.clients % args.workers) for i in range(args.workers)]
+        with multiprocessing.Pool(args.workers) as pool:
+            worker_results = pool.starmap(worker, [
+                (ws_url, share, args.connect_rate / args.workers, window_start, window_end, args.seed + i)
+                for i, share in enumerate(shares) if share
+            ])
+
+        if sampler and sampler.is_alive():
+            sampler.stop()
+        server_metrics = scrape_server_metrics(http_base)
+    finally:
+        if server:
+            server.terminate()
+            server.wait(timeout=10)
+
+    params = {
+        "clients": args.clients, "workers": args.workers, "connect_rate": args.connect_rate,
+        "rate": args.rate, "symbols": args.symbols, "duration": args.duration, "warmup": warmup,
+        "feed": "redis" if args.redis_url else ("external" if args.url else "in-process"),
+        "seed": args.seed,
+    }
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        **summarize(params, worker_results, sampler.cpu_percent if sampler else [],
+                    sampler.rss_mib if sampler else [], server_metrics),
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    base = os.path.join(RESULTS_DIR, f"{stamp}-{args.clients}c-{args.rate:g}hz")
+    with open(f"{base}.json", "w") as f:
+        json.dump(report, f, indent=2)
+    markdown = to_markdown(report)
+    with open(f"{base}.md", "w") as f:
+        f.write(markdown)
+
+    print(markdown)
+    print(f"Report written to {base}.json and {base}.md")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
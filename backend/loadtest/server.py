@@ -0,0 +1,74 @@
+"""
+Backend instance for fan-out load tests.
+
+    python -m loadtest.server --port 8765 --rate 1 --symbols 20
+    python -m loadtest.server --port 8765 --redis-url redis://localhost:6379/0
+
+Without --redis-url the Redis subscriber is replaced by an in-process feeder
+that hands each update straight to the real message handler, so no Redis
+is needed. With --redis-url the feeder publishes to that Redis and the
+unmodified subscriber consumes it.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import resource
+import tempfile
+
+
+def raise_fd_limit():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backend with a synthetic crypto:updates feed")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate", type=float, default=1.0, help="price updates per second")
+    parser.add_argument("--symbols", type=int, default=20)
+    parser.add_argument("--redis-url", help="feed through this Redis instead of the in-process stand-in")
+    args = parser.parse_args()
+
+    raise_fd_limit()
+    workdir = tempfile.mkdtemp(prefix="loadtest-")
+    # Settings are read on import, so the environment has to be ready first
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{workdir}/loadtest.db")
+    os.environ.setdefault("MEDIA_PATH", os.path.join(workdir, "media"))
+    if args.redis_url:
+        os.environ["REDIS_URL"] = args.redis_url
+
+    import uvicorn
+    import redis.asyncio as aioredis
+
+    import app.main as backend
+    from loadtest.feeder import feed, redis_publisher
+
+    if args.redis_url:
+        subscriber = backend._redis_subscriber
+
+        async def subscriber_and_feeder():
+            redis_client = aioredis.from_url(args.redis_url, decode_responses=True)
+            publish = redis_publisher(redis_client, backend.settings.REDIS_TRANSPORT)
+            feeder = asyncio.create_task(feed(publish, args.rate, args.symbols))
+            try:
+                await subscriber()
+            finally:
+                feeder.cancel()
+                await redis_client.aclose()
+
+        backend._redis_subscriber = subscriber_and_feeder
+    else:
+        async def stand_in():
+            await feed(lambda raw: backend._handle_redis_message("crypto:updates", raw), args.rate, args.symbols)
+
+        backend._redis_subscriber = stand_in
+
+    logging.getLogger().setLevel(logging.WARNING)
+    uvicorn.run(backend.app, host=args.host, port=args.port, log_level="warning", ws_max_size=1 << 20)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import json
+
+from app.services.bootstrap import BootstrapCache
+
+
+def test_bootstrap_frame_contains_latest_state():
+    cache = BootstrapCache(size=2)
+    cache.set_prices({"BTCUSDT": {"price": 50000.0}})
+    cache.set_fear_greed({"value": 70, "value_classification": "Greed"})
+    for i, date in enumerate(["2024-01-01T10:00:00", "2024-01-01T12:00:00", "2024-01-01T11:00:00"]):
+        cache.add_message({"id": i, "channel_username": "chan", "text": f"m{i}", "date": date})
+    cache.add_message({"id": 1, "channel_username": "chan", "text": "edited", "date": "2024-01-01T12:00:00"})
+    cache.add_news([{"title": "News", "published_at": "2024-01-01T09:00:00Z", "source": {"title": "Src"}}])
+
+    frame = json.loads(cache.frame("epoch", 7))
+
+    assert frame["type"] == "bootstrap"
+    assert (frame["epoch"], frame["seq"]) == ("epoch", 7)
+    data = frame["data"]
+    assert data["prices"] == {"BTCUSDT": {"price": 50000.0}}
+    assert data["fear_greed"]["value"] == 70
+    # Newest first, capped, with edits applied in place
+    assert [m["text"] for m in data["messages"]] == ["edited", "m2"]
+    assert data["news"][0]["source_title"] == "Src"
+
+
+def test_bootstrap_frame_is_serialized_once_per_state():
+    cache = BootstrapCache(size=5)
+    cache.set_prices({"BTCUSDT": {"price": 1.0}})
+
+    first = cache.frame("epoch", 1)
+    assert cache.frame("epoch", 1) is first
+
+    cache.set_prices({"BTCUSDT": {"price": 2.0}})
+    assert cache.frame("epoch", 1) is not first
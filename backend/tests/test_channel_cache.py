@@ -0,0 +1,41 @@
+from unittest.mock import MagicMock, patch
+
+from app.services.channel_cache import ChannelIdCache
+
+
+def _db_with_channels(rows):
+    db = MagicMock()
+    db.query.return_value.all.return_value = rows
+    db.query.return_value.filter.return_value.all.return_value = rows
+    return db
+
+
+def test_resolve_uses_warm_cache_without_queries():
+    cache = ChannelIdCache(check_interval=3600)
+    with patch.object(cache, "_read_version", return_value=b"1"):
+        cache.warm(_db_with_channels([("bitcoin", 1), ("whale_alert", 2)]))
+
+    db = MagicMock()
+    assert cache.resolve(db, {"whale_alert": "Whale Alert"}) == {"whale_alert": 2}
+    db.execute.assert_not_called()
+    db.query.assert_not_called()
+
+
+def test_resolve_inserts_missing_channel():
+    cache = ChannelIdCache(check_interval=3600)
+    db = _db_with_channels([("new_chan", 7)])
+
+    with patch.object(cache, "_read_version", return_value=None):
+        assert cache.get_id(db, "new_chan", "New") == 7
+    db.execute.assert_called_once()
+
+
+def test_version_change_drops_cache():
+    cache = ChannelIdCache(check_interval=0)
+    with patch.object(cache, "_read_version", return_value=b"1"):
+        cache.warm(_db_with_channels([("bitcoin", 1)]))
+
+    db = _db_with_channels([("bitcoin", 1)])
+    with patch.object(cache, "_read_version", return_value=b"2"):
+        cache.resolve(db, {"bitcoin": "Bitcoin"})
+    db.execute.assert_called_once()
@@ -0,0 +1,17 @@
+from app.tasks.cryptopanic_tasks import _normalize_news
+
+
+def test_normalize_news_dedups_and_skips_invalid():
+    news = [
+        {"title": " BTC up ", "published_at": "2024-01-01T00:00:00Z", "source": {"title": "CoinDesk"}},
+        {"title": "BTC up", "published_at": "2024-01-01T00:00:00Z"},
+        {"title": "", "published_at": "2024-01-01T00:00:00Z"},
+        {"title": "No date"},
+    ]
+
+    rows = _normalize_news(news)
+
+    assert len(rows) == 1
+    assert rows[0]["title"] == "BTC up"
+    assert rows[0]["source_title"] == "CoinDesk"
+    assert rows[0]["kind"] == "news"
@@ -15,3 +15,17 @@ def test_health_check_ok(mock_redis, test_client: TestClient):
         assert data["status"] in ["healthy", "connecting"]
     else:
         assert response.status_code == 503
+
+@patch("app.api.api_v1.endpoints.health.aioredis.from_url")
+def test_health_check_uses_last_update(mock_redis, test_client: TestClient):
+    import time
+
+    mock_client = AsyncMock()
+    mock_client.get.return_value = str(int(time.time() * 1000))
+    mock_redis.return_value = mock_client
+
+    response = test_client.get("/api/v1/health/")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["crypto_service_connected"] is True
+    mock_client.get.assert_called_once_with("crypto:last_update")
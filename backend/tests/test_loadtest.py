@@ -0,0 +1,31 @@
+from loadtest.clients import ClientStats
+from loadtest.run import summarize
+
+
+def test_client_stats_counts_latency_and_seq_gaps_inside_window():
+    stats = ClientStats(window_start=100.0, window_end=200.0)
+
+    last = stats.on_frame({"type": "bootstrap", "seq": 10}, None, 99_000)
+    # Before the window: tracked for ordering but not measured
+    last = stats.on_frame({"type": "update", "seq": 11, "data": {"published_at": 98_990}}, last, 99_500)
+    last = stats.on_frame({"type": "update", "seq": 12, "data": {"published_at": 100_000}}, last, 100_025)
+    last = stats.on_frame({"type": "update", "seq": 15, "data": {"published_at": 101_000}}, last, 101_040)
+
+    assert last == 15
+    assert stats.latencies_ms == [25, 40]
+    assert stats.dropped == 2
+
+
+def test_summarize_aggregates_workers():
+    params = {"rate": 1.0, "duration": 10}
+    workers = [
+        {"latencies_ms": [5.0, 1.0], "dropped": 1, "connected": 2, "connect_failures": 0, "disconnects": 0},
+        {"latencies_ms": [3.0], "dropped": 0, "connected": 1, "connect_failures": 1, "disconnects": 1},
+    ]
+
+    report = summarize(params, workers, cpu=[10.0, 30.0], rss=[100.0, 120.0], server_metrics={})
+
+    assert report["clients"] == {"connected": 3, "connect_failures": 1, "disconnects": 1}
+    assert report["delivery"] == {"received": 3, "expected": 30, "dropped": 1}
+    assert report["latency_ms"]["p50"] == 3.0 and report["latency_ms"]["max"] == 5.0
+    assert report["server"]["cpu_percent_avg"] == 20.0 and report["server"]["rss_mib_max"] == 120.0
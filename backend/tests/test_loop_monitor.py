@@ -0,0 +1,27 @@
+import asyncio
+import time
+
+from prometheus_client import REGISTRY
+from pulse_common.loop_monitor import LoopMonitor
+
+
+def test_monitor_records_lag_and_blocking_stack():
+    monitor = LoopMonitor(interval=0.02, threshold=0.1)
+    lag_before = REGISTRY.get_sample_value("event_loop_lag_seconds_count") or 0
+
+    async def scenario():
+        task = asyncio.create_task(monitor.run())
+        await asyncio.sleep(0.05)
+        # A sync DB query inside an async endpoint looks like this to the loop
+        time.sleep(0.3)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(scenario())
+
+    assert "scenario" in monitor.last_stack
+    assert REGISTRY.get_sample_value("event_loop_lag_seconds_count") > lag_before
@@ -14,3 +14,19 @@ def test_root_endpoint(test_client: TestClient):
 def test_media_static_mount(test_client: TestClient):
     response = test_client.get("/media/")
     assert response.status_code in [200, 404]
+
+def test_websocket_bootstrap_and_pong(test_client: TestClient):
+    from app.main import manager
+
+    with test_client.websocket_connect("/ws") as ws:
+        frame = ws.receive_json()
+        assert frame["type"] == "bootstrap"
+        assert frame["epoch"] == manager.epoch
+        assert set(frame["data"]) == {"prices", "fear_greed", "messages", "news"}
+        ws.send_text('{"type": "pong"}')
+
+def test_metrics_endpoint(test_client: TestClient):
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    assert "websocket_clients" in response.text
+    assert "websocket_broadcast_seconds" in response.text
@@ -0,0 +1,29 @@
+import asyncio
+
+from app import main
+from app.core.memory import accountant
+
+
+def test_memory_endpoint_only_measures_and_run_trims_stale_symbols(monkeypatch):
+    monkeypatch.setattr(main, "_latest_prices", {"BTCUSDT": {"price": 1.0, "timestamp": 2}})
+    monkeypatch.setattr(main, "_sent_event_ts", {"BTCUSDT": 2, **{f"OLD{i}USDT": i for i in range(5000)}})
+    monkeypatch.setitem(accountant.budgets, "sent_event_ts", 4096)
+    main._track_memory()
+
+    report = asyncio.run(main.memory())
+
+    assert len(main._sent_event_ts) == 5001
+    structures = report["structures"]
+    assert structures["latest_prices"]["items"] == 1
+    assert structures["sent_event_ts"]["budget_bytes"] == 4096
+    assert structures["bootstrap_cache"]["bytes"] > 0
+    assert report["tracemalloc"] == {"tracing": False}
+
+    async def one_interval():
+        task = asyncio.create_task(accountant.run(60))
+        await asyncio.sleep(0)
+        task.cancel()
+
+    asyncio.run(one_interval())
+
+    assert main._sent_event_ts == {"BTCUSDT": 2}
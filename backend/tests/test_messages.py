@@ -16,3 +16,15 @@ def test_get_messages_with_limit(test_client: TestClient):
 def test_get_messages_with_skip(test_client: TestClient):
     response = test_client.get("/api/v1/messages/?skip=10")
     assert response.status_code in [200, 500]
+
+def test_get_messages_with_invalid_cursor(test_client: TestClient):
+    response = test_client.get("/api/v1/messages/?cursor=not-a-cursor")
+    assert response.status_code in [400, 500]
+
+def test_cursor_round_trip():
+    from datetime import datetime
+    from app.api.api_v1.endpoints.messages import encode_cursor, decode_cursor
+    from app.models.message import Message
+
+    msg = Message(id=42, telegram_date=datetime(2024, 1, 2, 3, 4, 5))
+    assert decode_cursor(encode_cursor(msg)) == (datetime(2024, 1, 2, 3, 4, 5), 42)
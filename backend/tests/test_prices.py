@@ -27,3 +27,23 @@ def test_get_prices_endpoint_empty(test_client: TestClient):
         data = response.json()
         assert "data" in data
         assert data["data"] == {}
+
+def test_get_symbol_price_endpoint(test_client: TestClient):
+    with patch("app.api.api_v1.endpoints.prices.aioredis.from_url") as mock_redis:
+        mock_client = AsyncMock()
+        mock_client.hgetall.return_value = {"price": "50000.0", "rsi": "61.5", "is_trending": "true"}
+        mock_redis.return_value = mock_client
+
+        response = test_client.get("/api/v1/prices/btcusdt")
+        assert response.status_code == 200
+        assert response.json()["data"] == {"price": 50000.0, "rsi": 61.5, "is_trending": True}
+        mock_client.hgetall.assert_called_once_with("crypto:price:BTCUSDT")
+
+def test_get_symbol_price_not_found(test_client: TestClient):
+    with patch("app.api.api_v1.endpoints.prices.aioredis.from_url") as mock_redis:
+        mock_client = AsyncMock()
+        mock_client.hgetall.return_value = {}
+        mock_redis.return_value = mock_client
+
+        response = test_client.get("/api/v1/prices/NOPEUSDT")
+        assert response.status_code == 404
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+
+import app.main as main
+from app.core.config import settings
+
+
+class StopReading(Exception):
+    pass
+
+
+class FakeStreamRedis:
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.calls = []
+
+    async def xrevrange(self, stream, count=None):
+        return [("5-0", {"data": "{}"})] if stream == "crypto:updates" else []
+
+    async def xread(self, streams, count=None, block=None):
+        self.calls.append(dict(streams))
+        if not self.batches:
+            raise StopReading()
+        return self.batches.pop(0)
+
+
+def _entry(entry_id, payload):
+    return (entry_id, {"data": json.dumps(payload)})
+
+
+def test_stream_offsets_start_after_newest_entry():
+    offsets = asyncio.run(main._stream_offsets(FakeStreamRedis([])))
+    assert offsets == {"crypto:updates": "5-0", "news:telegram": "0-0", "news:cryptopanic": "0-0"}
+
+
+def test_read_streams_batches_and_resumes(monkeypatch):
+    sent = []
+
+    async def fake_broadcast(message, topic=None):
+        sent.append(message)
+
+    monkeypatch.setattr(main.manager, "broadcast", fake_broadcast)
+
+    redis_client = FakeStreamRedis([
+        [
+            ("crypto:updates", [
+                _entry("6-0", {"prices": {"BTCUSDT": {"price": 1}}}),
+                _entry("7-0", {"prices": {"BTCUSDT": {"price": 2}}}),
+            ]),
+            ("news:telegram", [
+                _entry("1-0", {"type": "telegram_update", "data": {"id": 1}}),
+                _entry("2-0", {"type": "telegram_update", "data": {"id": 2}}),
+            ]),
+        ],
+    ])
+    offsets = {"crypto:updates": "5-0", "news:telegram": "0-0", "news:cryptopanic": "0-0"}
+
+    with pytest.raises(StopReading):
+        asyncio.run(main._read_streams(redis_client, offsets))
+
+    # Price snapshots are conflated to the newest one, news entries are all delivered
+    assert sent == [
+        {"type": "update", "data": {"prices": {"BTCUSDT": {"price": 2}}}},
+        {"type": "telegram_update", "data": {"id": 1}},
+        {"type": "telegram_update", "data": {"id": 2}},
+    ]
+    assert main.get_latest_prices() == {"BTCUSDT": {"price": 2}}
+    # The next read continues after the last delivered ids
+    assert redis_client.calls[-1] == {"crypto:updates": "7-0", "news:telegram": "2-0", "news:cryptopanic": "0-0"}
+
+
+def _hop_count(hop):
+    return REGISTRY.get_sample_value("price_latency_seconds_count", {"hop": hop}) or 0
+
+
+def test_price_update_records_hop_latency(monkeypatch):
+    sent = []
+
+    async def fake_broadcast(message, topic=None):
+        sent.append(message)
+
+    monkeypatch.setattr(main.manager, "broadcast", fake_broadcast)
+    monkeypatch.setattr(settings, "LATENCY_TRACE", True)
+    before = {hop: _hop_count(hop) for hop in ("publish_to_backend", "backend_to_send", "exchange_to_send")}
+
+    now = time.time() * 1000
+    raw = json.dumps({"prices": {"LATUSDT": {"price": 1, "timestamp": now - 300}}, "published_at": now - 50})
+    asyncio.run(main._handle_redis_message("crypto:updates", raw))
+    # The same tick published again is not counted twice end to end
+    asyncio.run(main._handle_redis_message("crypto:updates", raw))
+
+    assert sent[0]["data"]["backend_received_at"] >= now
+    assert _hop_count("publish_to_backend") == before["publish_to_backend"] + 2
+    assert _hop_count("backend_to_send") == before["backend_to_send"] + 2
+    assert _hop_count("exchange_to_send") == before["exchange_to_send"] + 1
@@ -0,0 +1,31 @@
+from fastapi.testclient import TestClient
+
+from app.services.symbols import extract_symbols, normalize_symbol
+
+
+def test_extract_symbols_tickers_and_cashtags():
+    text = "BTC breaks out, $sol follows; ETH/USDT and LINKUSDT too"
+    assert extract_symbols(text) == {"BTC", "SOL", "ETH", "LINK"}
+
+
+def test_extract_symbols_ignores_lowercase_words():
+    assert extract_symbols("we are near the top, link in bio") == set()
+    assert extract_symbols(None) == set()
+
+
+def test_normalize_symbol():
+    assert normalize_symbol("SOLUSDT") == "SOL"
+    assert normalize_symbol("$sol") == "SOL"
+
+
+def test_search_messages_by_symbol(test_client: TestClient):
+    response = test_client.get("/api/v1/search/messages?symbol=SOL&since=2024-01-01T00:00:00")
+    assert response.status_code in [200, 500]
+
+    if response.status_code == 200:
+        assert isinstance(response.json(), list)
+
+
+def test_search_news_by_symbol(test_client: TestClient):
+    response = test_client.get("/api/v1/search/news?symbol=BTCUSDT&limit=5")
+    assert response.status_code in [200, 500]
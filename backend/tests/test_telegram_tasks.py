@@ -0,0 +1,31 @@
+from app.tasks.telegram_tasks import _merge_message_batch
+
+
+def test_merge_message_batch_folds_album_parts():
+    messages = [
+        {"id": 10, "channel_username": "chan", "grouped_id": 77, "text": "", "views": 1,
+         "has_media": True, "media_type": "photo", "media_path": "chan_10.jpg"},
+        {"id": 11, "channel_username": "chan", "grouped_id": 77, "text": "Album caption", "views": 5,
+         "has_media": True, "media_type": "photo", "media_path": "chan_11.jpg"},
+    ]
+
+    merged = _merge_message_batch(messages, {"chan": 1}, {})
+
+    assert list(merged) == [(1, 10)]
+    row = merged[(1, 10)]
+    assert row["text"] == "Album caption"
+    assert row["views"] == 5
+    assert row["media"] == [("photo", "chan_10.jpg"), ("photo", "chan_11.jpg")]
+
+
+def test_merge_message_batch_uses_existing_group_owner():
+    messages = [{"id": 12, "channel_username": "@chan", "grouped_id": 77, "text": "x"}]
+
+    merged = _merge_message_batch(messages, {"chan": 1}, {(1, 77): 10})
+
+    assert list(merged) == [(1, 10)]
+
+
+def test_merge_message_batch_skips_unknown_channels():
+    merged = _merge_message_batch([{"id": 1, "channel_username": "ghost"}], {"chan": 1}, {})
+    assert merged == {}
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import time
+
+from app.core.ws_manager import ConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, on_send=None, fail=False):
+        self.sent = []
+        self.on_send = on_send
+        self.fail = fail
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, message):
+        self.sent.append(message)
+
+    async def send_text(self, text):
+        if self.fail:
+            raise RuntimeError("socket gone")
+        self.sent.append(json.loads(text))
+        if self.on_send:
+            await self.on_send()
+
+    async def close(self, code=1000):
+        self.closed = True
+
+
+def _broadcast_news(manager, count, start=0):
+    for i in range(start, start + count):
+        asyncio.run(manager.broadcast({"type": "telegram_update", "data": {"id": i}}, topic="telegram"))
+
+
+def test_resume_replays_missed_messages_in_order():
+    manager = ConnectionManager(replay_size=10)
+    _broadcast_news(manager, 2)
+    token = manager.resume_token
+
+    _broadcast_news(manager, 2, start=2)
+    asyncio.run(manager.broadcast({"type": "update", "data": {"prices": {"p": 1}}}, topic="prices"))
+    asyncio.run(manager.broadcast({"type": "update", "data": {"prices": {"p": 2}}}, topic="prices"))
+
+    ws = FakeWebSocket()
+    asyncio.run(manager.connect(ws, resume_from=token))
+
+    assert ws.sent[0]["type"] == "session"
+    replayed = ws.sent[1:]
+    assert [m["seq"] for m in replayed] == [3, 4, 6]
+    assert [m["data"].get("id") for m in replayed[:2]] == [2, 3]
+    # Only the newest price snapshot is replayed
+    assert replayed[2]["data"]["prices"] == {"p": 2}
+    assert ws in manager.active_connections
+
+
+def test_resume_from_other_epoch_requires_resync():
+    manager = ConnectionManager(replay_size=10)
+    _broadcast_news(manager, 3)
+
+    ws = FakeWebSocket()
+    asyncio.run(manager.connect(ws, resume_from="stale-epoch:1"))
+
+    assert [m["type"] for m in ws.sent] == ["resync_required", "session"]
+    assert ws in manager.active_connections
+
+
+def test_resume_past_ring_requires_resync():
+    manager = ConnectionManager(replay_size=3)
+    token = manager.resume_token
+    _broadcast_news(manager, 5)
+
+    ws = FakeWebSocket()
+    asyncio.run(manager.connect(ws, resume_from=token))
+
+    assert [m["type"] for m in ws.sent] == ["resync_required", "session"]
+
+
+def test_broadcasts_during_replay_are_not_lost():
+    manager = ConnectionManager(replay_size=10)
+    token = manager.resume_token
+    _broadcast_news(manager, 2)
+
+    pending = [{"type": "telegram_update", "data": {"id": 99}}]
+
+    async def broadcast_once():
+        if pending:
+            await manager.broadcast(pending.pop(), topic="telegram")
+
+    ws = FakeWebSocket(on_send=broadcast_once)
+    asyncio.run(manager.connect(ws, resume_from=token))
+
+    assert [m["seq"] for m in ws.sent[1:]] == [1, 2, 3]
+
+
+def test_fresh_client_gets_bootstrap_frame_then_live_updates():
+    manager = ConnectionManager(replay_size=10)
+    manager.bootstrap = lambda epoch, seq: json.dumps({"type": "bootstrap", "epoch": epoch, "seq": seq})
+    _broadcast_news(manager, 2)
+
+    ws = FakeWebSocket()
+    asyncio.run(manager.connect(ws))
+    _broadcast_news(manager, 1, start=2)
+
+    assert ws.sent[0] == {"type": "bootstrap", "epoch": manager.epoch, "seq": 2}
+    # Nothing already covered by the bootstrap frame is replayed
+    assert [m["seq"] for m in ws.sent[1:]] == [3]
+
+
+def test_heartbeat_pings_one_slot_per_tick():
+    manager = ConnectionManager(heartbeat_slots=2)
+    first, second = FakeWebSocket(), FakeWebSocket()
+    asyncio.run(manager.connect(first))
+    asyncio.run(manager.connect(second))
+
+    asyncio.run(manager.heartbeat_slot(0))
+
+    assert first.sent[-1] == {"type": "ping"}
+    assert second.sent[-1]["type"] == "session"
+
+
+def test_heartbeat_reaps_idle_and_dead_clients_in_batch():
+    manager = ConnectionManager(heartbeat_slots=1)
+    idle, silent, dead = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+    for ws in (idle, silent, dead):
+        asyncio.run(manager.connect(ws))
+    manager.touch(idle, '{"type": "pong"}')
+    dead.fail = True
+
+    asyncio.run(manager.heartbeat_slot(0, now=time.monotonic() + 3600))
+
+    # Clients that never answered a ping are kept, since they may not support it
+    assert manager.active_connections == [silent]
+    assert idle.closed
+    assert silent.sent[-1] == {"type": "ping"}
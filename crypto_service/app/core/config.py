@@ -34,6 +34,59 @@ class Settings:
     REDIS_CHANNEL: str = "crypto:updates"
     REDIS_PRICES_KEY: str = "crypto:prices"
     REDIS_FEAR_GREED_KEY: str = "crypto:fear_greed"
+    # One hash per symbol (field -> JSON value) plus a cheap liveness key in epoch ms
+    REDIS_PRICE_HASH_PREFIX: str = "crypto:price:"
+    REDIS_LAST_UPDATE_KEY: str = "crypto:last_update"
+    # Hashes of symbols that stop ticking (delisted, untracked, service down) expire after this
+    REDIS_PRICE_HASH_TTL: int = int(os.environ.get("REDIS_PRICE_HASH_TTL", "30"))
+
+    # "pubsub" (fire-and-forget) or "streams" (XADD, replayable by the backend)
+    REDIS_TRANSPORT: str = os.environ.get("REDIS_TRANSPORT", "pubsub").lower()
+    # Approximate XADD MAXLEN ~ for crypto:updates. Each entry is a full price snapshot and the
+    # backend only acts on the newest, so a minute of entries covers any reconnect
+    REDIS_UPDATES_STREAM_MAXLEN: int = int(os.environ.get("REDIS_UPDATES_STREAM_MAXLEN", "60"))
+
+    # Point at a local replay server (app/scripts/replay_binance.py) to run offline
+    BINANCE_WS_URL: str = os.environ.get("BINANCE_WS_URL", "wss://stream.binance.com:9443/ws")
+    # Directory for gzip recordings of every raw websocket frame; empty disables recording
+    BINANCE_RECORD_DIR: str = os.environ.get("BINANCE_RECORD_DIR", "")
+
+    # Binance websocket reconnect backoff (seconds), exponential with jitter
+    RECONNECT_BASE_DELAY: float = float(os.environ.get("RECONNECT_BASE_DELAY", "1"))
+    RECONNECT_MAX_DELAY: float = float(os.environ.get("RECONNECT_MAX_DELAY", "60"))
+
+    # Deep kline backfill into price_history; BACKFILL_DAYS=0 disables it
+    BACKFILL_DAYS: int = int(os.environ.get("BACKFILL_DAYS", "7"))
+    BACKFILL_CONCURRENCY: int = int(os.environ.get("BACKFILL_CONCURRENCY", "4"))
+    # Consecutive rows further apart than this are treated as a gap and repaired
+    BACKFILL_GAP_SECONDS: float = float(os.environ.get("BACKFILL_GAP_SECONDS", "180"))
+    BACKFILL_REPAIR_INTERVAL: float = float(os.environ.get("BACKFILL_REPAIR_INTERVAL", "900"))
+
+    # Adds receive/process times to ticked prices in the broadcast only; hop histograms are always on
+    LATENCY_TRACE: bool = os.environ.get("LATENCY_TRACE", "false").lower() in ("1", "true", "yes")
+
+    # Opt-in event loop lag probe; stalls over the threshold log the loop thread's stack
+    LOOP_MONITOR: bool = os.environ.get("LOOP_MONITOR", "false").lower() in ("1", "true", "yes")
+    LOOP_MONITOR_INTERVAL: float = float(os.environ.get("LOOP_MONITOR_INTERVAL", "0.1"))
+    LOOP_BLOCK_THRESHOLD: float = float(os.environ.get("LOOP_BLOCK_THRESHOLD", "0.25"))
+
+    # Port of the /metrics HTTP server; 0 disables it
+    METRICS_PORT: int = int(os.environ.get("METRICS_PORT", "9101"))
+
+    # Deep size of long-lived buffers into memory_structure_* gauges every N seconds; 0 disables it
+    MEMORY_ACCOUNTING_INTERVAL: float = float(os.environ.get("MEMORY_ACCOUNTING_INTERVAL", "60"))
+    # MiB per structure, "name=MiB,..."; a structure over budget is trimmed in place
+    MEMORY_BUDGETS_MB: str = os.environ.get("MEMORY_BUDGETS_MB", "history=64,processed_at=1")
+    # Frames kept per allocation for the /memory tracemalloc report; 0 leaves tracemalloc off
+    MEMORY_TRACEMALLOC: int = int(os.environ.get("MEMORY_TRACEMALLOC", "0"))
+
+    # Warm-restart snapshots of in-memory stream state: "file", "redis" or "off"
+    SNAPSHOT_BACKEND: str = os.environ.get("SNAPSHOT_BACKEND", "file")
+    SNAPSHOT_PATH: str = os.environ.get("SNAPSHOT_PATH", "/data/snapshots/crypto_stream.snap")
+    SNAPSHOT_REDIS_KEY: str = "crypto:stream_snapshot"
+    SNAPSHOT_INTERVAL: float = float(os.environ.get("SNAPSHOT_INTERVAL", "30"))
+    # Older snapshots are ignored and the stream backfills from REST instead
+    SNAPSHOT_MAX_AGE: float = float(os.environ.get("SNAPSHOT_MAX_AGE", "900"))
 
 
 settings = Settings()
@@ -0,0 +1,58 @@
+from prometheus_client import Counter, Histogram
+
+# Sub-millisecond buckets for per-tick work, wider ones for I/O
+FAST_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+IO_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# Hop latencies span network delay up to the one second publish cadence
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+BINANCE_TICKS = Counter(
+    "binance_ticks_total", "Ticker events processed, after conflation", ["symbol"]
+)
+BINANCE_TICKS_CONFLATED = Counter(
+    "binance_ticks_conflated_total", "Ticker frames overwritten by a newer one before processing"
+)
+BINANCE_RECONNECTS = Counter(
+    "binance_ws_reconnects_total", "Binance websocket reconnect attempts"
+)
+PROCESS_MESSAGE_SECONDS = Histogram(
+    "binance_process_message_seconds", "Time spent in process_message per processed ticker frame",
+    buckets=FAST_BUCKETS,
+)
+PUBLISH_LOOP_DRIFT_SECONDS = Histogram(
+    "redis_publish_loop_drift_seconds", "How late each publish-loop tick fired",
+    buckets=IO_BUCKETS,
+)
+REDIS_PUBLISH_SECONDS = Histogram(
+    "redis_publish_seconds", "Round trip of the pipelined price publish",
+    buckets=IO_BUCKETS,
+)
+DB_FLUSH_SECONDS = Histogram(
+    "db_flush_seconds", "Duration of price_history writes", ["source"],
+    buckets=IO_BUCKETS,
+)
+DB_FLUSH_ROWS = Counter(
+    "db_flush_rows_total", "Rows written to price_history", ["source"]
+)
+PRICE_LATENCY_SECONDS = Histogram(
+    "price_latency_seconds", "Per-hop latency of a price tick on its way to Redis", ["hop"],
+    buckets=LATENCY_BUCKETS,
+)
+
+# exchange_to_receive: Binance event time (E) -> frame received, includes clock skew
+# receive_to_process:  frame received -> process_message done
+# process_to_publish:  process_message done -> published by the 1s loop
+HOP_LATENCY = {
+    hop: PRICE_LATENCY_SECONDS.labels(hop)
+    for hop in ("exchange_to_receive", "receive_to_process", "process_to_publish")
+}
+
+# labels() takes a lock and a dict lookup; per-tick callers reuse the child
+_tick_counters = {}
+
+
+def tick_counter(symbol: str):
+    counter = _tick_counters.get(symbol)
+    if counter is None:
+        counter = _tick_counters[symbol] = BINANCE_TICKS.labels(symbol)
+    return counter
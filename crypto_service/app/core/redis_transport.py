@@ -0,0 +1,8 @@
+from pulse_common.redis_transport import publish_update as _publish_update
+
+from app.core.config import settings
+
+
+async def publish_update(redis_client, channel: str, payload: str):
+    """Send one update over the configured transport (Pub/Sub or a capped Redis Stream)."""
+    await _publish_update(redis_client, channel, payload, settings.REDIS_TRANSPORT, settings.REDIS_UPDATES_STREAM_MAXLEN)
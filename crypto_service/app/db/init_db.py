@@ -0,0 +1,44 @@
+import logging
+from sqlalchemy import text
+
+from app.db.base import Base
+
+logger = logging.getLogger(__name__)
+
+PRICE_HISTORY_UNIQUE_INDEX = "ux_price_history_symbol_ts"
+
+# Older databases may already hold duplicate (symbol, timestamp) rows, which
+# must go before the unique index can be built. Keeps the oldest row.
+DEDUPE_PRICE_HISTORY = """
+DELETE FROM price_history a
+USING price_history b
+WHERE a.symbol = b.symbol
+  AND a.timestamp = b.timestamp
+  AND a.id > b.id
+"""
+
+# Repair watermarks used to be stored as "<interval>:repair" checkpoint rows
+DROP_LEGACY_REPAIR_CHECKPOINTS = "DELETE FROM backfill_checkpoints WHERE interval LIKE :pattern"
+
+
+def init_db(engine):
+    from app.models.price_history import PriceHistory
+    from app.models.backfill_checkpoint import BackfillCheckpoint
+    from app.models.repair_watermark import RepairWatermark
+
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(text(DROP_LEGACY_REPAIR_CHECKPOINTS), {"pattern": "%:repair"})
+
+    # create_all() only builds indexes together with new tables
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        if conn.execute(text(f"SELECT to_regclass('{PRICE_HISTORY_UNIQUE_INDEX}')")).scalar() is not None:
+            return
+        removed = conn.execute(text(DEDUPE_PRICE_HISTORY)).rowcount
+        conn.execute(text(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {PRICE_HISTORY_UNIQUE_INDEX} "
+            "ON price_history (symbol, timestamp)"
+        ))
+        logger.info(f"Created {PRICE_HISTORY_UNIQUE_INDEX} (removed {removed} duplicate rows)")
@@ -1,9 +1,17 @@
 import asyncio
 import logging
+import signal
 import redis.asyncio as aioredis
+from pulse_common.loop_monitor import LoopMonitor
+from pulse_common.memory import start_tracemalloc
+from pulse_common.metrics_server import register_route, start_metrics_server
 
 from app.core.config import settings
+from app.core.memory import accountant
+from app.db.init_db import init_db
+from app.db.session import engine
 from app.services.binance import BinancePriceStream
+from app.services.http_client import close_upstreams
 
 logging.basicConfig(
     level=logging.INFO,
@@ -28,14 +36,46 @@ async def main():
         logger.error(f"Failed to connect to Redis: {e}")
         raise
 
+    try:
+        await asyncio.to_thread(init_db, engine)
+    except Exception as e:
+        logger.error(f"Failed to prepare database schema: {e}")
+
+    start_tracemalloc(settings.MEMORY_TRACEMALLOC)
+
+    metrics_server = None
+    if settings.METRICS_PORT:
+        metrics_server = await start_metrics_server(settings.METRICS_PORT)
+
+    monitor_task = None
+    if settings.LOOP_MONITOR:
+        monitor = LoopMonitor(settings.LOOP_MONITOR_INTERVAL, settings.LOOP_BLOCK_THRESHOLD)
+        monitor_task = asyncio.create_task(monitor.run())
+
     stream = BinancePriceStream(settings.TRACKED_SYMBOLS)
+    stream.track_memory(accountant)
+    register_route("/memory", accountant.json_route)
+
+    memory_task = None
+    if settings.MEMORY_ACCOUNTING_INTERVAL:
+        memory_task = asyncio.create_task(accountant.run(settings.MEMORY_ACCOUNTING_INTERVAL))
+
+    # docker stop sends SIGTERM; cancelling main runs the cleanup below (snapshot, recorder)
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
 
     try:
         await stream.start(redis_client)
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         logger.info("Shutting down...")
     finally:
+        if monitor_task:
+            monitor_task.cancel()
+        if memory_task:
+            memory_task.cancel()
         await stream.close()
+        await close_upstreams()
+        if metrics_server:
+            metrics_server.close()
         await redis_client.aclose()
         logger.info("Crypto Service shutdown complete")
 
@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, String
+from app.db.base import Base
+
+
+class BackfillCheckpoint(Base):
+    """
+    Contiguous kline range already stored in price_history for one symbol/interval.
+    Gap repair progress is kept separately, in RepairWatermark.
+    """
+    __tablename__ = "backfill_checkpoints"
+
+    symbol = Column(String, primary_key=True)
+    interval = Column(String, primary_key=True)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,13 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, String
+from app.db.base import Base
+
+
+class RepairWatermark(Base):
+    """End of the last gap repair_gaps fetched for one symbol/interval; older gaps are not requested again."""
+    __tablename__ = "backfill_repair_watermarks"
+
+    symbol = Column(String, primary_key=True)
+    interval = Column(String, primary_key=True)
+    repaired_until = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,35 @@
+import argparse
+import asyncio
+import logging
+
+from app.services.binance.recording import SPEEDS, ReplayServer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
+)
+
+
+async def replay(path: str, speed: str, host: str, port: int, loop: bool):
+    server = ReplayServer(path, speed=SPEEDS[speed], loop=loop)
+    port = await server.start(host, port)
+    print(f"Set BINANCE_WS_URL=ws://{host}:{port} on crypto_service to consume the replay")
+    try:
+        await asyncio.Future()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a recorded Binance stream over a local websocket")
+    parser.add_argument("recording", help="gzip JSON-lines file written with BINANCE_RECORD_DIR")
+    parser.add_argument("--speed", choices=list(SPEEDS), default="1")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9443)
+    parser.add_argument("--loop", action="store_true", help="restart the recording when it ends")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(replay(args.recording, args.speed, args.host, args.port, args.loop))
+    except KeyboardInterrupt:
+        print("\nReplay stopped.")
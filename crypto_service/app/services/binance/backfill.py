@@ -0,0 +1,335 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.services.http_client import get_upstream
+
+logger = logging.getLogger(__name__)
+
+KLINES_PATH = "/api/v3/klines"
+KLINES_PAGE_LIMIT = 1000
+# Insert in chunks to stay well below the driver's bind parameter limit
+INSERT_CHUNK = 5000
+
+INTERVAL_MS = {
+    "1m": 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "1h": 60 * 60_000,
+}
+
+
+def kline_weight(limit: int) -> int:
+    # klines cost 2 weight up to limit=100, 5 up to 500, 10 above
+    return 2 if limit <= 100 else 5 if limit <= 500 else 10
+
+
+def ms_to_datetime(ts_ms: float) -> datetime:
+    return datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+
+def datetime_to_ms(dt: datetime) -> int:
+    return int(dt.replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+class PriceHistoryStore:
+    """Blocking price_history access for the backfill engine; call through asyncio.to_thread."""
+
+    def __init__(self, session_factory=None):
+        if session_factory is None:
+            from app.db.session import SessionLocal
+            session_factory = SessionLocal
+        self._session_factory = session_factory
+
+    def insert_points(self, symbol: str, points: list[tuple[datetime, float]]) -> int:
+        from app.core.metrics import DB_FLUSH_ROWS, DB_FLUSH_SECONDS
+        from app.models.price_history import PriceHistory
+
+        if not points:
+            return 0
+
+        db = self._session_factory()
+        started = time.perf_counter()
+        try:
+            inserted = 0
+            for i in range(0, len(points), INSERT_CHUNK):
+                rows = [
+                    {"symbol": symbol, "timestamp": ts, "price": price}
+                    for ts, price in points[i:i + INSERT_CHUNK]
+                ]
+                stmt = insert(PriceHistory).values(rows).on_conflict_do_nothing(
+                    index_elements=["symbol", "timestamp"]
+                )
+                inserted += db.execute(stmt).rowcount
+            db.commit()
+            DB_FLUSH_SECONDS.labels("backfill").observe(time.perf_counter() - started)
+            DB_FLUSH_ROWS.labels("backfill").inc(inserted)
+            return inserted
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def get_checkpoint(self, symbol: str, interval: str) -> Optional[tuple[datetime, datetime]]:
+        from app.models.backfill_checkpoint import BackfillCheckpoint
+
+        db = self._session_factory()
+        try:
+            checkpoint = db.get(BackfillCheckpoint, (symbol, interval))
+            if checkpoint is None:
+                return None
+            return checkpoint.start_time, checkpoint.end_time
+        finally:
+            db.close()
+
+    def get_repair_watermark(self, symbol: str, interval: str) -> Optional[datetime]:
+        from app.models.repair_watermark import RepairWatermark
+
+        db = self._session_factory()
+        try:
+            watermark = db.get(RepairWatermark, (symbol, interval))
+            return watermark.repaired_until if watermark is not None else None
+        finally:
+            db.close()
+
+    def save_repair_watermark(self, symbol: str, interval: str, until: datetime):
+        from app.models.repair_watermark import RepairWatermark
+
+        db = self._session_factory()
+        try:
+            now = datetime.utcnow()
+            stmt = insert(RepairWatermark).values(
+                symbol=symbol, interval=interval, repaired_until=until, updated_at=now
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["symbol", "interval"],
+                set_={"repaired_until": until, "updated_at": now},
+            )
+            db.execute(stmt)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def save_checkpoint(self, symbol: str, interval: str, start: datetime, end: datetime):
+        from app.models.backfill_checkpoint import BackfillCheckpoint
+
+        db = self._session_factory()
+        try:
+            now = datetime.utcnow()
+            stmt = insert(BackfillCheckpoint).values(
+                symbol=symbol, interval=interval, start_time=start, end_time=end, updated_at=now
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["symbol", "interval"],
+                set_={"start_time": start, "end_time": end, "updated_at": now},
+            )
+            db.execute(stmt)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def find_gaps(self, symbol: str, since: datetime, min_gap_seconds: float) -> list[tuple[datetime, datetime]]:
+        from app.models.price_history import PriceHistory
+
+        db = self._session_factory()
+        try:
+            rows = (
+                select(
+                    PriceHistory.timestamp.label("ts"),
+                    func.lag(PriceHistory.timestamp).over(order_by=PriceHistory.timestamp).label("prev_ts"),
+                )
+                .where(PriceHistory.symbol == symbol, PriceHistory.timestamp >= since)
+                .subquery()
+            )
+            stmt = (
+                select(rows.c.prev_ts, rows.c.ts)
+                .where(func.extract("epoch", rows.c.ts - rows.c.prev_ts) > min_gap_seconds)
+                .order_by(rows.c.ts)
+            )
+            return [(prev_ts, ts) for prev_ts, ts in db.execute(stmt).all()]
+        finally:
+            db.close()
+
+
+class KlineBackfill:
+    """
+    Fills price_history with closed klines going back `days` per symbol.
+
+    Progress is checkpointed as one contiguous [start, end] range per
+    symbol/interval, so an interrupted run resumes where it stopped and later
+    runs only fetch the new tail. Pages are fetched in parallel; the shared
+    Binance upstream client keeps the request weight within limits.
+    """
+
+    def __init__(
+        self,
+        store=None,
+        concurrency: Optional[int] = None,
+        gap_seconds: Optional[float] = None,
+        page_limit: int = KLINES_PAGE_LIMIT,
+        clock: Callable[[], float] = time.time,
+    ):
+        from app.core.config import settings
+
+        self.store = store or PriceHistoryStore()
+        self.concurrency = concurrency or settings.BACKFILL_CONCURRENCY
+        self.gap_seconds = settings.BACKFILL_GAP_SECONDS if gap_seconds is None else gap_seconds
+        self.page_limit = page_limit
+        self._clock = clock
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def run(self, symbols: list[str], interval: str = "1m", days: Optional[int] = None) -> dict:
+        from app.core.config import settings
+
+        days = settings.BACKFILL_DAYS if days is None else days
+        results = await asyncio.gather(*(self._run_symbol(s, interval, days) for s in symbols))
+        summary = dict(zip(symbols, results))
+        total = sum(r["inserted"] for r in results)
+        logger.info(f"Backfill pass done: {total} new {interval} points across {len(symbols)} symbols")
+        return summary
+
+    async def _run_symbol(self, symbol: str, interval: str, days: int) -> dict:
+        result = {"inserted": 0, "repaired": 0}
+        try:
+            result["inserted"] = await self.backfill_symbol(symbol, interval, days)
+            result["repaired"] = await self.repair_gaps(symbol, interval, days)
+            result["inserted"] += result["repaired"]
+        except Exception as e:
+            logger.error(f"Backfill failed for {symbol} {interval}: {e}")
+        return result
+
+    async def backfill_symbol(self, symbol: str, interval: str = "1m", days: int = 7) -> int:
+        step = INTERVAL_MS[interval]
+        now_ms = int(self._clock() * 1000)
+        # Open time of the newest closed kline; the running one would keep changing
+        last_closed = now_ms - now_ms % step - step
+        target_start = last_closed - days * 86_400_000
+
+        checkpoint = await asyncio.to_thread(self.store.get_checkpoint, symbol, interval)
+        coverage = [target_start, target_start - 1]
+        if checkpoint is not None:
+            start, end = datetime_to_ms(checkpoint[0]), datetime_to_ms(checkpoint[1])
+            # A checkpoint that ends before the window is stale; the hole in between is not covered
+            if end >= target_start - 1:
+                coverage = [start, end]
+
+        inserted = 0
+        # Extend the covered range backwards (older days requested) ...
+        if target_start < coverage[0]:
+            windows = self._windows(target_start, coverage[0] - 1, step)
+            inserted += await self._fill(symbol, interval, list(reversed(windows)), coverage)
+        # ... and forwards up to the last closed kline
+        if coverage[1] < last_closed:
+            windows = self._windows(max(coverage[1] + 1, target_start), last_closed, step)
+            inserted += await self._fill(symbol, interval, windows, coverage)
+
+        if inserted:
+            logger.info(f"Backfilled {inserted} {interval} points for {symbol}")
+        return inserted
+
+    async def repair_gaps(self, symbol: str, interval: str = "1m", days: int = 7) -> int:
+        since = ms_to_datetime(self._clock() * 1000 - days * 86_400_000)
+        # Gaps before the watermark were fetched once already; whatever Binance had is stored,
+        # the rest are periods without klines and are not requested again
+        watermark = await asyncio.to_thread(self.store.get_repair_watermark, symbol, interval)
+        if watermark is not None and watermark > since:
+            since = watermark
+
+        gaps = await asyncio.to_thread(self.store.find_gaps, symbol, since, self.gap_seconds)
+        if not gaps:
+            return 0
+
+        step = INTERVAL_MS[interval]
+        windows = []
+        for gap_start, gap_end in gaps:
+            windows.extend(self._windows(datetime_to_ms(gap_start) + 1, datetime_to_ms(gap_end) - 1, step))
+
+        points = await self._fetch_windows(symbol, interval, windows)
+        inserted = await asyncio.to_thread(self.store.insert_points, symbol, points)
+        await asyncio.to_thread(self.store.save_repair_watermark, symbol, interval, gaps[-1][1])
+        logger.info(f"Repaired {len(gaps)} gaps for {symbol} ({inserted} points)")
+        return inserted
+
+    async def fill_window(self, symbols: list[str], start_ms: int, end_ms: int,
+                          interval: str = "1m") -> dict[str, list[tuple[datetime, float]]]:
+        """Fetch and store the closed klines in [start_ms, end_ms] for all symbols in one burst."""
+        step = INTERVAL_MS[interval]
+        now_ms = int(self._clock() * 1000)
+        end_ms = min(end_ms, now_ms - now_ms % step - step)
+        windows = self._windows(start_ms - start_ms % step, end_ms, step)
+        if not windows:
+            return {}
+
+        async def fill_symbol(symbol):
+            points = await self._fetch_windows(symbol, interval, windows)
+            await asyncio.to_thread(self.store.insert_points, symbol, points)
+            return points
+
+        results = await asyncio.gather(*(fill_symbol(s) for s in symbols), return_exceptions=True)
+        filled = {}
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.error(f"Gap fill failed for {symbol}: {result}")
+            else:
+                filled[symbol] = result
+        return filled
+
+    def _windows(self, start_ms: int, end_ms: int, step: int) -> list[tuple[int, int]]:
+        """Split [start_ms, end_ms] into ranges of at most one kline page each."""
+        span = step * self.page_limit
+        return [
+            (page_start, min(page_start + span - 1, end_ms))
+            for page_start in range(start_ms, end_ms + 1, span)
+        ]
+
+    async def _fill(self, symbol: str, interval: str, windows: list, coverage: list) -> int:
+        """Fetch windows adjacent to `coverage` batch by batch, checkpointing after each."""
+        inserted = 0
+        for i in range(0, len(windows), self.concurrency):
+            batch = windows[i:i + self.concurrency]
+            points = await self._fetch_windows(symbol, interval, batch)
+            inserted += await asyncio.to_thread(self.store.insert_points, symbol, points)
+
+            coverage[0] = min(coverage[0], min(start for start, _ in batch))
+            coverage[1] = max(coverage[1], max(end for _, end in batch))
+            await asyncio.to_thread(
+                self.store.save_checkpoint, symbol, interval,
+                ms_to_datetime(coverage[0]), ms_to_datetime(coverage[1]),
+            )
+        return inserted
+
+    async def _fetch_windows(self, symbol: str, interval: str, windows: list) -> list[tuple[datetime, float]]:
+        pages = await asyncio.gather(*(
+            self._fetch_page(symbol, interval, start, end) for start, end in windows
+        ))
+        points = {}
+        for page in pages:
+            for kline in page:
+                points[kline[0]] = float(kline[4])
+        return [(ms_to_datetime(ts), price) for ts, price in sorted(points.items())]
+
+    async def _fetch_page(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> list:
+        async with self._semaphore:
+            return await get_upstream("binance").get_json(
+                KLINES_PATH,
+                params={
+                    "symbol": symbol,
+                    "interval": interval,
+                    "startTime": start_ms,
+                    "endTime": end_ms,
+                    "limit": self.page_limit,
+                },
+                weight=kline_weight(self.page_limit),
+            )
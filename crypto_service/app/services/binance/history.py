@@ -1,92 +1,112 @@
 import asyncio
 import logging
-from datetime import datetime, timezone, timedelta
+import time
+from datetime import timezone
 
 logger = logging.getLogger(__name__)
 
 class BinanceHistoryMixin:
     
     async def fetch_initial_history(self):
-        import requests
-        from app.db.session import SessionLocal
-        from app.models.price_history import PriceHistory
-
-        logger.info("Fetching high-res initial history for all symbols (1m + 5m backfill)...")
-        tasks = []
-        for symbol in self.symbols:
-            tasks.append(self._fetch_and_persist(symbol.upper(), "1m", 60))
-            tasks.append(self._fetch_and_persist(symbol.upper(), "5m", 288))
+        logger.info("Backfilling high-res history for all symbols (1m + 5m) in the background...")
+        # Symbols restored from a fresh snapshot already have their window
+        pending = [s.upper() for s in self.symbols if s.upper() not in self.history_ready]
+        await asyncio.gather(*(self._backfill_symbol(symbol) for symbol in pending))
+        logger.info("High-res history backfill completed.")
+
+    async def _backfill_symbol(self, symbol_upper):
+        await asyncio.gather(
+            self._fetch_and_persist(symbol_upper, "1m", 60),
+            self._fetch_and_persist(symbol_upper, "5m", 288),
+        )
 
-        await asyncio.gather(*tasks)
-        logger.info("High-res history fetching completed.")
-
-        db = SessionLocal()
         try:
-            for symbol in self.symbols:
-                s_upper = symbol.upper()
-                history_items = db.query(PriceHistory).filter(
-                    PriceHistory.symbol == s_upper
-                ).order_by(PriceHistory.timestamp.desc()).limit(50).all()
+            points = await asyncio.to_thread(self._load_recent_history, symbol_upper, 50)
+        except Exception as e:
+            logger.error(f"Failed to load stored history for {symbol_upper}: {e}")
+            points = []
 
-                history_items.reverse()
+        self.merge_history(symbol_upper, points)
+        self.history_ready.add(symbol_upper)
+        logger.debug(f"History ready for {symbol_upper} ({len(self.history[symbol_upper])} points)")
 
-                for item in history_items:
-                    self.history[s_upper].append({
-                        'time': item.timestamp.replace(tzinfo=timezone.utc).timestamp() * 1000,
-                        'price': item.price
-                    })
+    def _load_recent_history(self, symbol_upper, limit):
+        from app.db.session import SessionLocal
+        from app.models.price_history import PriceHistory
 
-                self._last_minute_ts[s_upper] = 0
+        db = SessionLocal()
+        try:
+            history_items = db.query(PriceHistory).filter(
+                PriceHistory.symbol == symbol_upper
+            ).order_by(PriceHistory.timestamp.desc()).limit(limit).all()
+
+            return [
+                {
+                    'time': item.timestamp.replace(tzinfo=timezone.utc).timestamp() * 1000,
+                    'price': item.price
+                }
+                for item in reversed(history_items)
+            ]
         finally:
             db.close()
 
-    async def _fetch_and_persist(self, symbol_upper, interval, limit):
-        import requests
-        from app.models.price_history import PriceHistory
+    def merge_history(self, symbol_upper, points):
+        """Splice older points into the ring, keeping live ticks that arrived meanwhile."""
+        ring = self.history[symbol_upper]
+        by_time = {p['time']: p for p in points}
+        by_time.update((p['time'], p) for p in ring)
 
+        ring.clear()
+        ring.extend(sorted(by_time.values(), key=lambda p: p['time']))
+
+    async def _fill_disconnect_gap(self, since_ms):
+        from app.services.binance.backfill import KlineBackfill, datetime_to_ms
+
+        until_ms = time.time() * 1000
+        logger.info(f"Filling {(until_ms - since_ms) / 1000:.0f}s Binance websocket gap from 1m klines...")
         try:
-            url = f"https://api.binance.com/api/v3/klines?symbol={symbol_upper}&interval={interval}&limit={limit}"
-            response = await asyncio.to_thread(requests.get, url, timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                new_entries = []
-                for kline in data:
-                    ts_ms = kline[0]
-                    price = float(kline[4])
-                    dt = datetime.fromtimestamp(ts_ms / 1000, tz=timezone.utc).replace(tzinfo=None)
-
-                    new_entries.append(PriceHistory(
-                        symbol=symbol_upper,
-                        price=price,
-                        timestamp=dt
-                    ))
-
-                if new_entries:
-                    await asyncio.to_thread(self._bulk_save_history, new_entries, symbol_upper)
+            filled = await KlineBackfill().fill_window([s.upper() for s in self.symbols], int(since_ms), int(until_ms))
         except Exception as e:
-            logger.error(f"Failed to fetch {interval} history for {symbol_upper}: {e}")
+            logger.error(f"Failed to fill websocket gap: {e}")
+            return
 
-    def _bulk_save_history(self, entries, symbol):
-        from app.db.session import SessionLocal
-        from app.models.price_history import PriceHistory
+        for symbol, points in filled.items():
+            self.merge_history(symbol, [{'time': datetime_to_ms(ts), 'price': price} for ts, price in points])
+        logger.info(f"Websocket gap filled for {len(filled)} symbols ({sum(map(len, filled.values()))} klines)")
+
+    async def _fetch_and_persist(self, symbol_upper, interval, limit):
+        from app.services.binance.backfill import KLINES_PATH, PriceHistoryStore, kline_weight, ms_to_datetime
+        from app.services.http_client import get_upstream
 
-        db = SessionLocal()
         try:
-            since = min(e.timestamp for e in entries) - timedelta(minutes=1)
-            existing_ts = db.query(PriceHistory.timestamp).filter(
-                PriceHistory.symbol == symbol,
-                PriceHistory.timestamp >= since
-            ).all()
-            existing_set = {t[0] for t in existing_ts}
-
-            to_insert = [e for e in entries if e.timestamp not in existing_set]
-            if to_insert:
-                db.bulk_save_objects(to_insert)
-                db.commit()
-                logger.debug(f"Backfilled {len(to_insert)} new points for {symbol}")
+            data = await get_upstream("binance").get_json(
+                KLINES_PATH,
+                params={"symbol": symbol_upper, "interval": interval, "limit": limit},
+                weight=kline_weight(limit),
+            )
+
+            points = [(ms_to_datetime(kline[0]), float(kline[4])) for kline in data]
+            if points:
+                inserted = await asyncio.to_thread(PriceHistoryStore().insert_points, symbol_upper, points)
+                logger.debug(f"Backfilled {inserted} new {interval} points for {symbol_upper}")
         except Exception as e:
-            db.rollback()
-            logger.error(f"Failed to bulk save history for {symbol}: {e}")
-        finally:
-            db.close()
+            logger.error(f"Failed to fetch {interval} history for {symbol_upper}: {e}")
+
+    async def _deep_backfill_loop(self):
+        from app.core.config import settings
+        from app.services.binance.backfill import KlineBackfill
+
+        if settings.BACKFILL_DAYS <= 0:
+            return
+
+        logger.info(f"Starting deep backfill loop ({settings.BACKFILL_DAYS}d, repair every {settings.BACKFILL_REPAIR_INTERVAL:.0f}s)...")
+        backfill = KlineBackfill()
+        while self._running:
+            try:
+                await backfill.run([s.upper() for s in self.symbols])
+                await asyncio.sleep(settings.BACKFILL_REPAIR_INTERVAL)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in deep backfill loop: {e}")
+                await asyncio.sleep(60)
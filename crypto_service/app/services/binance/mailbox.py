@@ -0,0 +1,31 @@
+import asyncio
+
+from app.core.metrics import BINANCE_TICKS_CONFLATED
+
+
+class TickerMailbox:
+    """
+    Latest ticker frame per symbol. The receive loop overwrites, the processing
+    task takes every dirty symbol at once, so a burst collapses to one frame
+    per symbol instead of a backlog of stale ticks.
+    """
+
+    def __init__(self):
+        # symbol -> (frame, received_at epoch ms)
+        self._latest: dict[str, tuple[dict, float]] = {}
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def put(self, symbol: str, data: dict, received_at: float):
+        if symbol in self._latest:
+            BINANCE_TICKS_CONFLATED.inc()
+        self._latest[symbol] = (data, received_at)
+        self._ready.set()
+
+    async def drain(self) -> dict[str, tuple[dict, float]]:
+        await self._ready.wait()
+        self._ready.clear()
+        batch, self._latest = self._latest, {}
+        return batch
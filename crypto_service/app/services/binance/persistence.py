@@ -2,42 +2,57 @@ import asyncio
 import logging
 from datetime import datetime
 
+from sqlalchemy.dialects.postgresql import insert
+
 logger = logging.getLogger(__name__)
 
 class BinancePersistenceMixin:
 
     async def _persistence_loop(self):
-        from app.db.session import SessionLocal
-        from app.models.price_history import PriceHistory
-
         logger.info("Starting real-time persistence loop (5s)...")
         while self._running:
             try:
                 await asyncio.sleep(5)
                 if not self.prices:
                     continue
-
-                db = SessionLocal()
-                try:
-                    new_entries = []
-                    now = datetime.utcnow()
-                    for symbol, data in self.prices.items():
-                        new_entries.append(PriceHistory(
-                            symbol=symbol.upper(),
-                            price=data['price'],
-                            timestamp=now
-                        ))
-
-                    if new_entries:
-                        db.bulk_save_objects(new_entries)
-                        db.commit()
-                        logger.debug(f"Persisted {len(new_entries)} symbols to DB")
-                except Exception as e:
-                    db.rollback()
-                    logger.error(f"Error in persistence loop: {e}")
-                finally:
-                    db.close()
+                self._persist_live_prices()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Extreme error in persistence loop: {e}")
+
+    def _persist_live_prices(self, session_factory=None) -> int:
+        """Write one price_history row per symbol for the current prices."""
+        from app.core.metrics import DB_FLUSH_ROWS, DB_FLUSH_SECONDS
+        from app.models.price_history import PriceHistory
+
+        if session_factory is None:
+            from app.db.session import SessionLocal
+            session_factory = SessionLocal
+
+        db = session_factory()
+        try:
+            now = datetime.utcnow()
+            rows = [
+                {"symbol": symbol.upper(), "price": data['price'], "timestamp": now}
+                for symbol, data in self.live_prices().items()
+            ]
+
+            inserted = 0
+            if rows:
+                # A duplicate (symbol, timestamp) skips that row instead of rolling back the batch
+                stmt = insert(PriceHistory).values(rows).on_conflict_do_nothing(
+                    index_elements=["symbol", "timestamp"]
+                )
+                with DB_FLUSH_SECONDS.labels("live").time():
+                    inserted = db.execute(stmt).rowcount
+                    db.commit()
+                DB_FLUSH_ROWS.labels("live").inc(inserted)
+                logger.debug(f"Persisted {inserted} symbols to DB")
+            return inserted
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error in persistence loop: {e}")
+            return 0
+        finally:
+            db.close()
@@ -1,10 +1,14 @@
 import logging
+import time
+
+from app.core.config import settings
+from app.core.metrics import HOP_LATENCY, tick_counter
 
 logger = logging.getLogger(__name__)
 
 class BinanceProcessorMixin:
 
-    async def process_message(self, data: dict):
+    async def process_message(self, data: dict, received_at: float = None):
         try:
             if 'result' in data:
                 logger.info("Binance subscription confirmed")
@@ -15,6 +19,7 @@ class BinanceProcessorMixin:
             if event_type == '24hrTicker':
                 symbol = data.get('s')
                 if symbol:
+                    tick_counter(symbol).inc()
                     price = float(data.get('c', 0))
                     timestamp = data.get('E')
 
@@ -26,6 +31,7 @@ class BinanceProcessorMixin:
                     history_prices = [p['price'] for p in self.history[symbol]]
                     history_times = [p['time'] for p in self.history[symbol]]
 
+                    rsi_ready = False
                     if not history_prices:
                         rsi = 50.0
                     else:
@@ -47,6 +53,7 @@ class BinanceProcessorMixin:
                             rsi = self.calculate_rsi(sample_prices, period=14)
                         elif len(minute_closes) >= 15:
                             rsi = self.calculate_rsi(minute_closes, period=14)
+                            rsi_ready = True
                         else:
                             rsi = 50.0
 
@@ -80,9 +87,24 @@ class BinanceProcessorMixin:
                         'tvl': tvl_info.get('tvl') if tvl_info else None,
                         'tvl_change_1d': tvl_info.get('change_1d') if tvl_info else None,
                         'money_flow_24h': None, # No longer from CoinGecko markets
-                        'global_stats': self.global_stats
+                        'global_stats': self.global_stats,
+                        'history_ready': symbol in self.history_ready,
+                        'indicators_ready': rsi_ready
                     }
 
+                    processed_at = time.time() * 1000
+                    self._processed_at[symbol] = processed_at
+                    if received_at is not None:
+                        if timestamp:
+                            HOP_LATENCY["exchange_to_receive"].observe(max(0.0, received_at - timestamp) / 1000)
+                        HOP_LATENCY["receive_to_process"].observe(max(0.0, processed_at - received_at) / 1000)
+                        if settings.LATENCY_TRACE:
+                            # Attached to the broadcast only, see _redis_publish_loop
+                            self._trace[symbol] = {
+                                'received_at': received_at,
+                                'processed_at': processed_at,
+                            }
+
         except Exception as e:
             logger.error(f"Error processing Binance data: {e}")
 
@@ -0,0 +1,125 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import time
+import zlib
+from typing import Iterator, Optional
+
+import websockets
+
+logger = logging.getLogger(__name__)
+
+# Replay pacing: 1 and 10 keep the recorded gaps scaled down, "max" sends back to back
+SPEEDS = {"1": 1.0, "10": 10.0, "max": 0.0}
+
+
+class FrameRecorder:
+    """
+    Appends raw Binance websocket frames to a gzip JSON-lines file, one
+    {"t": received_ms, "frame": raw_text} object per line. A new file named
+    after the start time is opened per recorder.
+
+    The stream is sync-flushed every `flush_every` frames or `flush_interval`
+    seconds, so a process that is killed without close() loses at most that
+    much and the file stays readable up to the last flush.
+    """
+
+    def __init__(self, directory: str, prefix: str = "binance", flush_every: int = 1000,
+                 flush_interval: float = 1.0):
+        os.makedirs(directory, exist_ok=True)
+        started = time.strftime("%Y%m%d-%H%M%S", time.gmtime())
+        self.path = os.path.join(directory, f"{prefix}-{started}.jsonl.gz")
+        self._file = gzip.GzipFile(self.path, "ab")
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.frames = 0
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
+
+    def record(self, raw: str, received_at: float):
+        self._file.write((json.dumps({"t": received_at, "frame": raw}) + "\n").encode())
+        self.frames += 1
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every or time.monotonic() - self._flushed_at >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        # Z_SYNC_FLUSH ends the deflate block on a byte boundary, so everything so far is decodable
+        self._file.flush(zlib.Z_SYNC_FLUSH)
+        self._unflushed = 0
+        self._flushed_at = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+            logger.info(f"Recorded {self.frames} frames to {self.path}")
+
+
+def read_frames(path: str) -> Iterator[tuple[float, str]]:
+    """Frames of a recording; one cut off by a crash ends at its last complete line."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                if line.strip():
+                    entry = json.loads(line)
+                    yield entry["t"], entry["frame"]
+        except EOFError:
+            logger.warning(f"{path} is truncated, replaying the frames written before the cut")
+
+
+class ReplayServer:
+    """
+    Serves a recording over a local websocket the way Binance would: the
+    client's SUBSCRIBE is acknowledged, then every frame is sent with the
+    recorded spacing divided by `speed` (0 = as fast as possible).
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = False):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.sent = 0
+        self._server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        self._server = await websockets.serve(self._handle, host, port, ping_interval=None)
+        port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Replaying {self.path} at {self.speed or 'max'}x on ws://{host}:{port}")
+        return port
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, websocket):
+        request = json.loads(await websocket.recv())
+        await websocket.send(json.dumps({"result": None, "id": request.get("id")}))
+
+        while True:
+            await self._send_recording(websocket)
+            if not self.loop:
+                break
+        await websocket.close()
+
+    async def _send_recording(self, websocket):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        first_t: Optional[float] = None
+
+        for t, frame in read_frames(self.path):
+            if first_t is None:
+                first_t = t
+            if self.speed:
+                delay = started + (t - first_t) / 1000 / self.speed - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif self.sent % 100 == 0:
+                # Let the client and other tasks run during a max-speed burst
+                await asyncio.sleep(0)
+            await websocket.send(frame)
+            self.sent += 1
@@ -0,0 +1,233 @@
+import asyncio
+import json
+import logging
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"CSPS"
+SNAPSHOT_VERSION = 1
+
+# magic, version, saved_at (unix seconds), length of the JSON section
+_HEADER = struct.Struct("<4sBdI")
+# symbol length, number of (time, price) points
+_SERIES = struct.Struct("<HI")
+
+
+def encode_snapshot(state: dict, history: dict, saved_at: float) -> bytes:
+    """Pack stream state as JSON and history as raw float64 pairs, zlib-compressed."""
+    meta = json.dumps(state, separators=(",", ":"), default=str).encode()
+
+    parts = [meta]
+    for symbol, points in history.items():
+        values = array("d")
+        for point in points:
+            values.append(point['time'])
+            values.append(point['price'])
+        if sys.byteorder != "little":
+            values.byteswap()
+
+        name = symbol.encode()
+        parts.append(_SERIES.pack(len(name), len(points)))
+        parts.append(name)
+        parts.append(values.tobytes())
+
+    header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, saved_at, len(meta))
+    return header + zlib.compress(b"".join(parts), 6)
+
+
+def decode_snapshot(blob: bytes) -> tuple[float, dict, dict]:
+    """Inverse of `encode_snapshot`; raises ValueError on foreign or corrupt data."""
+    if len(blob) < _HEADER.size:
+        raise ValueError("snapshot too short")
+
+    magic, version, saved_at, meta_len = _HEADER.unpack_from(blob)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("not a stream snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(f"unsupported snapshot version {version}")
+
+    try:
+        body = zlib.decompress(blob[_HEADER.size:])
+    except zlib.error as e:
+        raise ValueError(f"corrupt snapshot: {e}") from e
+
+    state = json.loads(body[:meta_len])
+
+    history = {}
+    offset = meta_len
+    while offset < len(body):
+        if offset + _SERIES.size > len(body):
+            raise ValueError("truncated snapshot")
+        name_len, count = _SERIES.unpack_from(body, offset)
+        offset += _SERIES.size
+
+        symbol = body[offset:offset + name_len].decode()
+        offset += name_len
+
+        size = count * 2 * 8
+        if offset + size > len(body):
+            raise ValueError("truncated snapshot")
+        values = array("d")
+        values.frombytes(body[offset:offset + size])
+        if sys.byteorder != "little":
+            values.byteswap()
+        offset += size
+
+        history[symbol] = [
+            {'time': values[i], 'price': values[i + 1]}
+            for i in range(0, len(values), 2)
+        ]
+
+    return saved_at, state, history
+
+
+class FileSnapshotStore:
+    def __init__(self, path: str):
+        self.path = path
+
+    async def load(self):
+        return await asyncio.to_thread(self._read)
+
+    async def save(self, blob: bytes):
+        await asyncio.to_thread(self._write, blob)
+
+    async def close(self):
+        pass
+
+    def _read(self):
+        try:
+            with open(self.path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, blob: bytes):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write aside and rename so a crash never leaves a half-written snapshot
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+        os.replace(tmp_path, self.path)
+
+
+class RedisSnapshotStore:
+    def __init__(self, url: str, key: str, ttl: float):
+        # Snapshots are binary, so this client must not decode responses
+        self._redis = aioredis.from_url(url)
+        self.key = key
+        self.ttl = max(1, int(ttl))
+
+    async def load(self):
+        return await self._redis.get(self.key)
+
+    async def save(self, blob: bytes):
+        await self._redis.set(self.key, blob, ex=self.ttl)
+
+    async def close(self):
+        await self._redis.aclose()
+
+
+def get_snapshot_store():
+    from app.core.config import settings
+
+    backend = settings.SNAPSHOT_BACKEND.lower()
+    if backend == "file":
+        return FileSnapshotStore(settings.SNAPSHOT_PATH)
+    if backend == "redis":
+        return RedisSnapshotStore(settings.REDIS_URL, settings.SNAPSHOT_REDIS_KEY, settings.SNAPSHOT_MAX_AGE)
+    if backend != "off":
+        logger.warning(f"Unknown SNAPSHOT_BACKEND '{settings.SNAPSHOT_BACKEND}', snapshots disabled")
+    return None
+
+
+class BinanceSnapshotMixin:
+
+    def live_prices(self) -> dict:
+        """Prices a tick has produced since start; restored ones only keep their slot warm."""
+        return {symbol: data for symbol, data in self.prices.items() if not data.get('restored')}
+
+    def _snapshot_state(self) -> dict:
+        return {
+            'prices': self.prices,
+            'tvl_data': self.tvl_data,
+            'trending_symbols': sorted(self.trending_symbols),
+            'money_flows': self.money_flows,
+            'global_stats': self.global_stats,
+        }
+
+    async def save_snapshot(self):
+        if self._snapshot_store is None:
+            return
+        try:
+            blob = encode_snapshot(self._snapshot_state(), self.history, time.time())
+            await self._snapshot_store.save(blob)
+            logger.debug(f"Saved stream snapshot ({len(blob)} bytes)")
+        except Exception as e:
+            logger.error(f"Failed to save stream snapshot: {e}")
+
+    async def restore_snapshot(self) -> bool:
+        from app.core.config import settings
+
+        if self._snapshot_store is None:
+            return False
+        try:
+            blob = await self._snapshot_store.load()
+            if not blob:
+                return False
+            saved_at, state, history = decode_snapshot(blob)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable stream snapshot: {e}")
+            return False
+
+        age = time.time() - saved_at
+        if age > settings.SNAPSHOT_MAX_AGE:
+            logger.info(f"Stream snapshot is {age:.0f}s old, falling back to full backfill")
+            return False
+
+        tracked = {s.upper() for s in self.symbols}
+        # Up to SNAPSHOT_MAX_AGE old: kept out of publishing and persistence until a live tick replaces them
+        self.prices.update({s: {**p, 'restored': True} for s, p in state.get('prices', {}).items() if s in tracked})
+        self.tvl_data = state.get('tvl_data', {})
+        self.trending_symbols = set(state.get('trending_symbols', []))
+        self.money_flows = state.get('money_flows', {})
+        self.global_stats = state.get('global_stats', {})
+
+        for symbol, points in history.items():
+            if symbol not in tracked:
+                continue
+            self.merge_history(symbol, points)
+            # A fresh window needs no REST backfill
+            self.history_ready.add(symbol)
+
+        # Ticks missed while the service was down are filled on the first connect
+        self._disconnected_at = saved_at * 1000
+
+        logger.info(f"Restored stream snapshot ({age:.1f}s old, {len(self.history_ready)} symbols)")
+        return True
+
+    async def _snapshot_loop(self):
+        from app.core.config import settings
+
+        if self._snapshot_store is None:
+            return
+
+        logger.info(f"Starting snapshot loop ({settings.SNAPSHOT_INTERVAL:.0f}s)...")
+        while self._running:
+            try:
+                await asyncio.sleep(settings.SNAPSHOT_INTERVAL)
+                if self.prices:
+                    await self.save_snapshot()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in snapshot loop: {e}")
@@ -1,33 +1,63 @@
 import asyncio
 import json
 import logging
+import random
+import time
 import websockets
 from collections import deque, defaultdict
+from pulse_common.memory import sampled_sizeof
 
+from app.core.metrics import BINANCE_RECONNECTS, PROCESS_MESSAGE_SECONDS
 from app.services.binance.history import BinanceHistoryMixin
+from app.services.binance.mailbox import TickerMailbox
 from app.services.binance.persistence import BinancePersistenceMixin
 from app.services.binance.updater import BinanceUpdaterMixin
 from app.services.binance.processor import BinanceProcessorMixin
+from app.services.binance.recording import FrameRecorder
+from app.services.binance.snapshot import BinanceSnapshotMixin, get_snapshot_store
 
 logger = logging.getLogger(__name__)
 
+
+def reconnect_delay(attempt: int) -> float:
+    """Exponential backoff with equal jitter, so reconnecting clients spread out."""
+    from app.core.config import settings
+
+    delay = min(settings.RECONNECT_MAX_DELAY, settings.RECONNECT_BASE_DELAY * 2 ** min(attempt, 16))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
 class BinancePriceStream(
     BinanceHistoryMixin,
     BinancePersistenceMixin,
     BinanceUpdaterMixin,
-    BinanceProcessorMixin
+    BinanceProcessorMixin,
+    BinanceSnapshotMixin
 ):
     def __init__(self, symbols: list[str]):
         self.symbols = [s.lower() for s in symbols]
         self.prices = {}
-        self.history = defaultdict(lambda: deque(maxlen=1000))
-        self._last_minute_ts = defaultdict(int)
+        # Points kept per symbol; lowered when history goes over its memory budget
+        self._history_capacity = 1000
+        self.history = defaultdict(self._new_ring)
+        # Symbols whose REST/DB backfill has been merged into history
+        self.history_ready = set()
         self.trending_symbols = set()
         self.tvl_data = {}
         self.money_flows = {}
         self.global_stats = {}
         self._running = False
         self._ws = None
+        self._last_message_at = None
+        self._disconnected_at = None
+        # symbol -> epoch ms of the last processed tick not yet published
+        self._processed_at = {}
+        # symbol -> receive/process times for LATENCY_TRACE, until the next publish
+        self._trace = {}
+        self._recorder = None
+        self._snapshot_store = get_snapshot_store()
+        self._mailbox = TickerMailbox()
+        self._process_task = None
 
     def get_prices(self) -> dict:
         return self.prices
@@ -37,19 +67,83 @@ class BinancePriceStream(
             return list(self.history[symbol])
         return []
 
+    def _drop_untracked(self, mapping: dict):
+        tracked = {s.upper() for s in self.symbols}
+        for symbol in [symbol for symbol in mapping if symbol not in tracked]:
+            del mapping[symbol]
+
+    def _new_ring(self) -> deque:
+        return deque(maxlen=self._history_capacity)
+
+    def _trim_history(self, size: int, budget: int):
+        self._drop_untracked(self.history)
+        # Shrink every symbol by the same ratio; 100 points still give a sampled RSI.
+        # The rings are rebuilt smaller, otherwise they refill and go over budget again.
+        longest = max(map(len, self.history.values()), default=0)
+        self._history_capacity = min(self._history_capacity, max(100, int(longest * 0.9 * budget / size)))
+        for symbol, points in self.history.items():
+            self.history[symbol] = deque(points, maxlen=self._history_capacity)
+
+    def track_memory(self, accountant):
+        accountant.register("history", lambda: self.history, self._trim_history, sizer=sampled_sizeof)
+        # One entry per tracked symbol, replaced on every tick: measured, not budgeted
+        accountant.register("prices", lambda: self.prices)
+        accountant.register("processed_at", lambda: self._processed_at, lambda size, budget: self._processed_at.clear())
+
+    async def _receive(self, msg: str):
+        """Decode one frame; ticker frames only overwrite their symbol's mailbox slot."""
+        data = json.loads(msg)
+        symbol = data.get('s') if data.get('e') == '24hrTicker' else None
+        if symbol:
+            self._mailbox.put(symbol, data, self._last_message_at)
+        else:
+            await self.process_message(data, received_at=self._last_message_at)
+
+    async def _process_loop(self):
+        while self._running:
+            batch = await self._mailbox.drain()
+            for data, received_at in batch.values():
+                started = time.perf_counter()
+                await self.process_message(data, received_at=received_at)
+                PROCESS_MESSAGE_SECONDS.observe(time.perf_counter() - started)
+
+    def _start_processing(self):
+        self._process_task = asyncio.create_task(self._process_loop())
+        self._process_task.add_done_callback(self._on_processing_done)
+
+    def _on_processing_done(self, task: asyncio.Task):
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.error(f"Ticker processing loop failed: {task.exception()!r}")
+        # Without a consumer the mailbox would keep conflating while prices stay frozen
+        if self._running:
+            self._start_processing()
+
     async def start(self, redis_client):
-        await self.fetch_initial_history()
+        from app.core.config import settings
+
+        await self.restore_snapshot()
         self._running = True
 
+        # Backfill runs alongside the live stream and is merged per symbol when ready
+        asyncio.create_task(self.fetch_initial_history())
+        asyncio.create_task(self._deep_backfill_loop())
+        asyncio.create_task(self._snapshot_loop())
         asyncio.create_task(self._persistence_loop())
         asyncio.create_task(self._trending_update_loop())
         asyncio.create_task(self._coingecko_market_data_loop())
         asyncio.create_task(self._fear_greed_update_loop(redis_client))
         asyncio.create_task(self._redis_publish_loop(redis_client))
+        self._start_processing()
+
+        if settings.BINANCE_RECORD_DIR:
+            self._recorder = FrameRecorder(settings.BINANCE_RECORD_DIR)
+            logger.info(f"Recording Binance frames to {self._recorder.path}")
 
-        url = "wss://stream.binance.com:9443/ws"
+        url = settings.BINANCE_WS_URL
         logger.info(f"Connecting to Binance ({url})...")
 
+        attempt = 0
         while self._running:
             try:
                 async with websockets.connect(url, ping_interval=None) as ws:
@@ -63,11 +157,18 @@ class BinancePriceStream(
                         "id": 1
                     }))
 
+                    if self._disconnected_at is not None:
+                        asyncio.create_task(self._fill_disconnect_gap(self._disconnected_at))
+                        self._disconnected_at = None
+
                     while self._running:
                         try:
                             msg = await ws.recv()
-                            data = json.loads(msg)
-                            await self.process_message(data)
+                            self._last_message_at = time.time() * 1000
+                            if self._recorder:
+                                self._recorder.record(msg, self._last_message_at)
+                            attempt = 0
+                            await self._receive(msg)
 
                         except websockets.ConnectionClosed:
                             logger.warning("Binance connection closed, reconnecting...")
@@ -78,11 +179,32 @@ class BinancePriceStream(
 
             except Exception as e:
                 logger.error(f"Binance connection error: {e}")
-                if self._running:
-                    logger.info("Reconnecting to Binance in 5 seconds...")
-                    await asyncio.sleep(5)
+
+            if self._running:
+                # The gap starts at the last tick we saw, kept across failed attempts
+                if self._disconnected_at is None and self._last_message_at is not None:
+                    self._disconnected_at = self._last_message_at
+
+                delay = reconnect_delay(attempt)
+                attempt += 1
+                BINANCE_RECONNECTS.inc()
+                logger.info(f"Reconnecting to Binance in {delay:.1f} seconds...")
+                await asyncio.sleep(delay)
 
     async def close(self):
         self._running = False
+        if self._process_task:
+            self._process_task.cancel()
+            try:
+                await self._process_task
+            except (asyncio.CancelledError, Exception):
+                # A failure has already been logged by _on_processing_done
+                pass
         if self._ws:
             await self._ws.close()
+        if self._recorder:
+            self._recorder.close()
+        if self._snapshot_store:
+            if self.prices:
+                await self.save_snapshot()
+            await self._snapshot_store.close()
@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -59,20 +60,66 @@ class BinanceUpdaterMixin:
 
     async def _redis_publish_loop(self, redis_client):
         from app.core.config import settings
+        from app.core.metrics import HOP_LATENCY, PUBLISH_LOOP_DRIFT_SECONDS, REDIS_PUBLISH_SECONDS
+        from app.core.redis_transport import publish_update
 
         logger.info("Starting Redis publish loop (1s)...")
+        loop = asyncio.get_running_loop()
+        # symbol -> tick timestamp last written to its hash
+        published = {}
         while self._running:
             try:
+                deadline = loop.time() + 1
                 await asyncio.sleep(1)
-                if not self.prices:
+                PUBLISH_LOOP_DRIFT_SECONDS.observe(max(0.0, loop.time() - deadline))
+                prices = self.live_prices()
+                if not prices:
                     continue
 
-                payload = json.dumps({"prices": self.prices})
+                published_at = time.time() * 1000
+                payload = json.dumps({"prices": prices, "published_at": published_at})
 
-                await redis_client.publish(settings.REDIS_CHANNEL, payload)
-                await redis_client.set(settings.REDIS_PRICES_KEY, payload)
+                message = payload
+                traces, self._trace = self._trace, {}
+                if traces:
+                    # Hop times ride on the broadcast only; snapshots, hashes and crypto:prices stay clean
+                    message = json.dumps({
+                        "prices": {
+                            symbol: {**data, 'trace': traces[symbol]} if symbol in traces else data
+                            for symbol, data in prices.items()
+                        },
+                        "published_at": published_at,
+                    })
+
+                pipe = redis_client.pipeline(transaction=False)
+                await publish_update(pipe, settings.REDIS_CHANNEL, message)
+                pipe.set(settings.REDIS_PRICES_KEY, payload)
+                queue_price_hashes(pipe, prices, published)
+                pipe.set(settings.REDIS_LAST_UPDATE_KEY, int(published_at))
+                with REDIS_PUBLISH_SECONDS.time():
+                    await pipe.execute()
+
+                pending, self._processed_at = self._processed_at, {}
+                for processed_at in pending.values():
+                    HOP_LATENCY["process_to_publish"].observe(max(0.0, published_at - processed_at) / 1000)
 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Error in Redis publish loop: {e}")
+
+
+def queue_price_hashes(pipe, prices: dict, published: dict) -> int:
+    """Queue HSET + EXPIRE for symbols that ticked since the last call; returns how many."""
+    from app.core.config import settings
+
+    queued = 0
+    for symbol, data in prices.items():
+        if published.get(symbol) == data.get('timestamp'):
+            continue
+        key = f"{settings.REDIS_PRICE_HASH_PREFIX}{symbol}"
+        pipe.hset(key, mapping={field: json.dumps(value) for field, value in data.items()})
+        pipe.expire(key, settings.REDIS_PRICE_HASH_TTL)
+        published[symbol] = data.get('timestamp')
+        queued += 1
+    return queued
@@ -1,12 +1,12 @@
-import httpx
 import logging
 from typing import Set, Dict, Any, List
 
+from app.services.http_client import get_upstream
+
 logger = logging.getLogger(__name__)
 
-COINGECKO_BASE_URL = "https://api.coingecko.com/api/v3"
-TRENDING_API_URL = f"{COINGECKO_BASE_URL}/search/trending"
-MARKETS_API_URL = f"{COINGECKO_BASE_URL}/coins/markets"
+TRENDING_PATH = "/search/trending"
+MARKETS_PATH = "/coins/markets"
 
 COINGECKO_IDS_MAPPING = {
     'BTCUSDT': 'bitcoin',
@@ -35,25 +35,22 @@ COINGECKO_IDS_MAPPING = {
 
 async def get_trending_symbols() -> Set[str]:
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(TRENDING_API_URL)
-            response.raise_for_status()
-            data = response.json()
-            
-            trending_identifiers = set()
-            if "coins" in data:
-                for item in data["coins"]:
-                    coin = item.get("item", {})
-                    symbol = coin.get("symbol")
-                    coin_id = coin.get("id")
-                    if symbol:
-                        trending_identifiers.add(symbol.upper())
-                    if coin_id:
-                        trending_identifiers.add(coin_id.lower())
-            
-            logger.info(f"Fetched {len(trending_identifiers)} trending identifiers from CoinGecko")
-            return trending_identifiers
-            
+        data = await get_upstream("coingecko").get_json(TRENDING_PATH)
+
+        trending_identifiers = set()
+        if "coins" in data:
+            for item in data["coins"]:
+                coin = item.get("item", {})
+                symbol = coin.get("symbol")
+                coin_id = coin.get("id")
+                if symbol:
+                    trending_identifiers.add(symbol.upper())
+                if coin_id:
+                    trending_identifiers.add(coin_id.lower())
+
+        logger.info(f"Fetched {len(trending_identifiers)} trending identifiers from CoinGecko")
+        return trending_identifiers
+
     except Exception as e:
         logger.error(f"Error fetching CoinGecko trending data: {e}")
         return set()
@@ -74,10 +71,7 @@ async def get_coins_markets_data(symbols: List[str]) -> Dict[str, Dict[str, Any]
             "sparkline": "false"
         }
 
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.get(MARKETS_API_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
+        data = await get_upstream("coingecko").get_json(MARKETS_PATH, params=params)
 
         results = {}
         cg_data_map = {coin["id"]: coin for coin in data}
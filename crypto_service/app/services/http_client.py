@@ -0,0 +1,259 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamError(Exception):
+    pass
+
+
+class RateLimitedError(UpstreamError):
+    pass
+
+
+class CircuitOpenError(UpstreamError):
+    pass
+
+
+class TokenBucket:
+    """Async token bucket; waiters are served in FIFO order."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens, e.g. after a 429 with Retry-After."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+        self._updated = self._blocked_until
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        return self.state != "open"
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class TTLCache:
+    """Entries are fresh until `ttl`, then may be served stale until `ttl + stale_ttl`."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key) -> Optional[tuple[Any, bool]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, fresh_until, stale_until = entry
+        now = time.monotonic()
+        if now >= stale_until:
+            del self._entries[key]
+            return None
+        return value, now < fresh_until
+
+    def set(self, key, value, ttl: float, stale_ttl: float = 0.0):
+        now = time.monotonic()
+        self._entries[key] = (value, now + ttl, now + ttl + stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _retry_after(response: httpx.Response, default: float) -> float:
+    try:
+        return float(response.headers.get("Retry-After", default))
+    except ValueError:
+        return default
+
+
+class UpstreamClient:
+    """Keep-alive HTTP/2 pool for one upstream host with rate limit, cache and breaker."""
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        rate: float,
+        burst: float,
+        timeout: float = 10.0,
+        cache_ttl: float = 0.0,
+        stale_ttl: float = 0.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.name = name
+        self.cache_ttl = cache_ttl
+        self.stale_ttl = stale_ttl
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.cache = TTLCache()
+        self._inflight = {}
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            http2=True,
+            transport=transport,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=60),
+        )
+
+    async def get_json(self, path: str, params: Optional[dict] = None, *, weight: float = 1.0,
+                       ttl: Optional[float] = None, stale_ttl: Optional[float] = None):
+        ttl = self.cache_ttl if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        if ttl <= 0:
+            return await self._fetch(path, params, weight)
+
+        key = (path, tuple(sorted((params or {}).items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            value, fresh = cached
+            if not fresh:
+                # Serve stale now, refresh in the background
+                self._fetch_shared(key, path, params, weight, ttl, stale_ttl)
+            return value
+
+        return await asyncio.shield(self._fetch_shared(key, path, params, weight, ttl, stale_ttl))
+
+    def _fetch_shared(self, key, path, params, weight, ttl, stale_ttl) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fetch_and_cache(key, path, params, weight, ttl, stale_ttl))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._on_shared_done(key, t))
+        return task
+
+    def _on_shared_done(self, key, task: asyncio.Task):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(f"[{self.name}] background refresh failed: {task.exception()}")
+
+    async def _fetch_and_cache(self, key, path, params, weight, ttl, stale_ttl):
+        data = await self._fetch(path, params, weight)
+        self.cache.set(key, data, ttl, stale_ttl)
+        return data
+
+    async def _fetch(self, path: str, params: Optional[dict], weight: float):
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name}: circuit open, skipping {path}")
+
+        await self.bucket.acquire(weight)
+        try:
+            response = await self._client.get(path, params=params)
+        except httpx.HTTPError as e:
+            self.breaker.record_failure()
+            raise UpstreamError(f"{self.name}: {e!r}") from e
+
+        # Binance answers 418 once an IP keeps going after 429s
+        if response.status_code in (429, 418):
+            pause = _retry_after(response, 60.0)
+            self.bucket.pause(pause)
+            self.breaker.record_failure()
+            logger.warning(f"[{self.name}] rate limited ({response.status_code}), pausing {pause:.0f}s")
+            raise RateLimitedError(f"{self.name}: HTTP {response.status_code}")
+
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+            raise UpstreamError(f"{self.name}: HTTP {response.status_code}")
+
+        self.breaker.record_success()
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+UPSTREAMS = {
+    # Public CoinGecko tier allows roughly 10-30 calls/min
+    "coingecko": dict(
+        base_url="https://api.coingecko.com/api/v3",
+        rate=0.5, burst=3, timeout=15.0, cache_ttl=60, stale_ttl=15 * 60,
+    ),
+    "alternative_me": dict(
+        base_url="https://api.alternative.me",
+        rate=1, burst=2, cache_ttl=60, stale_ttl=60 * 60,
+    ),
+    # Binance budgets request weight: 6000/min per IP, we stay at half of it
+    "binance": dict(
+        base_url="https://api.binance.com",
+        rate=50, burst=200, timeout=10.0,
+    ),
+}
+
+_clients: dict[str, UpstreamClient] = {}
+_transport: Optional[httpx.AsyncBaseTransport] = None
+
+
+def get_upstream(name: str) -> UpstreamClient:
+    client = _clients.get(name)
+    if client is None:
+        client = UpstreamClient(name, transport=_transport, **UPSTREAMS[name])
+        _clients[name] = client
+    return client
+
+
+def use_transport(transport: Optional[httpx.AsyncBaseTransport]):
+    """Route every upstream through `transport` (e.g. httpx.MockTransport) with fresh state."""
+    global _transport
+    _transport = transport
+    _clients.clear()
+
+
+async def close_upstreams():
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,343 @@
+"""
+Throughput benchmarks for the crypto_service hot paths.
+
+    python -m benchmarks.run                    # every scenario at 20/200/2000 symbols
+    python -m benchmarks.run --save-baseline    # refresh benchmarks/baseline.json
+    python -m benchmarks.run --compare          # exit 1 on ops/sec regressions
+
+Each run is written to benchmarks/results/. DB scenarios write to
+BENCH_DATABASE_URL (a disposable Postgres database) and are skipped
+when it is not set or not reachable.
+"""
+import argparse
+import asyncio
+import inspect
+import itertools
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from benchmarks.synthetic import START_MS, make_symbols, prefill_history, ticker_stream
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+SYMBOL_COUNTS = (20, 200, 2000)
+# Ring size used by BinancePriceStream.history
+HISTORY_POINTS = 1000
+
+
+class Skip(Exception):
+    pass
+
+
+@dataclass
+class Result:
+    name: str
+    symbols: Optional[int]
+    ops: int
+    ops_per_sec: float
+    p50_us: float
+    p99_us: float
+    alloc_peak_kib: float
+    alloc_retained_bytes_per_op: float
+
+
+class NullPipeline:
+    """Stands in for the Redis pipeline; only the queued commands are built."""
+
+    def hset(self, key, mapping):
+        pass
+
+    def expire(self, key, seconds):
+        pass
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def measure(name: str, symbols: Optional[int], op: Callable, budget: float,
+                  min_ops: int = 20, alloc_ops: int = 200) -> Result:
+    is_async = inspect.iscoroutinefunction(op)
+
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < min_ops or time.perf_counter() - started < budget:
+        t0 = time.perf_counter_ns()
+        if is_async:
+            await op()
+        else:
+            op()
+        timings.append(time.perf_counter_ns() - t0)
+
+    # Allocations are measured in a separate pass, tracemalloc slows everything down
+    alloc_ops = min(alloc_ops, len(timings))
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in range(alloc_ops):
+        if is_async:
+            await op()
+        else:
+            op()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    return Result(
+        name=name,
+        symbols=symbols,
+        ops=len(timings),
+        ops_per_sec=round(len(timings) / (sum(timings) / 1e9), 1),
+        p50_us=round(_percentile(timings, 0.50) / 1000, 2),
+        p99_us=round(_percentile(timings, 0.99) / 1000, 2),
+        alloc_peak_kib=round((peak - before) / 1024, 1),
+        alloc_retained_bytes_per_op=round((current - before) / alloc_ops, 1),
+    )
+
+
+def _make_stream(symbols: list[str]):
+    from app.services.binance import BinancePriceStream
+
+    stream = BinancePriceStream(symbols)
+    stream._snapshot_store = None
+    prefill_history(stream, symbols, HISTORY_POINTS)
+    return stream
+
+
+async def _warm_stream(symbols: list[str]):
+    """A stream with full rings and one processed tick per symbol."""
+    stream = _make_stream(symbols)
+    for frame in ticker_stream(symbols, seconds=1, start_ms=START_MS):
+        await stream.process_message(json.loads(frame), received_at=time.time() * 1000)
+    return stream
+
+
+async def bench_ingest_tick(symbols: int, budget: float) -> Result:
+    """json.loads + process_message for one ticker frame, as in the receive loop."""
+    names = make_symbols(symbols)
+    stream = await _warm_stream(names)
+    seconds = max(2, math.ceil(50_000 / symbols))
+    frames = itertools.cycle(list(ticker_stream(names, seconds=seconds, start_ms=START_MS + 1000)))
+    process_message = stream.process_message
+
+    async def op():
+        data = json.loads(next(frames))
+        await process_message(data, received_at=data["E"])
+
+    return await measure("ingest_tick", symbols, op, budget)
+
+
+async def bench_calculate_rsi(symbols: Optional[int], budget: float) -> Result:
+    stream = _make_stream(make_symbols(1))
+    closes = [100 + (i % 5) - 2 + i * 0.1 for i in range(15)]
+
+    def op():
+        stream.calculate_rsi(closes, period=14)
+
+    return await measure("calculate_rsi", None, op, budget)
+
+
+async def bench_publish_serialize(symbols: int, budget: float) -> Result:
+    """One _redis_publish_loop tick with every symbol changed: payload JSON plus hash fields."""
+    from app.services.binance.updater import queue_price_hashes
+
+    stream = await _warm_stream(make_symbols(symbols))
+    pipe = NullPipeline()
+
+    def op():
+        json.dumps({"prices": stream.prices, "published_at": time.time() * 1000})
+        queue_price_hashes(pipe, stream.prices, {})
+
+    return await measure("publish_serialize", symbols, op, budget)
+
+
+def _bench_session_factory():
+    url = os.environ.get("BENCH_DATABASE_URL")
+    if not url:
+        raise Skip("BENCH_DATABASE_URL not set")
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.db.init_db import init_db
+
+    engine = create_engine(url)
+    try:
+        init_db(engine)
+    except Exception as e:
+        raise Skip(f"database not reachable: {e.__class__.__name__}")
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _delete_rows(session_factory, symbols: list[str]):
+    from app.models.price_history import PriceHistory
+
+    db = session_factory()
+    try:
+        db.query(PriceHistory).filter(PriceHistory.symbol.in_(symbols)).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+async def bench_db_persist_live(symbols: int, budget: float) -> Result:
+    """One _persistence_loop flush: a price_history row per symbol."""
+    session_factory = _bench_session_factory()
+    names = make_symbols(symbols)
+    stream = await _warm_stream(names)
+
+    try:
+        return await measure(
+            "db_persist_live", symbols,
+            lambda: stream._persist_live_prices(session_factory), budget, min_ops=5, alloc_ops=5,
+        )
+    finally:
+        _delete_rows(session_factory, names)
+
+
+async def bench_db_insert_points(symbols: Optional[int], budget: float) -> Result:
+    """A 1000-minute backfill page through PriceHistoryStore.insert_points."""
+    from app.services.binance.backfill import PriceHistoryStore
+
+    session_factory = _bench_session_factory()
+    store = PriceHistoryStore(session_factory)
+    symbol = make_symbols(1)[0]
+    pages = itertools.count()
+    start = datetime.fromtimestamp(START_MS / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+    def op():
+        first = start + timedelta(minutes=1000 * next(pages))
+        store.insert_points(symbol, [(first + timedelta(minutes=m), 100.0) for m in range(1000)])
+
+    try:
+        return await measure("db_insert_points", None, op, budget, min_ops=5, alloc_ops=5)
+    finally:
+        _delete_rows(session_factory, [symbol])
+
+
+# name -> (benchmark, scales with the symbol count)
+SCENARIOS = {
+    "ingest_tick": (bench_ingest_tick, True),
+    "calculate_rsi": (bench_calculate_rsi, False),
+    "publish_serialize": (bench_publish_serialize, True),
+    "db_persist_live": (bench_db_persist_live, True),
+    "db_insert_points": (bench_db_insert_points, False),
+}
+
+
+async def run_suite(symbol_counts=SYMBOL_COUNTS, budget: float = 1.0, only=None) -> dict:
+    results, skipped = [], []
+    for name, (bench, per_symbol_count) in SCENARIOS.items():
+        if only and name not in only:
+            continue
+        for symbols in (symbol_counts if per_symbol_count else [None]):
+            try:
+                results.append(await bench(symbols, budget))
+            except Skip as e:
+                # The reason applies to every symbol count
+                skipped.append({"name": name, "reason": str(e)})
+                print(f"skip {name}: {e}")
+                break
+
+    return {"meta": _meta(budget), "results": [asdict(r) for r in results], "skipped": skipped}
+
+
+def _meta(budget: float) -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=BENCH_DIR,
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "commit": commit,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "budget_seconds": budget,
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Scenarios whose ops/sec fell more than `tolerance` below the baseline."""
+    expected = {(r["name"], r["symbols"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        base = expected.get((result["name"], result["symbols"]))
+        if base and result["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{result['name']}[{result['symbols']}]: {result['ops_per_sec']:.0f} ops/s "
+                f"vs baseline {base['ops_per_sec']:.0f}"
+            )
+    return regressions
+
+
+def print_report(report: dict, baseline: Optional[dict]):
+    expected = {(r["name"], r["symbols"]): r for r in (baseline or {}).get("results", [])}
+    print(f"{'scenario':<20}{'symbols':>8}{'ops/s':>12}{'p50 us':>10}{'p99 us':>10}"
+          f"{'peak KiB':>10}{'B/op':>10}{'vs base':>9}")
+    for r in report["results"]:
+        base = expected.get((r["name"], r["symbols"]))
+        delta = f"{(r['ops_per_sec'] / base['ops_per_sec'] - 1) * 100:+.0f}%" if base else "-"
+        print(f"{r['name']:<20}{r['symbols'] or '-':>8}{r['ops_per_sec']:>12.0f}{r['p50_us']:>10.1f}"
+              f"{r['p99_us']:>10.1f}{r['alloc_peak_kib']:>10.1f}"
+              f"{r['alloc_retained_bytes_per_op']:>10.0f}{delta:>9}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="crypto_service hot path benchmarks")
+    parser.add_argument("--symbols", type=int, nargs="+", default=list(SYMBOL_COUNTS))
+    parser.add_argument("--budget", type=float, default=1.0, help="seconds of timed work per scenario")
+    parser.add_argument("--only", nargs="+", choices=list(SCENARIOS))
+    parser.add_argument("--output", help="report path, defaults to benchmarks/results/<time>-<commit>.json")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="exit 1 if ops/sec regressed")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_suite(args.symbols, args.budget, args.only))
+
+    baseline = None
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}-{report['meta']['commit'] or 'local'}.json")
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {output}")
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline updated: {BASELINE_PATH}")
+
+    if args.compare:
+        if baseline is None:
+            print("No baseline to compare against")
+            return 1
+        regressions = compare(report, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
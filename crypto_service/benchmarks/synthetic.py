@@ -0,0 +1,49 @@
+import json
+import random
+from typing import Iterator
+
+# One tick per symbol per second, like the Binance @ticker stream
+TICK_INTERVAL_MS = 1000
+START_MS = 1_700_000_000_000
+
+
+def make_symbols(count: int) -> list[str]:
+    return [f"S{i:04d}USDT" for i in range(count)]
+
+
+def ticker_frame(symbol: str, price: float, event_time: int) -> str:
+    return json.dumps({
+        "e": "24hrTicker",
+        "E": event_time,
+        "s": symbol,
+        "c": f"{price:.4f}",
+        "P": "1.25",
+        "v": "12345.6",
+        "h": f"{price * 1.02:.4f}",
+        "l": f"{price * 0.98:.4f}",
+    })
+
+
+def ticker_stream(symbols: list[str], seconds: int, start_ms: int = START_MS, seed: int = 7) -> Iterator[str]:
+    """Raw frames for `seconds` of random-walk prices, every symbol once per second."""
+    rng = random.Random(seed)
+    prices = {symbol: 100.0 + i for i, symbol in enumerate(symbols)}
+    step = TICK_INTERVAL_MS / len(symbols)
+    for second in range(seconds):
+        for i, symbol in enumerate(symbols):
+            prices[symbol] *= 1 + rng.uniform(-0.001, 0.001)
+            event_time = start_ms + second * TICK_INTERVAL_MS + int(i * step)
+            yield ticker_frame(symbol, prices[symbol], event_time)
+
+
+def prefill_history(stream, symbols: list[str], points: int, end_ms: int = START_MS):
+    """Fill each symbol's tick ring as if the stream had been running for a while."""
+    for i, symbol in enumerate(symbols):
+        base = 100.0 + i
+        ring = stream.history[symbol]
+        for n in range(points):
+            ring.append({
+                "time": end_ms - (points - n) * TICK_INTERVAL_MS,
+                "price": base * (1 + 0.0005 * ((n % 7) - 3)),
+            })
+        stream.history_ready.add(symbol)
@@ -1,5 +1,17 @@
+import httpx
 import pytest
 
+from app.services.http_client import use_transport
+
 @pytest.fixture
 def anyio_backend():
     return 'asyncio'
+
+@pytest.fixture
+def mock_upstream():
+    """Route all upstream clients through an httpx.MockTransport handler."""
+    def install(handler):
+        use_transport(httpx.MockTransport(handler))
+
+    yield install
+    use_transport(None)
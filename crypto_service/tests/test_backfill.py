@@ -0,0 +1,222 @@
+import httpx
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.binance.backfill import (
+    KlineBackfill,
+    PriceHistoryStore,
+    datetime_to_ms,
+    ms_to_datetime,
+)
+
+MINUTE = 60_000
+# 2023-11-14 22:13:20 UTC, 20s into a minute
+NOW = 1_700_000_000.0
+LAST_CLOSED = int(NOW * 1000) - int(NOW * 1000) % MINUTE - MINUTE
+
+
+class FakeKlineServer:
+    """Serves deterministic 1m klines whose close price is the minute number."""
+
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        start, end, limit = int(params["startTime"]), int(params["endTime"]), int(params["limit"])
+        self.requests.append((start, end))
+
+        first = start + (-start) % MINUTE
+        klines = [
+            [ts, "0", "0", "0", str(ts // MINUTE), "0"]
+            for ts in range(first, end + 1, MINUTE)
+        ][:limit]
+        return httpx.Response(200, json=klines)
+
+
+class FakeStore:
+    def __init__(self):
+        self.rows = {}
+        self.checkpoints = {}
+        self.watermarks = {}
+
+    def insert_points(self, symbol, points):
+        inserted = 0
+        for ts, price in points:
+            if (symbol, ts) not in self.rows:
+                self.rows[(symbol, ts)] = price
+                inserted += 1
+        return inserted
+
+    def get_checkpoint(self, symbol, interval):
+        return self.checkpoints.get((symbol, interval))
+
+    def save_checkpoint(self, symbol, interval, start, end):
+        self.checkpoints[(symbol, interval)] = (start, end)
+
+    def get_repair_watermark(self, symbol, interval):
+        return self.watermarks.get((symbol, interval))
+
+    def save_repair_watermark(self, symbol, interval, until):
+        self.watermarks[(symbol, interval)] = until
+
+    def find_gaps(self, symbol, since, min_gap_seconds):
+        times = sorted(ts for s, ts in self.rows if s == symbol and ts >= since)
+        return [
+            (prev, cur) for prev, cur in zip(times, times[1:])
+            if (cur - prev).total_seconds() > min_gap_seconds
+        ]
+
+
+@pytest.fixture
+def kline_server(mock_upstream):
+    server = FakeKlineServer()
+    mock_upstream(server)
+    return server
+
+
+@pytest.mark.asyncio
+async def test_backfill_paginates_and_checkpoints(kline_server):
+    store = FakeStore()
+    backfill = KlineBackfill(store=store, concurrency=2, page_limit=100, clock=lambda: NOW)
+
+    inserted = await backfill.backfill_symbol("BTCUSDT", "1m", days=1)
+
+    assert inserted == 24 * 60 + 1
+    assert len(kline_server.requests) == 15
+    start, end = store.checkpoints[("BTCUSDT", "1m")]
+    assert datetime_to_ms(end) == LAST_CLOSED
+    assert datetime_to_ms(start) == LAST_CLOSED - 86_400_000
+    assert store.rows[("BTCUSDT", ms_to_datetime(LAST_CLOSED))] == LAST_CLOSED // MINUTE
+
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_from_checkpoint(kline_server):
+    store = FakeStore()
+    await KlineBackfill(store=store, page_limit=100, clock=lambda: NOW).backfill_symbol("BTCUSDT", days=1)
+    kline_server.requests.clear()
+
+    # Ten minutes later only the new tail is requested
+    later = KlineBackfill(store=store, page_limit=100, clock=lambda: NOW + 600)
+    inserted = await later.backfill_symbol("BTCUSDT", days=1)
+
+    assert inserted == 10
+    assert kline_server.requests == [(LAST_CLOSED + 1, LAST_CLOSED + 10 * MINUTE)]
+
+
+@pytest.mark.asyncio
+async def test_repair_gaps_fills_missing_minutes(kline_server):
+    store = FakeStore()
+    for minute in list(range(0, 10)) + list(range(20, 30)):
+        ts = LAST_CLOSED - (30 - minute) * MINUTE
+        store.rows[("BTCUSDT", ms_to_datetime(ts))] = 1.0
+
+    backfill = KlineBackfill(store=store, gap_seconds=90, clock=lambda: NOW)
+    repaired = await backfill.repair_gaps("BTCUSDT", days=1)
+
+    assert repaired == 10
+    assert store.find_gaps("BTCUSDT", ms_to_datetime(0), 90) == []
+
+
+@pytest.mark.asyncio
+async def test_repair_gaps_does_not_refetch_empty_periods(mock_upstream):
+    requests = []
+
+    def no_klines(request):
+        requests.append(request)
+        return httpx.Response(200, json=[])
+
+    mock_upstream(no_klines)
+    store = FakeStore()
+    for minute in (0, 1, 20, 21):
+        store.rows[("BTCUSDT", ms_to_datetime(LAST_CLOSED - (30 - minute) * MINUTE))] = 1.0
+
+    backfill = KlineBackfill(store=store, gap_seconds=90, clock=lambda: NOW)
+    assert await backfill.repair_gaps("BTCUSDT", days=1) == 0
+    assert len(requests) == 1
+
+    # The market had no klines there; the next pass skips the recorded window
+    assert await backfill.repair_gaps("BTCUSDT", days=1) == 0
+    assert len(requests) == 1
+    assert store.watermarks == {("BTCUSDT", "1m"): ms_to_datetime(LAST_CLOSED - 10 * MINUTE)}
+    assert store.checkpoints == {}
+
+
+def test_insert_points_uses_on_conflict():
+    captured = []
+
+    class Session:
+        def execute(self, stmt):
+            captured.append(str(stmt.compile(dialect=postgresql.dialect())))
+            return type("Result", (), {"rowcount": 1})()
+
+        def commit(self):
+            pass
+
+        def close(self):
+            pass
+
+    store = PriceHistoryStore(session_factory=Session)
+    assert store.insert_points("BTCUSDT", [(ms_to_datetime(LAST_CLOSED), 1.0)]) == 1
+    assert "ON CONFLICT (symbol, timestamp) DO NOTHING" in captured[0]
+
+
+@pytest.mark.asyncio
+async def test_fill_window_fetches_gap_for_all_symbols(kline_server):
+    store = FakeStore()
+    backfill = KlineBackfill(store=store, clock=lambda: NOW)
+
+    since = LAST_CLOSED - 5 * MINUTE + 12_345
+    filled = await backfill.fill_window(["BTCUSDT", "ETHUSDT"], since, int(NOW * 1000))
+
+    assert set(filled) == {"BTCUSDT", "ETHUSDT"}
+    # Only closed klines from the minute of the disconnect onwards
+    assert [datetime_to_ms(ts) for ts, _ in filled["BTCUSDT"]] == [
+        LAST_CLOSED - m * MINUTE for m in range(5, -1, -1)
+    ]
+    assert len(store.rows) == 12
+
+
+def test_live_persistence_uses_on_conflict():
+    from app.services.binance.stream import BinancePriceStream
+
+    captured = []
+
+    class Session:
+        def execute(self, stmt):
+            captured.append(str(stmt.compile(dialect=postgresql.dialect())))
+            return type("Result", (), {"rowcount": 1})()
+
+        def commit(self):
+            pass
+
+        def close(self):
+            pass
+
+    stream = BinancePriceStream(["BTCUSDT", "ETHUSDT"])
+    stream.prices = {"BTCUSDT": {"price": 1.0}, "ETHUSDT": {"price": 2.0}}
+
+    # One of the two rows already existed
+    assert stream._persist_live_prices(Session) == 1
+    assert "ON CONFLICT (symbol, timestamp) DO NOTHING" in captured[0]
+
+
+def test_init_db_drops_legacy_repair_checkpoints():
+    from sqlalchemy import create_engine, text
+
+    from app.db.init_db import init_db
+
+    engine = create_engine("sqlite://")
+    init_db(engine)
+    with engine.begin() as conn:
+        for interval in ("1m", "1m:repair"):
+            conn.execute(
+                text("INSERT INTO backfill_checkpoints (symbol, interval, start_time, end_time) VALUES ('BTCUSDT', :i, :t, :t)"),
+                {"i": interval, "t": ms_to_datetime(LAST_CLOSED)},
+            )
+
+    init_db(engine)
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT interval FROM backfill_checkpoints")).scalars().all() == ["1m"]
+        assert conn.execute(text("SELECT count(*) FROM backfill_repair_watermarks")).scalar() == 0
@@ -0,0 +1,33 @@
+import pytest
+
+from benchmarks.run import compare, run_suite
+
+
+@pytest.mark.asyncio
+async def test_suite_reports_and_skips_db_without_url(monkeypatch):
+    monkeypatch.delenv("BENCH_DATABASE_URL", raising=False)
+
+    report = await run_suite(
+        symbol_counts=[20], budget=0.01, only=["calculate_rsi", "publish_serialize", "db_persist_live"],
+    )
+
+    assert [(r["name"], r["symbols"]) for r in report["results"]] == [
+        ("calculate_rsi", None), ("publish_serialize", 20),
+    ]
+    assert all(r["ops_per_sec"] > 0 and r["p99_us"] >= r["p50_us"] for r in report["results"])
+    assert report["skipped"] == [{"name": "db_persist_live", "reason": "BENCH_DATABASE_URL not set"}]
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = {"results": [
+        {"name": "ingest_tick", "symbols": 20, "ops_per_sec": 1000.0},
+        {"name": "ingest_tick", "symbols": 200, "ops_per_sec": 1000.0},
+    ]}
+    report = {"results": [
+        {"name": "ingest_tick", "symbols": 20, "ops_per_sec": 800.0},
+        {"name": "ingest_tick", "symbols": 200, "ops_per_sec": 600.0},
+        {"name": "calculate_rsi", "symbols": None, "ops_per_sec": 1.0},
+    ]}
+
+    regressions = compare(report, baseline, tolerance=0.25)
+    assert len(regressions) == 1 and regressions[0].startswith("ingest_tick[200]")
@@ -0,0 +1,46 @@
+import pytest
+from collections import deque, defaultdict
+
+from app.services.binance.history import BinanceHistoryMixin
+
+
+class DummyHistory(BinanceHistoryMixin):
+    def __init__(self, stored):
+        self.symbols = ["btcusdt"]
+        self.history = defaultdict(lambda: deque(maxlen=1000))
+        self.history_ready = set()
+        self.fetched = []
+        self._stored = stored
+
+    async def _fetch_and_persist(self, symbol_upper, interval, limit):
+        self.fetched.append((symbol_upper, interval))
+
+    def _load_recent_history(self, symbol_upper, limit):
+        return list(self._stored)
+
+
+def test_merge_history_keeps_live_ticks_and_orders_by_time():
+    stream = DummyHistory([])
+    stream.history["BTCUSDT"].extend([{'time': 300, 'price': 3.5}, {'time': 400, 'price': 4.0}])
+
+    stream.merge_history("BTCUSDT", [
+        {'time': 100, 'price': 1.0},
+        {'time': 200, 'price': 2.0},
+        {'time': 300, 'price': 3.0},
+    ])
+
+    assert [p['time'] for p in stream.history["BTCUSDT"]] == [100, 200, 300, 400]
+    # The live tick wins over the stored point with the same timestamp
+    assert stream.history["BTCUSDT"][2]['price'] == 3.5
+
+
+@pytest.mark.asyncio
+async def test_backfill_marks_symbol_ready():
+    stream = DummyHistory([{'time': 100, 'price': 1.0}])
+    assert "BTCUSDT" not in stream.history_ready
+
+    await stream.fetch_initial_history()
+
+    assert sorted(stream.fetched) == [("BTCUSDT", "1m"), ("BTCUSDT", "5m")]
+    assert "BTCUSDT" in stream.history_ready
+    assert list(stream.history["BTCUSDT"]) == [{'time': 100, 'price': 1.0}]
@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.http_client import (
+    CircuitOpenError,
+    RateLimitedError,
+    TokenBucket,
+    UpstreamClient,
+)
+
+
+def make_client(handler, **kwargs):
+    params = dict(rate=1000, burst=1000)
+    params.update(kwargs)
+    return UpstreamClient("test", "http://upstream", transport=httpx.MockTransport(handler), **params)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_throttles_beyond_burst():
+    bucket = TokenBucket(rate=100, capacity=2)
+
+    started = time.monotonic()
+    for _ in range(4):
+        await bucket.acquire()
+
+    # Two tokens come from the burst, two more need ~10ms each at 100/s
+    assert time.monotonic() - started >= 0.015
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_fresh_then_stale_while_revalidating():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"n": len(calls)})
+
+    client = make_client(handler, cache_ttl=0.05, stale_ttl=10)
+
+    assert await client.get_json("/x") == {"n": 1}
+    assert await client.get_json("/x") == {"n": 1}
+    assert len(calls) == 1
+
+    await asyncio.sleep(0.06)
+    # Stale value returned immediately, refresh happens in the background
+    assert await client.get_json("/x") == {"n": 1}
+    await asyncio.sleep(0.01)
+    assert await client.get_json("/x") == {"n": 2}
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_request():
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"ok": True})
+
+    client = make_client(handler, cache_ttl=60)
+
+    results = await asyncio.gather(*(client.get_json("/x") for _ in range(5)))
+
+    assert all(r == {"ok": True} for r in results)
+    assert len(calls) == 1
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_429_pauses_bucket_and_opens_circuit():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(429, headers={"Retry-After": "30"})
+
+    client = make_client(handler, failure_threshold=1)
+
+    with pytest.raises(RateLimitedError):
+        await client.get_json("/x")
+
+    # Breaker is open: no further request reaches the upstream
+    with pytest.raises(CircuitOpenError):
+        await client.get_json("/x")
+    assert len(calls) == 1
+    await client.aclose()
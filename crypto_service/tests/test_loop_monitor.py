@@ -0,0 +1,28 @@
+import asyncio
+import time
+
+import pytest
+from prometheus_client import REGISTRY
+from pulse_common.loop_monitor import LoopMonitor
+
+
+def blocking_persist():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_monitor_samples_stack_of_blocking_call():
+    before = REGISTRY.get_sample_value("event_loop_blocked_total") or 0
+    monitor = LoopMonitor(interval=0.02, threshold=0.1)
+    task = asyncio.create_task(monitor.run())
+    await asyncio.sleep(0.05)
+
+    blocking_persist()
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert "blocking_persist" in monitor.last_stack
+    assert REGISTRY.get_sample_value("event_loop_blocked_total") == before + 1
+    assert REGISTRY.get_sample_value("event_loop_blocked_seconds_count") >= 1
@@ -0,0 +1,84 @@
+import tracemalloc
+
+from prometheus_client import REGISTRY
+
+from pulse_common.memory import MemoryAccountant, deep_sizeof, parse_budgets, sampled_sizeof
+from app.services.binance.stream import BinancePriceStream
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    shared = {"total_market_cap": 1.0, "btc_dominance": 50.0}
+    one = {"BTCUSDT": {"price": 1.0, "global_stats": shared}}
+    many = {f"S{i}USDT": {"price": 1.0, "global_stats": shared} for i in range(10)}
+
+    assert deep_sizeof(many) - deep_sizeof(one) < 10 * deep_sizeof(one["BTCUSDT"])
+    assert deep_sizeof([shared, shared]) < 2 * deep_sizeof(shared)
+
+
+def test_sampled_sizeof_estimates_history_within_a_few_percent():
+    stream = BinancePriceStream(["BTCUSDT"])
+    for s in range(50):
+        for i in range(1000):
+            stream.history[f"S{s}USDT"].append({"time": 1_700_000_000_000 + i, "price": float(i) + s / 7})
+    exact = deep_sizeof(stream.history)
+
+    assert abs(sampled_sizeof(stream.history) - exact) < exact * 0.05
+    # Small containers are measured exactly
+    assert sampled_sizeof(stream.history["S0USDT"], sample=1000) == deep_sizeof(stream.history["S0USDT"])
+
+
+def test_parse_budgets():
+    assert parse_budgets("history=64, prices=0.5,bad,=3,x=oops") == {"history": 64 * 2**20, "prices": 2**19}
+
+
+def test_history_over_budget_is_trimmed_and_reported():
+    stream = BinancePriceStream(["BTCUSDT"])
+    for i in range(1000):
+        stream.history["BTCUSDT"].append({"time": i, "price": float(i)})
+        stream.history["OLDUSDT"].append({"time": i, "price": float(i)})
+    size = sampled_sizeof(stream.history)
+
+    accountant = MemoryAccountant({"history": size // 4})
+    stream.track_memory(accountant)
+    before = REGISTRY.get_sample_value("memory_budget_trims_total", {"structure": "history"}) or 0
+
+    measured = accountant.measure()
+    assert measured["history"]["bytes"] == size
+    assert "OLDUSDT" in stream.history
+
+    report = accountant.enforce()
+
+    assert "OLDUSDT" not in stream.history
+    assert 100 <= len(stream.history["BTCUSDT"]) < 1000
+    # Newest points are kept
+    assert stream.history["BTCUSDT"][-1]["time"] == 999
+    assert report["history"]["bytes"] <= size // 4
+    # The rings are smaller too, so refilling them stays under the budget
+    capacity = stream.history["BTCUSDT"].maxlen
+    assert capacity == len(stream.history["BTCUSDT"])
+    for i in range(1000, 3000):
+        stream.history["BTCUSDT"].append({"time": i, "price": float(i)})
+    stream.history["NEWUSDT"].append({"time": 0, "price": 1.0})
+    assert len(stream.history["BTCUSDT"]) == capacity
+    assert stream.history["NEWUSDT"].maxlen == capacity
+    assert REGISTRY.get_sample_value("memory_budget_trims_total", {"structure": "history"}) == before + 1
+    assert REGISTRY.get_sample_value("memory_structure_bytes", {"structure": "history"}) == report["history"]["bytes"]
+    assert report["prices"]["budget_bytes"] is None
+
+
+def test_tracemalloc_report_shows_growth_between_calls():
+    accountant = MemoryAccountant()
+    assert accountant.tracemalloc_report() == {"tracing": False}
+
+    tracemalloc.start()
+    try:
+        first = accountant.tracemalloc_report()
+        leak = [bytearray(1024) for _ in range(200)]
+        second = accountant.tracemalloc_report()
+    finally:
+        tracemalloc.stop()
+
+    assert first["tracing"] and "growth" not in first
+    assert second["growth"][0]["bytes_diff"] >= 200 * 1024
+    assert "test_memory.py" in second["growth"][0]["site"]
+    del leak
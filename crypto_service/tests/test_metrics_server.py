@@ -0,0 +1,35 @@
+import asyncio
+import pytest
+from pulse_common.metrics_server import register_route, start_metrics_server
+
+from app.core.metrics import tick_counter
+
+
+async def _get(port, path):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return head.split(b"\r\n")[0].decode(), body
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_and_routes():
+    tick_counter("BTCUSDT").inc()
+    register_route("/ping", lambda: ("text/plain", b"pong"))
+
+    server = await start_metrics_server(0, host="127.0.0.1")
+    port = server.sockets[0].getsockname()[1]
+    try:
+        status, body = await _get(port, "/metrics")
+        assert status == "HTTP/1.1 200 OK"
+        assert b'binance_ticks_total{symbol="BTCUSDT"}' in body
+
+        assert await _get(port, "/ping") == ("HTTP/1.1 200 OK", b"pong")
+        status, _ = await _get(port, "/missing")
+        assert status == "HTTP/1.1 404 Not Found"
+    finally:
+        server.close()
+        await server.wait_closed()
@@ -1,14 +1,22 @@
+import time
+from collections import defaultdict, deque
+
 import pytest
+from app.core.config import settings
+from prometheus_client import REGISTRY
 from app.services.binance.processor import BinanceProcessorMixin
 
 class DummyProcessor(BinanceProcessorMixin):
     def __init__(self):
-        self.history = {}
+        self.history = defaultdict(lambda: deque(maxlen=100))
         self.trending_symbols = set()
         self.tvl_data = {}
         self.money_flows = {}
         self.prices = {}
         self.global_stats = {}
+        self.history_ready = set()
+        self._processed_at = {}
+        self._trace = {}
 
 def test_calculate_rsi_upward():
     processor = DummyProcessor()
@@ -49,3 +57,37 @@ def test_calculate_rsi_not_enough_data():
     
     rsi = processor.calculate_rsi(prices, period=14)
     assert rsi == 50.0
+
+
+def _hop_count(hop):
+    return REGISTRY.get_sample_value("price_latency_seconds_count", {"hop": hop}) or 0
+
+
+@pytest.mark.asyncio
+async def test_process_message_stamps_latency_trace(monkeypatch):
+    monkeypatch.setattr(settings, "LATENCY_TRACE", True)
+    processor = DummyProcessor()
+    before = _hop_count("exchange_to_receive")
+
+    received_at = time.time() * 1000
+    await processor.process_message(
+        {'e': '24hrTicker', 's': 'BTCUSDT', 'c': '50000', 'E': received_at - 120},
+        received_at=received_at,
+    )
+
+    assert 'trace' not in processor.prices['BTCUSDT']
+    trace = processor._trace['BTCUSDT']
+    assert trace['received_at'] == received_at
+    assert trace['processed_at'] >= received_at
+    assert processor._processed_at['BTCUSDT'] == trace['processed_at']
+    assert _hop_count("exchange_to_receive") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_process_message_without_trace_keeps_payload_unchanged():
+    processor = DummyProcessor()
+    await processor.process_message({'e': '24hrTicker', 's': 'BTCUSDT', 'c': '50000', 'E': 1})
+
+    assert 'trace' not in processor.prices['BTCUSDT']
+    assert processor._trace == {}
+    assert 'BTCUSDT' in processor._processed_at
@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+import pytest
+import websockets
+
+from app.services.binance.recording import FrameRecorder, ReplayServer, read_frames
+
+
+def _ticker(symbol, price, event_time):
+    return json.dumps({'e': '24hrTicker', 's': symbol, 'c': str(price), 'E': event_time})
+
+
+def test_recorder_round_trip(tmp_path):
+    recorder = FrameRecorder(str(tmp_path))
+    recorder.record(_ticker('BTCUSDT', 1, 1000), 1000.5)
+    recorder.record(_ticker('ETHUSDT', 2, 1001), 1001.5)
+    recorder.close()
+
+    frames = list(read_frames(recorder.path))
+    assert recorder.path.endswith('.jsonl.gz')
+    assert [t for t, _ in frames] == [1000.5, 1001.5]
+    assert json.loads(frames[1][1])['s'] == 'ETHUSDT'
+
+
+def test_unclosed_recording_is_readable_up_to_last_flush(tmp_path):
+    recorder = FrameRecorder(str(tmp_path), flush_every=100, flush_interval=3600)
+    for i in range(5000):
+        recorder.record(_ticker('BTCUSDT', i, i), i)
+    recorder.record(_ticker('BTCUSDT', 'unflushed', 5000), 5000)
+
+    # What a killed process leaves behind: no gzip trailer, the last frame still buffered
+    crashed = tmp_path / "crashed.jsonl.gz"
+    with open(recorder.path, "rb") as f:
+        crashed.write_bytes(f.read())
+
+    frames = list(read_frames(str(crashed)))
+    assert len(frames) == 5000
+    assert frames[-1][0] == 4999
+    recorder.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('speed, min_elapsed', [(10.0, 0.18), (0.0, 0.0)])
+async def test_replay_server_paces_frames(tmp_path, speed, min_elapsed):
+    recorder = FrameRecorder(str(tmp_path))
+    for i in range(5):
+        # 500ms apart in the recording
+        recorder.record(_ticker('BTCUSDT', i, i * 500), i * 500)
+    recorder.close()
+
+    server = ReplayServer(recorder.path, speed=speed)
+    port = await server.start()
+    loop = asyncio.get_running_loop()
+    try:
+        async with websockets.connect(f"ws://127.0.0.1:{port}") as ws:
+            await ws.send(json.dumps({"method": "SUBSCRIBE", "params": ["btcusdt@ticker"], "id": 1}))
+            assert json.loads(await ws.recv()) == {"result": None, "id": 1}
+
+            started = loop.time()
+            prices = [json.loads(frame)['c'] async for frame in ws]
+            elapsed = loop.time() - started
+    finally:
+        await server.close()
+
+    assert prices == ['0', '1', '2', '3', '4']
+    # 2s of recording at 10x is 0.2s; at max speed there is no pacing
+    assert elapsed >= min_elapsed
+    if not speed:
+        assert elapsed < 0.18
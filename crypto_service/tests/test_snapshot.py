@@ -0,0 +1,70 @@
+import time
+import pytest
+from collections import deque, defaultdict
+
+from app.services.binance.history import BinanceHistoryMixin
+from app.services.binance.snapshot import (
+    BinanceSnapshotMixin,
+    FileSnapshotStore,
+    decode_snapshot,
+    encode_snapshot,
+)
+
+
+class DummyStream(BinanceHistoryMixin, BinanceSnapshotMixin):
+    def __init__(self, store):
+        self.symbols = ["btcusdt", "ethusdt"]
+        self.prices = {}
+        self.history = defaultdict(lambda: deque(maxlen=1000))
+        self.history_ready = set()
+        self.trending_symbols = set()
+        self.tvl_data = {}
+        self.money_flows = {}
+        self.global_stats = {}
+        self._running = False
+        self._snapshot_store = store
+
+
+def test_snapshot_roundtrip():
+    history = {"BTCUSDT": [{'time': 1700000000000.0, 'price': 42000.5}, {'time': 1700000060000.0, 'price': 42001.25}]}
+    state = {'prices': {"BTCUSDT": {'price': 42001.25}}, 'trending_symbols': ["BTC"]}
+
+    saved_at, decoded_state, decoded_history = decode_snapshot(encode_snapshot(state, history, 123.0))
+
+    assert saved_at == 123.0
+    assert decoded_state == state
+    assert decoded_history == history
+
+
+def test_decode_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        decode_snapshot(b"not a snapshot at all, just some bytes")
+
+
+@pytest.mark.asyncio
+async def test_restore_from_file(tmp_path):
+    store = FileSnapshotStore(str(tmp_path / "stream.snap"))
+    source = DummyStream(store)
+    source.prices["BTCUSDT"] = {'price': 42000.0, 'rsi': 61.2}
+    source.trending_symbols = {"BTC"}
+    source.history["BTCUSDT"].extend({'time': float(i * 60000), 'price': 100.0 + i} for i in range(30))
+    await source.save_snapshot()
+
+    restored = DummyStream(store)
+    assert await restored.restore_snapshot() is True
+
+    assert restored.prices == {"BTCUSDT": {**source.prices["BTCUSDT"], 'restored': True}}
+    assert restored.live_prices() == {}
+    assert restored.trending_symbols == {"BTC"}
+    assert list(restored.history["BTCUSDT"]) == list(source.history["BTCUSDT"])
+    assert restored.history_ready == {"BTCUSDT"}
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_ignored(tmp_path):
+    store = FileSnapshotStore(str(tmp_path / "stream.snap"))
+    await store.save(encode_snapshot({'prices': {"BTCUSDT": {'price': 1.0}}}, {}, time.time() - 10 ** 6))
+
+    stream = DummyStream(store)
+    assert await stream.restore_snapshot() is False
+    assert stream.prices == {}
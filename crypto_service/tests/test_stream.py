@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+import pytest
+from prometheus_client import REGISTRY
+
+from app.core.config import settings
+from app.services.binance.stream import BinancePriceStream, reconnect_delay
+
+
+def test_reconnect_delay_grows_exponentially_with_jitter():
+    for attempt in range(6):
+        ceiling = min(settings.RECONNECT_MAX_DELAY, settings.RECONNECT_BASE_DELAY * 2 ** attempt)
+        delays = [reconnect_delay(attempt) for _ in range(50)]
+        assert all(ceiling / 2 <= d <= ceiling for d in delays)
+
+
+def test_reconnect_delay_is_capped():
+    assert reconnect_delay(10_000) <= settings.RECONNECT_MAX_DELAY
+
+
+@pytest.mark.asyncio
+async def test_burst_is_conflated_to_latest_tick_per_symbol():
+    stream = BinancePriceStream(["BTCUSDT", "ETHUSDT"])
+    stream._snapshot_store = None
+    stream._running = True
+    before = REGISTRY.get_sample_value("binance_ticks_conflated_total") or 0
+    task = asyncio.create_task(stream._process_loop())
+
+    # A burst read without yielding to the loop, as when frames are already buffered
+    for i in range(100):
+        for symbol in ("BTCUSDT", "ETHUSDT"):
+            stream._last_message_at = 1000 + i
+            await stream._receive(json.dumps({'e': '24hrTicker', 's': symbol, 'c': str(i), 'E': 1000 + i}))
+    await asyncio.sleep(0)
+
+    assert stream.prices["BTCUSDT"]["price"] == 99.0
+    assert stream.prices["ETHUSDT"]["price"] == 99.0
+    assert len(stream.history["BTCUSDT"]) == 1
+    assert len(stream._mailbox) == 0
+    assert REGISTRY.get_sample_value("binance_ticks_conflated_total") == before + 198
+
+    # Later ticks are still picked up once the loop is idle again
+    await stream._receive(json.dumps({'e': '24hrTicker', 's': 'BTCUSDT', 'c': '100', 'E': 2000}))
+    await asyncio.sleep(0)
+    assert stream.prices["BTCUSDT"]["price"] == 100.0
+
+    stream._running = False
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_processing_loop_restarts_after_a_failure_and_close_awaits_it():
+    stream = BinancePriceStream(["BTCUSDT"])
+    stream._snapshot_store = None
+    stream._running = True
+    real_process = stream.process_message
+    calls = []
+
+    async def flaky_process(data, received_at=None):
+        calls.append(data['c'])
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        await real_process(data, received_at=received_at)
+
+    stream.process_message = flaky_process
+    stream._start_processing()
+    first = stream._process_task
+
+    await stream._receive(json.dumps({'e': '24hrTicker', 's': 'BTCUSDT', 'c': '1', 'E': 1000}))
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert first.done() and stream._process_task is not first
+    await stream._receive(json.dumps({'e': '24hrTicker', 's': 'BTCUSDT', 'c': '2', 'E': 2000}))
+    await asyncio.sleep(0)
+    assert stream.prices["BTCUSDT"]["price"] == 2.0
+
+    restarted = stream._process_task
+    await stream.close()
+    assert restarted.cancelled()
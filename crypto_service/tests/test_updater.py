@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.services.binance.stream import BinancePriceStream
+from app.services.binance.updater import queue_price_hashes
+
+
+class RecordingPipeline:
+    def __init__(self, on_execute=None):
+        self.commands = []
+        self.on_execute = on_execute
+
+    def hset(self, key, mapping):
+        self.commands.append((key, mapping))
+
+    def set(self, key, value):
+        self.commands.append((key, value))
+
+    def expire(self, key, seconds):
+        self.commands.append((key, seconds))
+
+    async def publish(self, channel, payload):
+        self.commands.append((channel, payload))
+
+    async def execute(self):
+        if self.on_execute:
+            self.on_execute()
+
+
+def test_queue_price_hashes_writes_only_changed_symbols():
+    prices = {
+        "BTCUSDT": {'price': 50000.0, 'timestamp': 1, 'global_stats': {}},
+        "ETHUSDT": {'price': 3000.0, 'timestamp': 1, 'tvl': None},
+    }
+    published = {}
+
+    pipe = RecordingPipeline()
+    assert queue_price_hashes(pipe, prices, published) == 2
+    key, mapping = pipe.commands[0]
+    assert key == "crypto:price:BTCUSDT"
+    assert {field: json.loads(value) for field, value in mapping.items()} == prices["BTCUSDT"]
+    # Symbols that stop ticking drop out instead of serving a frozen price
+    assert pipe.commands[1] == ("crypto:price:BTCUSDT", settings.REDIS_PRICE_HASH_TTL)
+
+    prices["ETHUSDT"] = {'price': 3001.0, 'timestamp': 2}
+    pipe = RecordingPipeline()
+    assert queue_price_hashes(pipe, prices, published) == 1
+    assert pipe.commands[0][0] == "crypto:price:ETHUSDT"
+
+
+@pytest.mark.asyncio
+async def test_latency_trace_is_only_on_the_broadcast(monkeypatch):
+    sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda delay: sleep(0))
+    monkeypatch.setattr(settings, "REDIS_TRANSPORT", "pubsub")
+
+    stream = BinancePriceStream(["BTCUSDT", "ETHUSDT"])
+    stream.prices = {
+        "BTCUSDT": {'price': 50000.0, 'timestamp': 1},
+        "ETHUSDT": {'price': 3000.0, 'timestamp': 1},
+    }
+    stream._trace = {"BTCUSDT": {'received_at': 1.0, 'processed_at': 2.0}}
+    stream._running = True
+
+    def stop():
+        stream._running = False
+
+    pipe = RecordingPipeline(on_execute=stop)
+    redis_client = type("Redis", (), {"pipeline": lambda self, transaction: pipe})()
+    await stream._redis_publish_loop(redis_client)
+
+    commands = dict((key, value) for key, value in pipe.commands if isinstance(value, str))
+    broadcast = json.loads(commands[settings.REDIS_CHANNEL])["prices"]
+    assert broadcast["BTCUSDT"]["trace"] == {'received_at': 1.0, 'processed_at': 2.0}
+    assert "trace" not in broadcast["ETHUSDT"]
+    assert "trace" not in json.loads(commands[settings.REDIS_PRICES_KEY])["prices"]["BTCUSDT"]
+    assert "trace" not in stream.prices["BTCUSDT"]
+    assert stream._trace == {}
+
+
+@pytest.mark.asyncio
+async def test_restored_prices_are_held_back_until_a_live_tick(monkeypatch):
+    sleep = asyncio.sleep
+    monkeypatch.setattr(asyncio, "sleep", lambda delay: sleep(0))
+    monkeypatch.setattr(settings, "REDIS_TRANSPORT", "pubsub")
+
+    stream = BinancePriceStream(["BTCUSDT", "ETHUSDT"])
+    stream.prices = {
+        "BTCUSDT": {'price': 50000.0, 'timestamp': 1, 'restored': True},
+        "ETHUSDT": {'price': 3000.0, 'timestamp': 1, 'restored': True},
+    }
+    await stream.process_message({'e': '24hrTicker', 's': 'BTCUSDT', 'c': '50100', 'E': 2})
+    stream._running = True
+
+    def stop():
+        stream._running = False
+
+    pipe = RecordingPipeline(on_execute=stop)
+    redis_client = type("Redis", (), {"pipeline": lambda self, transaction: pipe})()
+    await stream._redis_publish_loop(redis_client)
+
+    keys = [key for key, _ in pipe.commands]
+    commands = dict((key, value) for key, value in pipe.commands if isinstance(value, str))
+    assert set(json.loads(commands[settings.REDIS_CHANNEL])["prices"]) == {"BTCUSDT"}
+    assert set(json.loads(commands[settings.REDIS_PRICES_KEY])["prices"]) == {"BTCUSDT"}
+    assert "crypto:price:ETHUSDT" not in keys
+
+
+@pytest.mark.asyncio
+async def test_updates_stream_is_capped_short(monkeypatch):
+    from app.core.redis_transport import publish_update
+
+    monkeypatch.setattr(settings, "REDIS_TRANSPORT", "streams")
+    calls = []
+
+    class Redis:
+        async def xadd(self, name, fields, maxlen, approximate):
+            calls.append((name, maxlen, approximate))
+
+    await publish_update(Redis(), settings.REDIS_CHANNEL, "{}")
+
+    assert calls == [(settings.REDIS_CHANNEL, settings.REDIS_UPDATES_STREAM_MAXLEN, True)]
+    assert settings.REDIS_UPDATES_STREAM_MAXLEN <= 100
@@ -1,4 +1,4 @@
-import { onMounted } from 'vue'
+import { watch } from 'vue'
 import { useWebSocket } from './composables/useWebSocket'
 import { useNavigation } from './composables/useNavigation'
 import { usePriceFilters } from './composables/usePriceFilters'
@@ -16,6 +16,9 @@ export const useApp = () => {
         isConnected,
         error,
         lastUpdate,
+        fearGreed,
+        latestNews,
+        bootstrapStatus,
         loadMoreMessages,
         isLoadingMore,
         allLoaded
@@ -45,11 +48,17 @@ export const useApp = () => {
         newsItems,
         isLoadingMoreNews,
         allNewsLoaded,
-        loadMoreNews
+        loadMoreNews,
+        applyNewsSnapshot
     } = useNewsData()
 
-    onMounted(() => {
-        loadMoreNews()
+    // News arrives with the /ws bootstrap frame; REST only when it did not or was empty
+    watch([bootstrapStatus, latestNews], ([status, news]) => {
+        if (status === 'received' && news.length > 0) {
+            applyNewsSnapshot(news)
+        } else if (status !== 'pending' && newsItems.value.length === 0) {
+            loadMoreNews()
+        }
     })
 
     return {
@@ -77,6 +86,8 @@ export const useApp = () => {
         isLoadingMoreNews,
         allNewsLoaded,
         onToggleExpand,
-        globalStats
+        globalStats,
+        fearGreed,
+        bootstrapStatus
     }
 }
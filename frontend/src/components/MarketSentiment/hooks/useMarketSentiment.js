@@ -1,6 +1,7 @@
-import { ref, onMounted, computed, onUnmounted } from 'vue'
+import { ref, onMounted, computed, onUnmounted, watch } from 'vue'
 
-export const useMarketSentiment = () => {
+// fearGreed/bootstrapStatus come from useWebSocket; without them the index is fetched over REST
+export const useMarketSentiment = (fearGreed = ref(null), bootstrapStatus = ref('missed')) => {
     const value = ref(50)
     const classification = ref('Neutral')
     const loading = ref(true)
@@ -9,6 +10,14 @@ export const useMarketSentiment = () => {
 
     const API_URL = import.meta.env.VITE_API_URL || '/api/v1'
 
+    const applyData = (data) => {
+        value.value = data.value
+        classification.value = data.value_classification
+        timeUntilUpdate.value = data.time_until_update
+        error.value = null
+        loading.value = false
+    }
+
     const fetchData = async () => {
         try {
             loading.value = true
@@ -19,9 +28,7 @@ export const useMarketSentiment = () => {
                 throw new Error(data.error)
             }
 
-            value.value = data.value
-            classification.value = data.value_classification
-            timeUntilUpdate.value = data.time_until_update
+            applyData(data)
         } catch (e) {
             error.value = e.message
             console.error("Sentiment fetch error:", e)
@@ -53,8 +60,23 @@ export const useMarketSentiment = () => {
         return `${h}h ${m}m`
     })
 
+    watch(fearGreed, (data) => {
+        if (data) applyData(data)
+    }, { immediate: true })
+
+    const fetchUnlessBootstrapped = () => {
+        if (!fearGreed.value) fetchData()
+    }
+
     onMounted(() => {
-        fetchData()
+        if (bootstrapStatus.value !== 'pending') {
+            fetchUnlessBootstrapped()
+        } else {
+            const stopWaiting = watch(bootstrapStatus, () => {
+                stopWaiting()
+                fetchUnlessBootstrapped()
+            })
+        }
         const interval = setInterval(fetchData, 5 * 60 * 1000)
         onUnmounted(() => clearInterval(interval))
     })
@@ -1,6 +1,8 @@
 import { ref, onMounted, onUnmounted } from 'vue'
 
-export function useSocketConnection(url, onMessage) {
+const PONG_FRAME = JSON.stringify({ type: 'pong' })
+
+export function useSocketConnection(url, onMessage, onResync) {
     const isConnected = ref(false)
     const error = ref(null)
     let ws = null
@@ -8,10 +10,52 @@ export function useSocketConnection(url, onMessage) {
     let reconnectAttempts = 0
     const maxReconnectAttempts = 10
     const reconnectDelay = 3000
+    // Last seen broadcast; sent back on reconnect so the server replays the gap
+    let epoch = null
+    let lastSeq = 0
+    let resyncPending = false
+
+    const buildUrl = () => {
+        if (!epoch) return url
+        const separator = url.includes('?') ? '&' : '?'
+        return `${url}${separator}resume_from=${encodeURIComponent(`${epoch}:${lastSeq}`)}`
+    }
+
+    const trackSequence = (message) => {
+        if (message.type === 'bootstrap') {
+            // A full snapshot replaces whatever a resync would have reloaded
+            epoch = message.epoch
+            lastSeq = message.seq
+            resyncPending = false
+            return true
+        }
+        if (message.type === 'session') {
+            if (resyncPending) {
+                resyncPending = false
+                if (onResync) onResync()
+            }
+            if (epoch !== message.epoch) {
+                epoch = message.epoch
+                lastSeq = message.seq
+            }
+            return false
+        }
+        if (message.type === 'resync_required') {
+            epoch = message.epoch
+            lastSeq = message.seq
+            resyncPending = true
+            return false
+        }
+        if (typeof message.seq === 'number') {
+            if (message.seq <= lastSeq) return false
+            lastSeq = message.seq
+        }
+        return true
+    }
 
     const connect = () => {
         try {
-            ws = new WebSocket(url)
+            ws = new WebSocket(buildUrl())
 
             ws.onopen = () => {
                 console.log('WebSocket connected')
@@ -23,7 +67,13 @@ export function useSocketConnection(url, onMessage) {
             ws.onmessage = (event) => {
                 try {
                     const message = JSON.parse(event.data)
-                    onMessage(message)
+                    if (message.type === 'ping') {
+                        ws.send(PONG_FRAME)
+                        return
+                    }
+                    if (trackSequence(message)) {
+                        onMessage(message)
+                    }
                 } catch (e) {
                     console.error('Error parsing message:', e)
                 }
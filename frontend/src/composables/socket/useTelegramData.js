@@ -4,6 +4,7 @@ export function useTelegramData() {
     const telegramMessages = ref([])
     const isLoadingMore = ref(false)
     const allLoaded = ref(false)
+    let nextCursor = null
 
     const processTelegramMessage = (msg) => {
         if (!msg.media) msg.media = []
@@ -44,17 +45,21 @@ export function useTelegramData() {
 
         isLoadingMore.value = true
         try {
-            const skip = telegramMessages.value.length
             const limit = 20
+            // Live updates prepend to the list, so page with the server cursor rather than an offset
+            const page = nextCursor
+                ? `cursor=${encodeURIComponent(nextCursor)}`
+                : `skip=${telegramMessages.value.length}`
 
             const apiBase = import.meta.env.PROD ? '' : 'http://localhost:8080'
-            const response = await fetch(`${apiBase}/api/v1/messages?limit=${limit}&skip=${skip}`)
+            const response = await fetch(`${apiBase}/api/v1/messages?limit=${limit}&${page}`)
 
             if (!response.ok) throw new Error('Failed to fetch messages')
 
             const newHistory = await response.json()
+            nextCursor = response.headers.get('X-Next-Cursor')
 
-            if (newHistory.length < limit) {
+            if (newHistory.length < limit || !nextCursor) {
                 allLoaded.value = true
             }
 
@@ -72,11 +77,20 @@ export function useTelegramData() {
         }
     }
 
+    // Used when the server cannot replay what was missed while disconnected
+    const reloadMessages = async () => {
+        telegramMessages.value = []
+        nextCursor = null
+        allLoaded.value = false
+        await loadMoreMessages()
+    }
+
     return {
         telegramMessages,
         isLoadingMore,
         allLoaded,
         handleTelegramUpdate,
-        loadMoreMessages
+        loadMoreMessages,
+        reloadMessages
     }
 }
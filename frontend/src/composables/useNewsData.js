@@ -1,5 +1,8 @@
 import { ref } from 'vue'
 
+// Bootstrap items come from the live feed and REST pages from the DB, so ids may differ
+const newsKey = (item) => `${item.title}|${item.published_at}`
+
 export function useNewsData() {
     const newsItems = ref([])
     const isLoadingMoreNews = ref(false)
@@ -25,8 +28,8 @@ export function useNewsData() {
             }
 
             if (newItems.length > 0) {
-                const currentIds = new Set(newsItems.value.map(n => n.id))
-                const uniqueNew = newItems.filter(n => !currentIds.has(n.id))
+                const currentKeys = new Set(newsItems.value.map(newsKey))
+                const uniqueNew = newItems.filter(n => !currentKeys.has(newsKey(n)))
                 newsItems.value = [...newsItems.value, ...uniqueNew]
             }
         } catch (e) {
@@ -36,10 +39,18 @@ export function useNewsData() {
         }
     }
 
+    // Newest items from the /ws bootstrap frame, ahead of anything already shown
+    const applyNewsSnapshot = (items) => {
+        const currentKeys = new Set(newsItems.value.map(newsKey))
+        const uniqueNew = items.filter(n => !currentKeys.has(newsKey(n)))
+        newsItems.value = [...uniqueNew, ...newsItems.value]
+    }
+
     return {
         newsItems,
         isLoadingMoreNews,
         allNewsLoaded,
-        loadMoreNews
+        loadMoreNews,
+        applyNewsSnapshot
     }
 }
@@ -1,10 +1,18 @@
-import { ref, onMounted } from 'vue'
+import { ref, onMounted, onUnmounted } from 'vue'
 import { useSocketConnection } from './socket/useSocketConnection.js'
 import { usePriceData } from './socket/usePriceData.js'
 import { useTelegramData } from './socket/useTelegramData.js'
 
+// Servers without the bootstrap frame are detected by its absence; REST takes over after this
+const BOOTSTRAP_TIMEOUT_MS = 3000
+
 export function useWebSocket(url) {
     const lastUpdate = ref(null)
+    const fearGreed = ref(null)
+    const latestNews = ref([])
+    // 'pending' until the first bootstrap frame, 'received', or 'missed' after the timeout
+    const bootstrapStatus = ref('pending')
+    let bootstrapTimeout = null
 
     const {
         prices,
@@ -15,11 +23,30 @@ export function useWebSocket(url) {
         telegramMessages,
         handleTelegramUpdate,
         loadMoreMessages,
+        reloadMessages,
         isLoadingMore,
         allLoaded
     } = useTelegramData()
 
     const onMessage = (message) => {
+        if (message.type === 'bootstrap' && message.data) {
+            const { prices: snapshot, fear_greed, messages = [], news = [] } = message.data
+            if (snapshot) handlePriceUpdate(snapshot)
+            // Messages arrive newest first and each update is prepended
+            for (const msg of [...messages].reverse()) {
+                handleTelegramUpdate(msg)
+            }
+            fearGreed.value = fear_greed
+            latestNews.value = news
+            lastUpdate.value = new Date()
+            clearTimeout(bootstrapTimeout)
+            bootstrapStatus.value = 'received'
+            // REST is only needed when the snapshot had no messages; older ones are paged on demand
+            if (messages.length === 0 && telegramMessages.value.length === 0) {
+                loadMoreMessages()
+            }
+        }
+
         if (message.type === 'update' && message.data) {
             if (message.data.prices) {
                 handlePriceUpdate(message.data.prices)
@@ -43,10 +70,18 @@ export function useWebSocket(url) {
         error,
         connect,
         disconnect
-    } = useSocketConnection(url, onMessage)
+    } = useSocketConnection(url, onMessage, () => reloadMessages())
 
     onMounted(() => {
-        loadMoreMessages()
+        bootstrapTimeout = setTimeout(() => {
+            if (bootstrapStatus.value !== 'pending') return
+            bootstrapStatus.value = 'missed'
+            loadMoreMessages()
+        }, BOOTSTRAP_TIMEOUT_MS)
+    })
+
+    onUnmounted(() => {
+        clearTimeout(bootstrapTimeout)
     })
 
     return {
@@ -55,6 +90,9 @@ export function useWebSocket(url) {
         isConnected,
         error,
         lastUpdate,
+        fearGreed,
+        latestNews,
+        bootstrapStatus,
         reconnect: connect,
         loadMoreMessages,
         isLoadingMore,
@@ -47,4 +47,21 @@ describe('useNewsData composable', () => {
         expect(newsItems.value.length).toBe(0) // Should remain empty
         expect(isLoadingMoreNews.value).toBe(false)
     })
+
+    it('pages after the bootstrap snapshot without duplicating it', async () => {
+        const { newsItems, loadMoreNews, applyNewsSnapshot } = useNewsData()
+        applyNewsSnapshot([{ id: 901, title: 'Live', published_at: '2024-01-02' }])
+
+        global.fetch.mockResolvedValueOnce({
+            ok: true,
+            json: async () => [
+                { id: 1, title: 'Live', published_at: '2024-01-02' },
+                { id: 2, title: 'Older', published_at: '2024-01-01' }
+            ]
+        })
+        await loadMoreNews()
+
+        expect(global.fetch.mock.calls[0][0]).toContain('skip=1')
+        expect(newsItems.value.map(n => n.title)).toEqual(['Live', 'Older'])
+    })
 })
@@ -1,10 +1,11 @@
-import { describe, it, expect, vi } from 'vitest'
+import { describe, it, expect, vi, beforeEach, afterEach } from 'vitest'
 import { mount } from '@vue/test-utils'
 import { defineComponent } from 'vue'
 import { useWebSocket } from '../../composables/useWebSocket'
 
 class MockWebSocket {
     constructor(url) {
+        MockWebSocket.last = this
         this.url = url
         this.readyState = WebSocket.CONNECTING
         setTimeout(() => {
@@ -21,18 +22,43 @@ class MockWebSocket {
 
 global.WebSocket = MockWebSocket
 
+const telegram = vi.hoisted(() => ({
+    handleTelegramUpdate: vi.fn(),
+    loadMoreMessages: vi.fn()
+}))
+
 // Mock internal dependencies to avoid real network calls
 vi.mock('../../composables/socket/useTelegramData.js', () => ({
     useTelegramData: () => ({
         telegramMessages: { value: [] },
-        handleTelegramUpdate: vi.fn(),
-        loadMoreMessages: vi.fn(),
+        handleTelegramUpdate: telegram.handleTelegramUpdate,
+        loadMoreMessages: telegram.loadMoreMessages,
+        reloadMessages: vi.fn(),
         isLoadingMore: { value: false },
         allLoaded: { value: false }
     })
 }))
 
+const mountComposable = () => {
+    let wsData
+    mount(defineComponent({
+        setup() {
+            wsData = useWebSocket('ws://localhost:8080/ws')
+            return () => null
+        }
+    }))
+    return wsData
+}
+
 describe('useWebSocket composable', () => {
+    beforeEach(() => {
+        vi.clearAllMocks()
+    })
+
+    afterEach(() => {
+        vi.useRealTimers()
+    })
+
     it('initializes and connects within a component lifecycle', async () => {
         let wsData
 
@@ -53,4 +79,35 @@ describe('useWebSocket composable', () => {
 
         expect(wsData.isConnected.value).toBe(true)
     })
+
+    it('uses the bootstrap frame instead of loading messages over REST', () => {
+        vi.useFakeTimers()
+        const wsData = mountComposable()
+        const fearGreed = { value: 71, value_classification: 'Greed' }
+        const message = { id: 1, channel_username: 'c', text: 'hi' }
+
+        MockWebSocket.last.onmessage({
+            data: JSON.stringify({
+                type: 'bootstrap', epoch: 'e', seq: 1,
+                data: { prices: {}, fear_greed: fearGreed, messages: [message], news: [{ title: 'n' }] }
+            })
+        })
+        vi.advanceTimersByTime(5000)
+
+        expect(wsData.bootstrapStatus.value).toBe('received')
+        expect(wsData.fearGreed.value).toEqual(fearGreed)
+        expect(wsData.latestNews.value).toEqual([{ title: 'n' }])
+        expect(telegram.handleTelegramUpdate).toHaveBeenCalledWith(message)
+        expect(telegram.loadMoreMessages).not.toHaveBeenCalled()
+    })
+
+    it('falls back to REST when no bootstrap frame arrives', () => {
+        vi.useFakeTimers()
+        const wsData = mountComposable()
+
+        vi.advanceTimersByTime(5000)
+
+        expect(wsData.bootstrapStatus.value).toBe('missed')
+        expect(telegram.loadMoreMessages).toHaveBeenCalledTimes(1)
+    })
 })
@@ -37,6 +37,36 @@ class Settings:
     REDIS_CHANNEL_TELEGRAM: str = "news:telegram"
     REDIS_CHANNEL_CRYPTOPANIC: str = "news:cryptopanic"
 
+    # "pubsub" (fire-and-forget) or "streams" (XADD, replayable by the backend)
+    REDIS_TRANSPORT: str = os.environ.get("REDIS_TRANSPORT", "pubsub").lower()
+    # Approximate XADD MAXLEN ~ for the telegram/cryptopanic streams; a long tail lets the backend catch up
+    REDIS_STREAM_MAXLEN: int = int(os.environ.get("REDIS_STREAM_MAXLEN", "10000"))
+
+    # Telegram -> Celery micro-batching: flush after N messages or N seconds
+    CELERY_BATCH_SIZE: int = int(os.environ.get("CELERY_BATCH_SIZE", "50"))
+    CELERY_BATCH_WINDOW: float = float(os.environ.get("CELERY_BATCH_WINDOW", "0.5"))
+
+    # Synthetic load through MessageProcessor instead of Telegram; 0 disables it
+    TELEGRAM_LOAD_RATE: float = float(os.environ.get("TELEGRAM_LOAD_RATE", "0"))
+    TELEGRAM_LOAD_CHANNELS: int = int(os.environ.get("TELEGRAM_LOAD_CHANNELS", "12"))
+    # Simulated media download time for the stub client (seconds)
+    TELEGRAM_LOAD_MEDIA_LATENCY: float = float(os.environ.get("TELEGRAM_LOAD_MEDIA_LATENCY", "0.05"))
+
+    # Port of the /metrics HTTP server; 0 disables it
+    METRICS_PORT: int = int(os.environ.get("METRICS_PORT", "9102"))
+
+    # Deep size of long-lived buffers into memory_structure_* gauges every N seconds; 0 disables it
+    MEMORY_ACCOUNTING_INTERVAL: float = float(os.environ.get("MEMORY_ACCOUNTING_INTERVAL", "60"))
+    # MiB per structure, "name=MiB,..."; a structure over budget is trimmed in place
+    MEMORY_BUDGETS_MB: str = os.environ.get("MEMORY_BUDGETS_MB", "messages=32,processing_ids=1")
+    # Frames kept per allocation for the /memory tracemalloc report; 0 leaves tracemalloc off
+    MEMORY_TRACEMALLOC: int = int(os.environ.get("MEMORY_TRACEMALLOC", "0"))
+    # Window of the per-channel stage timings served at /stats (seconds)
+    STAGE_STATS_WINDOW: float = float(os.environ.get("STAGE_STATS_WINDOW", "300"))
+    # MessageProcessor spans are exported over OTLP/HTTP when set and OpenTelemetry is installed
+    OTEL_EXPORTER_OTLP_ENDPOINT: Optional[str] = os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT") or None
+    OTEL_SERVICE_NAME: str = os.environ.get("OTEL_SERVICE_NAME", "news_service")
+
     # CryptoPanic fetch interval (seconds)
     CRYPTOPANIC_FETCH_INTERVAL: int = 21600  # 6 hours
 
@@ -0,0 +1,21 @@
+from prometheus_client import Counter, Histogram
+
+IO_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+# From in-memory dedup scans up to media downloads
+STAGE_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0)
+
+TELEGRAM_MESSAGES = Counter(
+    "telegram_messages_total", "Telegram updates processed", ["kind"]
+)
+REDIS_PUBLISH_SECONDS = Histogram(
+    "redis_publish_seconds", "Latency of publishing one update to Redis",
+    buckets=IO_BUCKETS,
+)
+CELERY_BATCH_MESSAGES = Histogram(
+    "celery_batch_messages", "Messages per persistence batch sent to Celery",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+)
+TELEGRAM_STAGE_SECONDS = Histogram(
+    "telegram_stage_seconds", "Time spent in each MessageProcessor stage", ["stage"],
+    buckets=STAGE_BUCKETS,
+)
@@ -0,0 +1,164 @@
+import json
+import logging
+import math
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+from pulse_common.metrics_server import register_route
+
+from app.core.config import settings
+from app.core.metrics import TELEGRAM_STAGE_SECONDS
+
+try:
+    from opentelemetry import trace
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_tracer = None
+
+
+def configure_tracing():
+    """Export spans over OTLP when OpenTelemetry is installed and an endpoint is configured."""
+    global _tracer
+    if not OTEL_AVAILABLE or not settings.OTEL_EXPORTER_OTLP_ENDPOINT:
+        return
+
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning("opentelemetry-sdk or the OTLP exporter is not installed, spans are not exported")
+        return
+
+    provider = TracerProvider(resource=Resource.create({"service.name": settings.OTEL_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT)))
+    trace.set_tracer_provider(provider)
+    _tracer = trace.get_tracer("news_service.telegram")
+    logger.info(f"Exporting traces to {settings.OTEL_EXPORTER_OTLP_ENDPOINT}")
+
+
+class RollingStats:
+    """Stage durations per channel over the last `window` seconds."""
+
+    def __init__(self, window: float, max_samples: int = 2000):
+        self.window = window
+        # (channel, stage) -> deque of (monotonic time, seconds)
+        self._samples: dict[tuple[str, str], deque] = defaultdict(lambda: deque(maxlen=max_samples))
+
+    def add(self, channel: str, stage: str, seconds: float, now: Optional[float] = None):
+        self._samples[(channel, stage)].append((time.monotonic() if now is None else now, seconds))
+
+    def _recent(self, now: float) -> dict[tuple[str, str], list[float]]:
+        cutoff = now - self.window
+        recent = {}
+        for key, samples in self._samples.items():
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+            if samples:
+                recent[key] = [seconds for _, seconds in samples]
+        return recent
+
+    def snapshot(self, now: Optional[float] = None) -> dict:
+        recent = self._recent(time.monotonic() if now is None else now)
+
+        by_stage, by_channel = defaultdict(list), defaultdict(lambda: defaultdict(list))
+        for (channel, stage), values in recent.items():
+            by_stage[stage].extend(values)
+            by_channel[channel][stage].extend(values)
+
+        slowest = sorted(recent.items(), key=lambda kv: sum(kv[1]), reverse=True)[:5]
+        return {
+            "window_seconds": self.window,
+            "stages": {stage: _summary(values) for stage, values in by_stage.items()},
+            "channels": {
+                channel: {stage: _summary(values) for stage, values in stages.items()}
+                for channel, stages in by_channel.items()
+            },
+            "slowest": [
+                {"channel": channel, "stage": stage, "total_ms": round(1000 * sum(values), 2)}
+                for (channel, stage), values in slowest
+            ],
+        }
+
+
+def percentile(sorted_values: list, q: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list; None when it is empty."""
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))]
+
+
+def _summary(values: list[float]) -> dict:
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "avg_ms": round(1000 * sum(ordered) / len(ordered), 3),
+        "p50_ms": round(1000 * percentile(ordered, 0.50), 3),
+        "p95_ms": round(1000 * percentile(ordered, 0.95), 3),
+        "max_ms": round(1000 * ordered[-1], 3),
+        "total_ms": round(1000 * sum(ordered), 2),
+    }
+
+
+stage_stats = RollingStats(settings.STAGE_STATS_WINDOW)
+
+# labels() takes a lock and a dict lookup; stages are a small fixed set
+_stage_histograms = {}
+
+
+def _stage_histogram(stage: str):
+    histogram = _stage_histograms.get(stage)
+    if histogram is None:
+        histogram = _stage_histograms[stage] = TELEGRAM_STAGE_SECONDS.labels(stage)
+    return histogram
+
+
+def _record(channel: str, stage: str, seconds: float):
+    _stage_histogram(stage).observe(seconds)
+    stage_stats.add(channel, stage, seconds)
+
+
+class MessageTrace:
+    """Spans for one message; each stage feeds the histogram, the rolling stats and OpenTelemetry."""
+
+    def __init__(self, channel: str):
+        self.channel = channel
+
+    @contextmanager
+    def stage(self, name: str):
+        span = _tracer.start_as_current_span(f"telegram.{name}") if _tracer else nullcontext()
+        started = time.perf_counter()
+        try:
+            with span:
+                yield
+        finally:
+            _record(self.channel, name, time.perf_counter() - started)
+
+
+@contextmanager
+def trace_message(channel: str, is_edit: bool = False):
+    """Wraps one process_raw_message call; its duration is recorded as the "total" stage."""
+    span = _tracer.start_as_current_span("telegram.process_message") if _tracer else nullcontext()
+    started = time.perf_counter()
+    try:
+        with span as current:
+            if current is not None:
+                current.set_attribute("telegram.channel", channel)
+                current.set_attribute("telegram.is_edit", is_edit)
+            yield MessageTrace(channel)
+    finally:
+        _record(channel, "total", time.perf_counter() - started)
+
+
+def _stats_route() -> tuple[str, bytes]:
+    return "application/json", json.dumps(stage_stats.snapshot()).encode()
+
+
+register_route("/stats", _stats_route)
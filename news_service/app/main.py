@@ -2,8 +2,12 @@ import asyncio
 import logging
 
 import redis.asyncio as aioredis
+from pulse_common.memory import start_tracemalloc
+from pulse_common.metrics_server import register_route, start_metrics_server
 
 from app.core.config import settings
+from app.core.memory import accountant
+from app.core.tracing import configure_tracing
 from app.services.telegram import TelegramService
 from app.services.cryptopanic import cryptopanic_fetch_loop
 
@@ -32,6 +36,13 @@ async def main():
         logger.error(f"Failed to connect to Redis: {e}")
         raise
 
+    configure_tracing()
+    start_tracemalloc(settings.MEMORY_TRACEMALLOC)
+
+    metrics_server = None
+    if settings.METRICS_PORT:
+        metrics_server = await start_metrics_server(settings.METRICS_PORT)
+
     # Start Telegram service
     tg_service = TelegramService(
         api_id=settings.TELEGRAM_API_ID,
@@ -41,6 +52,12 @@ async def main():
     await tg_service.start(settings.TELEGRAM_CHANNELS, redis_client)
     logger.info(f"Telegram service started. Monitoring {len(settings.TELEGRAM_CHANNELS)} channels")
 
+    tg_service.track_memory(accountant)
+    register_route("/memory", accountant.json_route)
+    memory_task = None
+    if settings.MEMORY_ACCOUNTING_INTERVAL:
+        memory_task = asyncio.create_task(accountant.run(settings.MEMORY_ACCOUNTING_INTERVAL))
+
     # Start CryptoPanic fetch loop
     cryptopanic_task = asyncio.create_task(cryptopanic_fetch_loop(redis_client))
     logger.info("CryptoPanic fetch loop started")
@@ -60,9 +77,13 @@ async def main():
             await cryptopanic_task
         except asyncio.CancelledError:
             pass
+        if memory_task:
+            memory_task.cancel()
 
         await tg_service.close()
         await redis_client.aclose()
+        if metrics_server:
+            metrics_server.close()
         logger.info("News Service shutdown complete")
 
 
@@ -0,0 +1,44 @@
+import argparse
+import asyncio
+import json
+import logging
+import tempfile
+from collections import deque
+
+import redis.asyncio as aioredis
+
+from app.core.config import settings
+from app.services.telegram.loadgen import TelegramLoadGenerator, build_load_processor
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(name)s] %(levelname)s: %(message)s",
+)
+# One line per processed message would drown the report
+logging.getLogger("app.services.telegram.processor").setLevel(logging.WARNING)
+logging.getLogger("app.services.telegram.media").setLevel(logging.WARNING)
+
+
+async def run(rate: float, duration: float, channels: int, media_latency: float, media_dir: str) -> dict:
+    redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+    try:
+        processor = build_load_processor(redis_client, deque(maxlen=500), media_dir, media_latency)
+        generator = TelegramLoadGenerator(processor, rate, channels=channels)
+        return await generator.run(duration)
+    finally:
+        await redis_client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Drive synthetic Telegram updates through MessageProcessor -> Redis -> Celery"
+    )
+    parser.add_argument("--rate", type=float, default=settings.TELEGRAM_LOAD_RATE or 20, help="updates per second")
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument("--channels", type=int, default=settings.TELEGRAM_LOAD_CHANNELS)
+    parser.add_argument("--media-latency", type=float, default=settings.TELEGRAM_LOAD_MEDIA_LATENCY)
+    parser.add_argument("--media-dir", default=tempfile.mkdtemp(prefix="telegram-load-"))
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args.rate, args.duration, args.channels, args.media_latency, args.media_dir))
+    print(json.dumps(report, indent=2))
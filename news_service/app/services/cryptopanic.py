@@ -6,6 +6,7 @@ import httpx
 
 from app.core.config import settings
 from app.core.celery_app import celery_app
+from app.core.redis_transport import publish_update
 
 logger = logging.getLogger(__name__)
 
@@ -73,7 +74,7 @@ async def _do_fetch_and_publish(redis_client):
             "type": "cryptopanic_update",
             "data": news_list
         }, default=str)
-        await redis_client.publish(settings.REDIS_CHANNEL_CRYPTOPANIC, payload)
+        await publish_update(redis_client, settings.REDIS_CHANNEL_CRYPTOPANIC, payload)
         logger.info(f"Published {len(news_list)} CryptoPanic news to Redis")
 
     except Exception as e:
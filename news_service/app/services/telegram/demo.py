@@ -6,6 +6,24 @@ from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+DEMO_CHANNELS = [
+    {'username': 'bitcoin', 'title': 'Bitcoin'},
+    {'username': 'ethereum', 'title': 'Ethereum'},
+    {'username': 'whale_alert', 'title': 'Whale Alert'},
+    {'username': 'CoinDesk', 'title': 'CoinDesk'},
+]
+
+DEMO_TEXTS = [
+    "BTC looking strong today! Bulls are back in control.",
+    "Large transfer detected: 1,500 BTC moved from unknown wallet to Binance",
+    "ETH just broke key resistance at $3,500. Next target: $4,000",
+    "Breaking: Major crypto exchange announces new listings",
+    "Whale alert: 50,000,000 USDT transferred to Coinbase",
+    "Market sentiment turning bullish as BTC holds above $95K",
+    "Crypto adoption continues to grow in emerging markets",
+    "Lightning Network capacity reaches new ATH",
+]
+
 class DemoGenerator:
     def __init__(self, messages_buffer: deque):
         self.messages = messages_buffer
@@ -20,29 +38,11 @@ class DemoGenerator:
         self._running = False
 
     async def _generate_demo_messages(self):
-        demo_channels = [
-            {'username': 'bitcoin', 'title': 'Bitcoin'},
-            {'username': 'ethereum', 'title': 'Ethereum'},
-            {'username': 'whale_alert', 'title': 'Whale Alert'},
-            {'username': 'CoinDesk', 'title': 'CoinDesk'},
-        ]
-
-        demo_texts = [
-            "BTC looking strong today! Bulls are back in control.",
-            "Large transfer detected: 1,500 BTC moved from unknown wallet to Binance",
-            "ETH just broke key resistance at $3,500. Next target: $4,000",
-            "Breaking: Major crypto exchange announces new listings",
-            "Whale alert: 50,000,000 USDT transferred to Coinbase",
-            "Market sentiment turning bullish as BTC holds above $95K",
-            "Crypto adoption continues to grow in emerging markets",
-            "Lightning Network capacity reaches new ATH",
-        ]
-
         while self._running:
             await asyncio.sleep(random.uniform(5, 15))
 
-            channel = random.choice(demo_channels)
-            text = random.choice(demo_texts)
+            channel = random.choice(DEMO_CHANNELS)
+            text = random.choice(DEMO_TEXTS)
 
             msg = {
                 'id': random.randint(1000, 99999),
@@ -41,6 +41,6 @@ class HistoryFetcher:
                         parsed_msg['date'] += 'Z'
                     self.messages.appendleft(parsed_msg)
 
-                    self.publisher.send_to_celery(parsed_msg)
+                    self.publisher.queue_for_celery(parsed_msg)
             except Exception as e:
                 logger.error(f"Could not fetch history for {username}: {e}")
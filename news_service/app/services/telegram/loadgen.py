@@ -0,0 +1,220 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Optional
+
+from prometheus_client import REGISTRY
+
+from app.core.tracing import percentile
+
+from .demo import DEMO_CHANNELS, DEMO_TEXTS
+
+logger = logging.getLogger(__name__)
+
+# MessageProcessor stages recorded in telegram_stage_seconds, see app.core.tracing
+STAGES = ("parse", "dedup", "media_download", "buffer_update", "redis_publish", "celery_enqueue")
+# Latency percentiles cover the newest updates only, so an endless service-mode run stays bounded
+LATENCY_WINDOW = 10_000
+
+
+class SyntheticMessage:
+    """The subset of a Telethon Message that MessageParser and MediaDownloader read."""
+
+    def __init__(self, id: int, text: str, grouped_id: Optional[int] = None, photo: bool = False):
+        self.id = id
+        self.text = text
+        self.message = text
+        self.date = datetime.now(timezone.utc)
+        self.views = random.randint(100, 50000)
+        self.forwards = random.randint(0, 500)
+        self.grouped_id = grouped_id
+        self.photo = object() if photo else None
+        self.video = None
+        self.document = None
+        self.poll = None
+        self.venue = None
+        self.geo = None
+
+
+class StubMediaClient:
+    """Stands in for TelegramClient.download_media: waits, then optionally writes a tiny file."""
+
+    def __init__(self, latency: float = 0.05, write: bool = True):
+        self.latency = latency
+        self.write = write
+
+    async def download_media(self, message, file: str):
+        await asyncio.sleep(self.latency)
+        if self.write:
+            with open(file, "wb") as f:
+                f.write(b"\xff\xd8stub")
+        return file
+
+
+class TelegramLoadGenerator:
+    """
+    Drives synthetic messages through the real MessageProcessor at a fixed
+    rate: plain posts, albums (several parts sharing a grouped_id), edits of
+    recent posts and photo stubs. Each update is handled in its own task, as
+    Telethon event handlers are.
+    """
+
+    def __init__(self, processor, rate: float, channels: int = 12, album_ratio: float = 0.1,
+                 edit_ratio: float = 0.1, media_ratio: float = 0.3, seed: int = 42):
+        self.processor = processor
+        self.rate = rate
+        self.album_ratio = album_ratio
+        self.edit_ratio = edit_ratio
+        self.media_ratio = media_ratio
+        self.rng = random.Random(seed)
+        self.channels = [
+            {'username': f"{base['username']}_{i}", 'title': f"{base['title']} {i}"}
+            for i in range(channels)
+            for base in [DEMO_CHANNELS[i % len(DEMO_CHANNELS)]]
+        ]
+        self.sent = Counter()
+        self.processed = 0
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._next_id = 1
+        self._next_group = 1
+        self._recent: list[tuple[dict, int]] = []
+        self._tasks: set[asyncio.Task] = set()
+        self._running = False
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def _updates(self) -> list[tuple[SyntheticMessage, dict, bool, str]]:
+        """One generated update: an album yields several parts at once."""
+        channel = self.rng.choice(self.channels)
+        text = self.rng.choice(DEMO_TEXTS)
+        roll = self.rng.random()
+
+        if roll < self.edit_ratio and self._recent:
+            channel, msg_id = self.rng.choice(self._recent)
+            return [(SyntheticMessage(msg_id, f"{text} (edited)"), channel, True, "edit")]
+
+        if roll < self.edit_ratio + self.album_ratio:
+            self._next_group += 1
+            parts = []
+            for part in range(self.rng.randint(2, 4)):
+                msg = SyntheticMessage(self._new_id(), text if part == 0 else "", self._next_group, photo=True)
+                parts.append((msg, channel, False, "album_part"))
+            return parts
+
+        msg = SyntheticMessage(self._new_id(), text, photo=self.rng.random() < self.media_ratio)
+        self._recent = (self._recent + [(channel, msg.id)])[-100:]
+        return [(msg, channel, False, "new")]
+
+    async def _process(self, msg: SyntheticMessage, channel: dict, is_edit: bool):
+        started = time.perf_counter()
+        await self.processor.process_raw_message(msg, channel['username'], channel['title'], is_edit)
+        self.latencies.append(time.perf_counter() - started)
+        self.processed += 1
+
+    async def run(self, duration: Optional[float] = None, report_every: Optional[float] = None) -> dict:
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.rate
+        before = _stage_totals()
+        started = next_at = last_report = loop.time()
+        self._running = True
+        logger.info(f"Telegram load generator: {self.rate} updates/s over {len(self.channels)} channels")
+
+        try:
+            while self._running and (duration is None or loop.time() - started < duration):
+                for msg, channel, is_edit, kind in self._updates():
+                    self.sent[kind] += 1
+                    task = asyncio.create_task(self._process(msg, channel, is_edit))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                next_at = max(next_at + interval, loop.time())
+                await asyncio.sleep(next_at - loop.time())
+
+                if report_every and loop.time() - last_report >= report_every:
+                    last_report = loop.time()
+                    logger.info(f"Load report: {json.dumps(self.report(last_report - started, before))}")
+
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+        finally:
+            self._running = False
+            self.processor.publisher.flush_celery()
+
+        return self.report(loop.time() - started, before)
+
+    def stop(self):
+        self._running = False
+
+    def report(self, elapsed: float, before: dict) -> dict:
+        latencies = sorted(self.latencies)
+        after = _stage_totals()
+        stages = {}
+        for stage in STAGES:
+            count = after[stage][0] - before[stage][0]
+            total = after[stage][1] - before[stage][1]
+            stages[stage] = {
+                "count": int(count),
+                "avg_ms": round(1000 * total / count, 2) if count else None,
+            }
+        batches = after["celery_batch"][0] - before["celery_batch"][0]
+        batched = after["celery_batch"][1] - before["celery_batch"][1]
+
+        return {
+            "elapsed_seconds": round(elapsed, 2),
+            "sent": dict(self.sent),
+            "processed": self.processed,
+            "throughput_per_sec": round(self.processed / elapsed, 1) if elapsed else 0.0,
+            "latency_ms": {
+                name: _ms(percentile(latencies, q))
+                for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))
+            },
+            "stages": stages,
+            "celery_batches": {
+                "batches": int(batches),
+                "avg_messages": round(batched / batches, 1) if batches else None,
+            },
+        }
+
+
+def _stage_totals() -> dict:
+    totals = {}
+    for stage in STAGES:
+        labels = {"stage": stage}
+        totals[stage] = (
+            REGISTRY.get_sample_value("telegram_stage_seconds_count", labels) or 0,
+            REGISTRY.get_sample_value("telegram_stage_seconds_sum", labels) or 0,
+        )
+    totals["celery_batch"] = (
+        REGISTRY.get_sample_value("celery_batch_messages_count") or 0,
+        REGISTRY.get_sample_value("celery_batch_messages_sum") or 0,
+    )
+    return totals
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(1000 * seconds, 2) if seconds is not None else None
+
+
+def build_load_processor(redis_client, messages_buffer, media_dir: str, media_latency: float,
+                         write_media: bool = True):
+    """A MessageProcessor wired to Redis and Celery, with a stub media client."""
+    from .media import MediaDownloader
+    from .processor import MessageProcessor
+
+    os.makedirs(media_dir, exist_ok=True)
+    processor = MessageProcessor(
+        client=StubMediaClient(media_latency, write=write_media),
+        messages_buffer=messages_buffer,
+        channels={},
+        channels_by_id={},
+        redis_client=redis_client,
+        is_demo=False,
+    )
+    processor.media_downloader = MediaDownloader(media_dir)
+    return processor
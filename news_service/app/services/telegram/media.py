@@ -1,5 +1,6 @@
 import os
 import logging
+from typing import Optional
 
 try:
     from telethon import events
@@ -14,6 +15,25 @@ class MediaDownloader:
         if not os.path.exists(self.media_dir):
             os.makedirs(self.media_dir, exist_ok=True)
 
+    @staticmethod
+    def media_type(msg_or_event) -> Optional[str]:
+        """'photo', 'video' or 'gif' for messages whose media we store, else None."""
+        if getattr(msg_or_event, 'photo', None):
+            return 'photo'
+        if getattr(msg_or_event, 'video', None):
+            return 'video'
+        doc = getattr(msg_or_event, 'document', None)
+        if doc:
+            try:
+                is_gif = any(isinstance(attr, (getattr(events, 'DocumentAttributeAnimated', object), object))
+                             for attr in doc.attributes)
+                if 'video' in doc.mime_type or is_gif:
+                    return 'gif' if is_gif else 'video'
+            except (AttributeError, TypeError) as e:
+                # The message is still processed, just without media
+                logger.warning(f"Unreadable document on message {getattr(msg_or_event, 'id', None)}: {e}")
+        return None
+
     async def download(self, client, msg_or_event, username: str) -> tuple[bool, str, str]:
         
         has_media = False
@@ -21,19 +41,8 @@ class MediaDownloader:
         media_path = None
 
         try:
-            if getattr(msg_or_event, 'photo', None):
-                has_media = True
-                media_type = 'photo'
-            elif getattr(msg_or_event, 'video', None):
-                has_media = True
-                media_type = 'video'
-            elif getattr(msg_or_event, 'document', None):
-                doc = msg_or_event.document
-                is_gif = any(isinstance(attr, (getattr(events, 'DocumentAttributeAnimated', object), object))
-                             for attr in doc.attributes)
-                if 'video' in doc.mime_type or is_gif:
-                    has_media = True
-                    media_type = 'gif' if is_gif else 'video'
+            media_type = self.media_type(msg_or_event)
+            has_media = media_type is not None
 
             if has_media:
                 ext = '.jpg' if media_type == 'photo' else '.mp4'
@@ -1,6 +1,9 @@
 import logging
 from collections import deque
 
+from app.core.metrics import TELEGRAM_MESSAGES
+from app.core.tracing import trace_message
+
 from .media import MediaDownloader
 from .parser import MessageParser
 from .publisher import MessagePublisher
@@ -36,15 +39,23 @@ class MessageProcessor:
 
     async def process_raw_message(self, msg_or_event, username: str, title: str, is_edit: bool = False):
         try:
+            with trace_message(username, is_edit) as trace:
+                await self._process_traced(trace, msg_or_event, username, title, is_edit)
+        except Exception as e:
+            logger.error(f"Error processing raw message: {e}", exc_info=True)
+
+    async def _process_traced(self, trace, msg_or_event, username: str, title: str, is_edit: bool):
+        with trace.stage("parse"):
             parsed_msg = MessageParser.parse(msg_or_event, username, title, is_edit)
-            if not parsed_msg:
-                logger.debug(f"Skipping empty/service update from @{username}")
-                return
+        if not parsed_msg:
+            logger.debug(f"Skipping empty/service update from @{username}")
+            return
 
-            text_content = parsed_msg['text']
-            grouped_id = parsed_msg['grouped_id']
+        text_content = parsed_msg['text']
+        grouped_id = parsed_msg['grouped_id']
 
-            msg_key = (username, msg_or_event.id)
+        msg_key = (username, msg_or_event.id)
+        with trace.stage("dedup"):
             if msg_key in self.processing_ids:
                 logger.debug(f"Skipping: Message {msg_or_event.id} from @{username} is already being processed")
                 return
@@ -61,16 +72,19 @@ class MessageProcessor:
                     logger.debug(f"Skipping: Message {msg_or_event.id} from @{username} already in buffer")
                     return
 
-            self.processing_ids.add(msg_key)
+        self.processing_ids.add(msg_key)
 
-            try:
-                has_media = False
-                media_type = None
-                media_path = None
+        try:
+            has_media = False
+            media_type = None
+            media_path = None
 
-                if not self._demo_mode and self.client:
+            # Only messages that carry media are timed, so the stage is not diluted by text posts
+            if not self._demo_mode and self.client and MediaDownloader.media_type(msg_or_event):
+                with trace.stage("media_download"):
                     has_media, media_type, media_path = await self.media_downloader.download(self.client, msg_or_event, username)
 
+            with trace.stage("buffer_update"):
                 if existing_in_buffer:
                     if not existing_in_buffer.get('text') and text_content:
                         existing_in_buffer['text'] = text_content
@@ -90,13 +104,12 @@ class MessageProcessor:
                         existing_in_buffer['media_type'] = media_type
                         existing_in_buffer['media_path'] = media_path
 
-                    await self.publisher.publish_to_redis(existing_in_buffer)
-                    self.publisher.send_to_celery(existing_in_buffer)
+                    message = existing_in_buffer
                 else:
                     parsed_msg['has_media'] = has_media
                     parsed_msg['media_type'] = media_type
                     parsed_msg['media_path'] = media_path
-                    
+
                     if has_media and media_path:
                         parsed_msg['media_list'] = [{
                             'type': media_type,
@@ -114,13 +127,15 @@ class MessageProcessor:
                     else:
                         self.messages.appendleft(parsed_msg)
 
-                    await self.publisher.publish_to_redis(parsed_msg)
-                    self.publisher.send_to_celery(parsed_msg)
+                    message = parsed_msg
 
-                text_preview = str(text_content)[:50] if text_content else "[no text]"
-                logger.info(f"Processed {'edit' if is_edit else 'msg'} from @{username}: {text_preview}...")
-            finally:
-                self.processing_ids.discard(msg_key)
+            with trace.stage("redis_publish"):
+                await self.publisher.publish_to_redis(message)
+            with trace.stage("celery_enqueue"):
+                self.publisher.queue_for_celery(message)
 
-        except Exception as e:
-            logger.error(f"Error processing raw message: {e}", exc_info=True)
+            TELEGRAM_MESSAGES.labels("edit" if is_edit else "album_part" if existing_in_buffer else "new").inc()
+            text_preview = str(text_content)[:50] if text_content else "[no text]"
+            logger.info(f"Processed {'edit' if is_edit else 'msg'} from @{username}: {text_preview}...")
+        finally:
+            self.processing_ids.discard(msg_key)
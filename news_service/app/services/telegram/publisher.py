@@ -1,14 +1,23 @@
+import asyncio
 import json
 import logging
 
 from app.core.celery_app import celery_app
 from app.core.config import settings
+from app.core.metrics import CELERY_BATCH_MESSAGES, REDIS_PUBLISH_SECONDS
+from app.core.redis_transport import publish_update
 
 logger = logging.getLogger(__name__)
 
 class MessagePublisher:
-    def __init__(self, redis_client):
+    def __init__(self, redis_client, batch_size: int = None, batch_window: float = None):
         self._redis_client = redis_client
+        self._batch_size = batch_size or settings.CELERY_BATCH_SIZE
+        self._batch_window = settings.CELERY_BATCH_WINDOW if batch_window is None else batch_window
+        # (channel_username, id) -> latest snapshot; album parts share a key, so later
+        # parts replace the earlier snapshot with the accumulated media_list
+        self._pending = {}
+        self._flush_handle = None
 
     async def publish_to_redis(self, msg_data: dict):
         if self._redis_client:
@@ -17,7 +26,8 @@ class MessagePublisher:
                     "type": "telegram_update",
                     "data": msg_data
                 }, default=str)
-                await self._redis_client.publish(settings.REDIS_CHANNEL_TELEGRAM, payload)
+                with REDIS_PUBLISH_SECONDS.time():
+                    await publish_update(self._redis_client, settings.REDIS_CHANNEL_TELEGRAM, payload)
             except Exception as e:
                 logger.error(f"Error publishing to Redis: {e}")
 
@@ -29,3 +39,44 @@ class MessagePublisher:
             )
         except Exception as e:
             logger.error(f"Error sending task to Celery: {e}")
+
+    def queue_for_celery(self, msg_data: dict):
+        # Buffer dicts keep being mutated (albums, edits), so store a snapshot
+        snapshot = dict(msg_data)
+        if msg_data.get('media_list'):
+            snapshot['media_list'] = list(msg_data['media_list'])
+
+        key = (msg_data.get('channel_username'), msg_data.get('id'))
+        self._pending[key] = snapshot
+
+        if len(self._pending) >= self._batch_size:
+            self.flush_celery()
+            return
+
+        if self._flush_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush_celery()
+                return
+            self._flush_handle = loop.call_later(self._batch_window, self.flush_celery)
+
+    def flush_celery(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self._pending:
+            return
+
+        batch = list(self._pending.values())
+        self._pending = {}
+        CELERY_BATCH_MESSAGES.observe(len(batch))
+        try:
+            celery_app.send_task(
+                "app.tasks.telegram_tasks.persist_telegram_messages_batch",
+                args=[batch]
+            )
+            logger.debug(f"Sent batch of {len(batch)} messages to Celery")
+        except Exception as e:
+            logger.error(f"Error sending batch to Celery: {e}")
@@ -1,12 +1,18 @@
 import os
 import asyncio
 import logging
+import tempfile
 from collections import deque
 from typing import Optional
 
+from pulse_common.memory import sampled_sizeof, trim_deque
+
+from app.core.config import settings
+
 from .client_manager import TelegramClientManager
 from .processor import MessageProcessor
 from .demo import DemoGenerator
+from .loadgen import TelegramLoadGenerator, build_load_processor
 
 try:
     from telethon import TelegramClient
@@ -44,12 +50,27 @@ class TelegramService:
             self.demo_generator = None
             self.client_manager = None
             self.processor = None
+        self.load_generator = None
+        self._load_task = None
 
     @property
     def is_demo_mode(self) -> bool:
         return self._demo_mode
 
     async def start(self, channel_usernames: list[str], redis_client):
+        if settings.TELEGRAM_LOAD_RATE > 0:
+            # Synthetic media never reaches the /data/media volume the backend serves
+            self.processor = build_load_processor(
+                redis_client, self.messages, tempfile.mkdtemp(prefix="telegram-load-"),
+                settings.TELEGRAM_LOAD_MEDIA_LATENCY, write_media=False,
+            )
+            self.load_generator = TelegramLoadGenerator(
+                self.processor, settings.TELEGRAM_LOAD_RATE, channels=settings.TELEGRAM_LOAD_CHANNELS
+            )
+            self._load_task = asyncio.create_task(self.load_generator.run(report_every=60))
+            logger.info("Telegram service running in LOAD mode")
+            return
+
         if self._demo_mode:
             self.demo_generator.start()
             return
@@ -88,9 +109,29 @@ class TelegramService:
     def get_latest_message(self) -> Optional[dict]:
         return self.messages[0] if self.messages else None
 
+    def _processing_ids(self) -> set:
+        return self.processor.processing_ids if self.processor else set()
+
+    def track_memory(self, accountant):
+        # Newest messages are on the left, so trimming pops from the right
+        accountant.register(
+            "messages", lambda: self.messages,
+            lambda size, budget: trim_deque(self.messages, size, budget, oldest_left=False, floor=50),
+            sizer=sampled_sizeof,
+        )
+        # Only in-flight ids belong here; anything over budget has leaked
+        accountant.register("processing_ids", self._processing_ids, lambda size, budget: self._processing_ids().clear())
+
     async def close(self):
         if self._demo_mode and self.demo_generator:
             self.demo_generator.stop()
-            
+
+        if self._load_task:
+            self.load_generator.stop()
+            logger.info(f"Load report: {await self._load_task}")
+
+        if self.processor:
+            self.processor.publisher.flush_celery()
+
         if self.client_manager:
             await self.client_manager.close()
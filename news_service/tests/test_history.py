@@ -26,4 +26,4 @@ async def test_history_fetcher():
     assert messages[1]["id"] == 1
     assert messages[0]["id"] == 2
     
-    assert mock_publisher.send_to_celery.call_count == 2
+    assert mock_publisher.queue_for_celery.call_count == 2
@@ -0,0 +1,45 @@
+import pytest
+from collections import deque
+from unittest.mock import AsyncMock, patch
+
+from app.services.telegram.loadgen import TelegramLoadGenerator, build_load_processor
+
+
+@pytest.mark.asyncio
+@patch("app.services.telegram.publisher.celery_app")
+async def test_load_generator_drives_processor(mock_celery_app, tmp_path):
+    redis_client = AsyncMock()
+    buffer = deque(maxlen=500)
+    processor = build_load_processor(redis_client, buffer, str(tmp_path), media_latency=0)
+    generator = TelegramLoadGenerator(processor, rate=200, channels=3, album_ratio=0.3, edit_ratio=0.2)
+
+    report = await generator.run(duration=0.3)
+
+    assert report["processed"] == sum(report["sent"].values())
+    assert set(report["sent"]) == {"new", "album_part", "edit"}
+    assert report["stages"]["redis_publish"]["count"] == report["processed"]
+    assert report["stages"]["parse"]["count"] == report["processed"]
+    assert 0 < report["stages"]["media_download"]["count"] < report["processed"]
+    assert report["celery_batches"]["batches"] >= 1
+    mock_celery_app.send_task.assert_called()
+
+    albums = [m for m in buffer if m.get("grouped_id")]
+    assert albums and all(m["media_list"] for m in albums)
+    assert any(path.name.endswith(".jpg") for path in tmp_path.iterdir())
+
+
+@pytest.mark.asyncio
+@patch("app.services.telegram.publisher.celery_app")
+async def test_service_mode_keeps_latencies_bounded_and_writes_no_media(mock_celery_app, tmp_path, monkeypatch):
+    from app.services.telegram import loadgen
+
+    monkeypatch.setattr(loadgen, "LATENCY_WINDOW", 5)
+    processor = build_load_processor(AsyncMock(), deque(maxlen=500), str(tmp_path), media_latency=0,
+                                     write_media=False)
+    generator = TelegramLoadGenerator(processor, rate=200, channels=2, media_ratio=1.0)
+
+    report = await generator.run(duration=0.2)
+
+    assert report["processed"] > 5
+    assert len(generator.latencies) == 5
+    assert list(tmp_path.iterdir()) == []
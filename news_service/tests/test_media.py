@@ -0,0 +1,27 @@
+import pytest
+from collections import deque
+from unittest.mock import AsyncMock, patch
+
+from app.services.telegram.loadgen import SyntheticMessage, build_load_processor
+from app.services.telegram.media import MediaDownloader
+
+
+def test_media_type_ignores_unreadable_documents():
+    msg = SyntheticMessage(id=1, text="hello")
+    msg.document = object()
+
+    assert MediaDownloader.media_type(msg) is None
+    assert MediaDownloader.media_type(SyntheticMessage(id=2, text="pic", photo=True)) == "photo"
+
+
+@pytest.mark.asyncio
+@patch("app.services.telegram.publisher.celery_app")
+async def test_message_with_unreadable_document_is_still_published(mock_celery_app, tmp_path):
+    buffer = deque(maxlen=10)
+    processor = build_load_processor(AsyncMock(), buffer, str(tmp_path), media_latency=0)
+    msg = SyntheticMessage(id=7, text="text survives")
+    msg.document = object()
+
+    await processor.process_raw_message(msg, "chan", "Channel")
+
+    assert [(m["id"], m["text"], m["has_media"]) for m in buffer] == [(7, "text survives", False)]
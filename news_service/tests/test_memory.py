@@ -0,0 +1,39 @@
+from collections import deque
+
+from pulse_common.memory import MemoryAccountant, deep_sizeof, trim_deque
+
+
+def test_newest_first_buffer_keeps_newest_messages():
+    # TelegramService.messages is filled with appendleft
+    messages = deque(maxlen=500)
+    for i in range(500):
+        messages.appendleft({"id": i, "text": "x" * 200})
+    size = deep_sizeof(messages)
+
+    trim_deque(messages, size, size // 2, oldest_left=False, floor=50)
+
+    assert 50 <= len(messages) <= 225
+    assert messages[0]["id"] == 499
+    assert deep_sizeof(messages) <= size // 2
+
+
+def test_leaked_processing_ids_are_cleared():
+    processing_ids = {("channel", i) for i in range(5000)}
+    accountant = MemoryAccountant({"processing_ids": 1024})
+    accountant.register("processing_ids", lambda: processing_ids, lambda size, budget: processing_ids.clear())
+
+    report = accountant.enforce()
+
+    assert not processing_ids
+    assert report["processing_ids"]["items"] == 0
+
+
+def test_measure_leaves_structures_over_budget_alone():
+    messages = deque({"id": i} for i in range(100))
+    accountant = MemoryAccountant({"messages": 64})
+    accountant.register("messages", lambda: messages, lambda size, budget: messages.clear())
+
+    report = accountant.measure()
+
+    assert len(messages) == 100
+    assert report["messages"]["bytes"] > report["messages"]["budget_bytes"]
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from app.services.telegram.publisher import MessagePublisher
 import json
+import asyncio
 
 @pytest.mark.asyncio
 async def test_publish_to_redis_success():
@@ -42,3 +43,61 @@ def test_send_to_celery_exception(mock_celery_app):
     publisher = MessagePublisher(redis_client=None)
     
     publisher.send_to_celery({"id": 1})
+
+@pytest.mark.asyncio
+@patch("app.services.telegram.publisher.celery_app")
+async def test_queue_for_celery_flushes_on_batch_size(mock_celery_app):
+    publisher = MessagePublisher(redis_client=None, batch_size=2, batch_window=60)
+
+    publisher.queue_for_celery({"id": 1, "channel_username": "chan"})
+    publisher.queue_for_celery({"id": 2, "channel_username": "chan"})
+
+    mock_celery_app.send_task.assert_called_once()
+    args, kwargs = mock_celery_app.send_task.call_args
+    assert args[0] == "app.tasks.telegram_tasks.persist_telegram_messages_batch"
+    assert [m["id"] for m in kwargs["args"][0]] == [1, 2]
+
+@pytest.mark.asyncio
+@patch("app.services.telegram.publisher.celery_app")
+async def test_queue_for_celery_coalesces_within_window(mock_celery_app):
+    publisher = MessagePublisher(redis_client=None, batch_size=10, batch_window=0.01)
+
+    album = {"id": 1, "channel_username": "chan", "media_list": [{"path": "a.jpg"}]}
+    publisher.queue_for_celery(album)
+    album["media_list"].append({"path": "b.jpg"})
+    publisher.queue_for_celery(album)
+    mock_celery_app.send_task.assert_not_called()
+
+    await asyncio.sleep(0.05)
+
+    mock_celery_app.send_task.assert_called_once()
+    batch = mock_celery_app.send_task.call_args.kwargs["args"][0]
+    assert len(batch) == 1
+    assert len(batch[0]["media_list"]) == 2
+
+@pytest.mark.asyncio
+async def test_publish_to_redis_streams_transport():
+    mock_redis = AsyncMock()
+    publisher = MessagePublisher(redis_client=mock_redis)
+
+    with patch("app.core.redis_transport.settings") as mock_settings:
+        mock_settings.REDIS_TRANSPORT = "streams"
+        mock_settings.REDIS_STREAM_MAXLEN = 1000
+        await publisher.publish_to_redis({"id": 1, "text": "test stream"})
+
+    mock_redis.publish.assert_not_called()
+    args, kwargs = mock_redis.xadd.call_args
+    assert args[0] == "news:telegram"
+    assert json.loads(args[1]["data"])["data"]["id"] == 1
+    assert kwargs == {"maxlen": 1000, "approximate": True}
+
+@patch("app.services.telegram.publisher.celery_app")
+def test_flush_records_batch_size_metric(mock_celery_app):
+    from prometheus_client import REGISTRY
+
+    before = REGISTRY.get_sample_value("celery_batch_messages_count") or 0
+    publisher = MessagePublisher(redis_client=None, batch_size=10)
+    publisher._pending = {("chan", 1): {"id": 1}, ("chan", 2): {"id": 2}}
+    publisher.flush_celery()
+
+    assert REGISTRY.get_sample_value("celery_batch_messages_count") == before + 1
@@ -0,0 +1,53 @@
+import json
+import pytest
+from collections import deque
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core import tracing
+from app.core.tracing import RollingStats
+from app.services.telegram.processor import MessageProcessor
+
+
+def test_rolling_stats_snapshot_drops_old_samples():
+    stats = RollingStats(window=60)
+    stats.add("fast_channel", "dedup", 9.0, now=10)
+    stats.add("slow_channel", "media_download", 2.0, now=100)
+    stats.add("slow_channel", "media_download", 4.0, now=150)
+    stats.add("fast_channel", "dedup", 0.001, now=150)
+
+    snapshot = stats.snapshot(now=160)
+
+    assert snapshot["window_seconds"] == 60
+    assert snapshot["stages"]["media_download"]["count"] == 2
+    assert snapshot["stages"]["media_download"]["max_ms"] == 4000.0
+    assert snapshot["stages"]["dedup"]["count"] == 1
+    assert snapshot["channels"]["slow_channel"]["media_download"]["avg_ms"] == 3000.0
+    assert snapshot["slowest"][0] == {"channel": "slow_channel", "stage": "media_download", "total_ms": 6000.0}
+
+
+@pytest.mark.asyncio
+@patch("app.services.telegram.publisher.celery_app")
+async def test_processor_records_stages_per_channel(mock_celery_app, monkeypatch):
+    monkeypatch.setattr(tracing, "stage_stats", RollingStats(window=300))
+    processor = MessageProcessor(
+        client=None, messages_buffer=deque(maxlen=10), channels={}, channels_by_id={},
+        redis_client=AsyncMock(), is_demo=True,
+    )
+    msg = MagicMock(id=7, text="BTC breaks out", message="BTC breaks out", grouped_id=None,
+                    views=1, forwards=0, photo=None, video=None, document=None,
+                    poll=None, venue=None, geo=None)
+
+    await processor.process_raw_message(msg, "whale_alert", "Whale Alert")
+    # Duplicate: stops after dedup
+    await processor.process_raw_message(msg, "whale_alert", "Whale Alert")
+
+    content_type, body = tracing._stats_route()
+    stages = json.loads(body)["channels"]["whale_alert"]
+
+    assert content_type == "application/json"
+    assert stages["total"]["count"] == 2
+    assert stages["parse"]["count"] == 2
+    assert stages["dedup"]["count"] == 2
+    assert stages["redis_publish"]["count"] == 1
+    assert stages["celery_enqueue"]["count"] == 1
+    assert "media_download" not in stages
@@ -0,0 +1 @@
+"""Helpers used by more than one service (backend, crypto_service, news_service)."""
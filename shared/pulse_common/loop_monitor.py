@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+from prometheus_client import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+BLOCKED_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+EVENT_LOOP_LAG_SECONDS = Histogram(
+    "event_loop_lag_seconds", "How late the loop monitor probe woke up",
+    buckets=LAG_BUCKETS,
+)
+EVENT_LOOP_BLOCKED_SECONDS = Histogram(
+    "event_loop_blocked_seconds", "Duration of loop stalls longer than the monitor threshold",
+    buckets=BLOCKED_BUCKETS,
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked_total", "Loop stalls sampled by the watchdog thread"
+)
+
+
+class LoopMonitor:
+    """
+    Opt-in event loop health check.
+
+    A probe coroutine sleeps `interval` and records how late it woke up. A
+    watchdog thread watches the probe's heartbeat; once the loop has not come
+    back for `threshold` seconds it samples the loop thread's stack, so the
+    synchronous call that is holding the loop shows up in the logs.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.25, stack_limit: int = 15):
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_limit = stack_limit
+        self.last_stack: Optional[str] = None
+        self._beat = time.monotonic()
+        self._beat_seq = 0
+        self._sampled_seq = -1
+        self._loop = None
+        self._loop_thread_id = None
+        self._stop = threading.Event()
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        watchdog.start()
+        logger.info(f"Event loop monitor started (interval {self.interval}s, threshold {self.threshold}s)")
+
+        try:
+            while True:
+                self._beat = time.monotonic()
+                self._beat_seq += 1
+                expected = self._loop.time() + self.interval
+                await asyncio.sleep(self.interval)
+                lag = max(0.0, self._loop.time() - expected)
+                EVENT_LOOP_LAG_SECONDS.observe(lag)
+                if lag > self.threshold:
+                    EVENT_LOOP_BLOCKED_SECONDS.observe(lag)
+                    logger.warning(f"Event loop was blocked for {lag:.3f}s")
+        finally:
+            self._stop.set()
+
+    def _watch(self):
+        # Check a few times per threshold so a stall is sampled while it is still happening
+        while not self._stop.wait(self.threshold / 4):
+            seq = self._beat_seq
+            stalled = time.monotonic() - self._beat - self.interval
+            if stalled > self.threshold and seq != self._sampled_seq:
+                self._sampled_seq = seq
+                self.sample(stalled)
+
+    def sample(self, stalled: float):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = "".join(traceback.format_stack(frame, limit=self.stack_limit))
+        task = asyncio.current_task(self._loop)
+        self.last_stack = stack
+        EVENT_LOOP_BLOCKED.inc()
+        logger.warning(
+            f"Event loop blocked for {stalled:.3f}s in task "
+            f"{task.get_name() if task else '<callback>'}:\n{stack}"
+        )
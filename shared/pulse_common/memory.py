@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+import sys
+import tracemalloc
+from collections import deque
+from typing import Any, Callable, Optional
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+MEMORY_STRUCTURE_BYTES = Gauge(
+    "memory_structure_bytes", "Estimated deep size of a long-lived in-memory structure", ["structure"]
+)
+MEMORY_STRUCTURE_ITEMS = Gauge(
+    "memory_structure_items", "Top-level entries in a long-lived in-memory structure", ["structure"]
+)
+MEMORY_BUDGET_BYTES = Gauge(
+    "memory_budget_bytes", "Configured budget of a structure, 0 when unbudgeted", ["structure"]
+)
+MEMORY_BUDGET_TRIMS = Counter(
+    "memory_budget_trims_total", "Times a structure exceeded its budget and was trimmed", ["structure"]
+)
+TRACEMALLOC_TRACED_BYTES = Gauge(
+    "tracemalloc_traced_bytes", "Memory currently traced by tracemalloc, when it is running"
+)
+
+_CONTAINERS = (dict, list, tuple, set, frozenset, deque)
+
+
+def deep_sizeof(obj: Any, seen: Optional[set] = None) -> int:
+    """
+    Approximate bytes held by `obj` and everything reachable through containers
+    and instance __dict__s. Shared objects (e.g. the global_stats dict embedded
+    in every price) are counted once, also across calls given the same `seen`.
+    """
+    seen = set() if seen is None else seen
+    total = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, _CONTAINERS):
+            stack.extend(current)
+        elif hasattr(current, "__dict__") and not isinstance(current, type):
+            stack.append(vars(current))
+    return total
+
+
+def sampled_sizeof(obj: Any, sample: int = 32, seen: Optional[set] = None) -> int:
+    """
+    deep_sizeof for large, uniform containers such as price history rings. A
+    container with more than `sample` entries is measured on evenly spaced
+    entries and scaled to its length, recursively, so the cost of a pass is
+    bounded by the sample rather than the data.
+    """
+    seen = set() if seen is None else seen
+    if not isinstance(obj, _CONTAINERS) or len(obj) <= sample:
+        return deep_sizeof(obj, seen)
+
+    entries = list(obj.items()) if isinstance(obj, dict) else list(obj)
+    step = len(entries) / sample
+    sampled = 0
+    for i in range(sample):
+        entry = entries[int(i * step)]
+        if isinstance(obj, dict):
+            sampled += deep_sizeof(entry[0], seen) + sampled_sizeof(entry[1], sample, seen)
+        else:
+            sampled += sampled_sizeof(entry, sample, seen)
+    return sys.getsizeof(obj) + sampled * len(entries) // sample
+
+
+def parse_budgets(value: str) -> dict[str, int]:
+    """"history=64,prices=8" (MiB per structure) -> {name: bytes}."""
+    budgets = {}
+    for part in value.split(","):
+        name, sep, mib = part.partition("=")
+        if not sep or not name.strip():
+            continue
+        try:
+            budgets[name.strip()] = int(float(mib) * 2**20)
+        except ValueError:
+            logger.warning(f"Ignoring invalid memory budget {part!r}")
+    return budgets
+
+
+def trim_deque(buffer: deque, size: int, budget: int, oldest_left: bool = True, floor: int = 0):
+    """Drop the oldest entries in place until the buffer is roughly 90% of its budget."""
+    keep = max(floor, int(len(buffer) * 0.9 * budget / size)) if size else len(buffer)
+    pop = buffer.popleft if oldest_left else buffer.pop
+    while len(buffer) > keep:
+        pop()
+
+
+class MemoryAccountant:
+    """
+    Named long-lived structures, measured into gauges. Budgets are only
+    enforced by the periodic run(): a structure over its budget gets its trim
+    callback, which is handed the measured size and the budget and must shrink
+    it in place. report() (the /memory endpoints) only measures.
+    """
+
+    def __init__(self, budgets: Optional[dict[str, int]] = None):
+        self.budgets = budgets or {}
+        self._structures: dict[str, tuple[Callable[[], Any], Optional[Callable[[int, int], None]], Callable[[Any], int]]] = {}
+        self._last_snapshot = None
+
+    def register(self, name: str, getter: Callable[[], Any], trim: Optional[Callable[[int, int], None]] = None,
+                 sizer: Callable[[Any], int] = deep_sizeof):
+        """Large structures should pass sampled_sizeof: a pass runs on the event loop."""
+        self._structures[name] = (getter, trim, sizer)
+        MEMORY_BUDGET_BYTES.labels(name).set(self.budgets.get(name, 0))
+
+    def measure(self) -> dict:
+        """Sizes into the gauges; never touches the structures, so it is safe to serve on demand."""
+        return self._account(enforce=False)
+
+    def enforce(self) -> dict:
+        """Like measure(), but a structure over its budget is trimmed first."""
+        return self._account(enforce=True)
+
+    def _account(self, enforce: bool) -> dict:
+        report = {}
+        for name, (getter, trim, sizer) in self._structures.items():
+            obj = getter()
+            size = sizer(obj)
+            budget = self.budgets.get(name, 0)
+
+            if enforce and budget and size > budget and trim:
+                trim(size, budget)
+                MEMORY_BUDGET_TRIMS.labels(name).inc()
+                # A trim may replace the structure rather than shrink it in place
+                obj = getter()
+                trimmed = sizer(obj)
+                logger.warning(f"Memory budget: {name} was {size / 2**20:.1f} MiB over "
+                               f"{budget / 2**20:.1f} MiB, trimmed to {trimmed / 2**20:.1f} MiB")
+                size = trimmed
+
+            items = len(obj) if hasattr(obj, "__len__") else None
+            MEMORY_STRUCTURE_BYTES.labels(name).set(size)
+            if items is not None:
+                MEMORY_STRUCTURE_ITEMS.labels(name).set(items)
+            report[name] = {"bytes": size, "items": items, "budget_bytes": budget or None}
+
+        if tracemalloc.is_tracing():
+            TRACEMALLOC_TRACED_BYTES.set(tracemalloc.get_traced_memory()[0])
+        return report
+
+    def tracemalloc_report(self, limit: int = 15) -> dict:
+        """Top allocation sites now, and the growth since the previous call."""
+        if not tracemalloc.is_tracing():
+            return {"tracing": False}
+
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+        report = {
+            "tracing": True,
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "top": [
+                {"site": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+                for stat in snapshot.statistics("lineno")[:limit]
+            ],
+        }
+        if self._last_snapshot is not None:
+            report["growth"] = [
+                {"site": str(stat.traceback), "bytes_diff": stat.size_diff, "count_diff": stat.count_diff}
+                for stat in snapshot.compare_to(self._last_snapshot, "lineno")[:limit]
+            ]
+        self._last_snapshot = snapshot
+        return report
+
+    def report(self) -> dict:
+        return {"structures": self.measure(), "tracemalloc": self.tracemalloc_report()}
+
+    def json_route(self) -> tuple[str, bytes]:
+        return "application/json", json.dumps(self.report()).encode()
+
+    async def run(self, interval: float):
+        while True:
+            try:
+                self.enforce()
+            except Exception as e:
+                logger.error(f"Memory accounting failed: {e}")
+            await asyncio.sleep(interval)
+
+
+def start_tracemalloc(frames: int):
+    if frames and not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+        logger.info(f"tracemalloc started with {frames} frame(s) per allocation")
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+from typing import Callable
+
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+
+logger = logging.getLogger(__name__)
+
+# path -> handler returning (content type, body)
+_routes: dict[str, Callable[[], tuple[str, bytes]]] = {}
+
+
+def register_route(path: str, handler: Callable[[], tuple[str, bytes]]):
+    _routes[path] = handler
+
+
+def _metrics() -> tuple[str, bytes]:
+    return CONTENT_TYPE_LATEST, generate_latest()
+
+
+register_route("/metrics", _metrics)
+
+
+async def _handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5)
+        # Headers are not needed, only drained
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout=5)
+            if line in (b"\r\n", b"\n", b""):
+                break
+
+        parts = request_line.decode("latin-1").split()
+        path = parts[1].split("?", 1)[0] if len(parts) > 1 else "/"
+        handler = _routes.get(path)
+        if handler is None:
+            status, content_type, body = "404 Not Found", "text/plain", b"not found\n"
+        else:
+            status = "200 OK"
+            content_type, body = handler()
+
+        writer.write(
+            f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode() + body
+        )
+        await writer.drain()
+    except Exception as e:
+        logger.debug(f"Metrics request failed: {e}")
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(port: int, host: str = "0.0.0.0") -> asyncio.AbstractServer:
+    """Minimal HTTP server for /metrics and other registered routes."""
+    server = await asyncio.start_server(_handle, host, port)
+    logger.info(f"Metrics server listening on {host}:{port}")
+    return server
@@ -0,0 +1,12 @@
+async def publish_update(redis_client, channel: str, payload: str, transport: str = "pubsub",
+                         stream_maxlen: int = 10000):
+    """Send one update over Pub/Sub or a capped Redis Stream ("streams")."""
+    if transport == "streams":
+        await redis_client.xadd(
+            channel,
+            {"data": payload},
+            maxlen=stream_maxlen,
+            approximate=True,
+        )
+    else:
+        await redis_client.publish(channel, payload)